@@ -1,26 +1,39 @@
 from __future__ import annotations
 
 import importlib
+import pkgutil
+import re
+from functools import cache
 from typing import TYPE_CHECKING, Any
 
 if TYPE_CHECKING:
     from .common import BaseAdventDay
 
 _CLASSES: dict[int, type[BaseAdventDay[Any]]] = {}
+_DAY_MODULE = re.compile(r"^day(\d+)$")
 
 
-def _init():
-    for i in range(1, 26):
-        try:
-            mod = importlib.import_module(f"advent.day{i}")
-            cls = getattr(mod, f"Day{i}")
-            _CLASSES[i] = cls
-        except ImportError:
-            pass
-
-
-_init()
+@cache
+def available_days() -> tuple[int, ...]:
+    """Days that have a module in the package, found without importing any of them."""
+    days: list[int] = []
+    for mod in pkgutil.iter_modules(__path__):
+        if match := _DAY_MODULE.match(mod.name):
+            days.append(int(match.group(1)))
+    return tuple(sorted(days))
 
 
 def get_handler_for_day(day: int) -> type[BaseAdventDay[Any]]:
-    return _CLASSES[day]
+    if (cls := _CLASSES.get(day)) is not None:
+        return cls
+
+    name = f"{__name__}.day{day}"
+    try:
+        mod = importlib.import_module(name)
+    except ModuleNotFoundError as e:
+        if e.name != name:
+            raise
+        raise KeyError(day) from e
+
+    cls = _CLASSES[day] = getattr(mod, f"Day{day}")
+    return cls
@@ -0,0 +1,144 @@
+"""
+Bytes input path: the input file is read as bytes instead of decoded, and scanned for integers
+with a single pass over the whole buffer instead of a `str` per line. Inputs with a fixed layout
+are read with a `Template`, over the whole buffer or over views of its lines.
+"""
+
+from __future__ import annotations
+
+import re
+from collections.abc import Callable, Iterator
+from operator import call
+from typing import Any
+
+type Bytes = bytes | bytearray
+
+# every byte that cannot be part of a number becomes a separator
+_SIGNED = bytes(c if c in b"-0123456789" else 0x20 for c in range(256))
+_UNSIGNED = bytes(c if c in b"0123456789" else 0x20 for c in range(256))
+# the same, keeping the line feeds
+_SIGNED_LINES = _SIGNED[:10] + b"\n" + _SIGNED[11:]
+_UNSIGNED_LINES = _UNSIGNED[:10] + b"\n" + _UNSIGNED[11:]
+
+
+def lines(data: Bytes) -> Iterator[memoryview]:
+    """The lines of data without their line ending, as views sharing its memory."""
+    view = memoryview(data)
+    start, end = 0, len(data)
+    while start < end:
+        stop = data.find(b"\n", start)
+        if stop == -1:
+            stop = end
+        last = stop - 1 if stop > start and data[stop - 1] == 13 else stop  # \r\n
+        yield view[start:last]
+        start = stop + 1
+
+
+def ints(data: Bytes, signed: bool = True) -> list[int]:
+    """
+    Every integer in data, in order. Translating and splitting the whole buffer at once is about
+    twice as fast as a regex; signed data must not have a `-` other than the signs, so ranges like
+    `2-4` need `signed=False`.
+    """
+    return list(map(int, data.translate(_SIGNED if signed else _UNSIGNED).split()))
+
+
+def line_ints(data: Bytes, signed: bool = True) -> Iterator[list[int]]:
+    """The integers of each line of data, like `ints` with a single translation of the buffer."""
+    translated = data.translate(_SIGNED_LINES if signed else _UNSIGNED_LINES).split(b"\n")
+    # like `lines`, no empty line after the last line feed
+    if not data or data.endswith(b"\n"):
+        translated.pop()
+    return (list(map(int, line.split())) for line in translated)
+
+
+def group(values: list[int], arity: int) -> list[tuple[int, ...]]:
+    """The values in consecutive tuples of `arity`."""
+    if len(values) % arity:
+        raise ValueError(f"{len(values)} integers cannot be grouped by {arity}")
+    # the same iterator repeated, so that zip takes `arity` values at a time
+    return list(zip(*[iter(values)] * arity))
+
+
+def records(data: Bytes, arity: int, signed: bool = True) -> list[tuple[int, ...]]:
+    """The integers of data grouped in consecutive tuples of `arity`, e.g. one per line."""
+    return group(ints(data, signed), arity)
+
+
+def rows(data: Bytes, arity: int, signed: bool = True) -> list[tuple[int, ...]]:
+    """
+    The integers of each line of data, which must have exactly `arity` of them. Unlike `records`,
+    a line with too few or too many integers is rejected instead of being regrouped with its
+    neighbours.
+    """
+    result: list[tuple[int, ...]] = []
+    for n, values in enumerate(line_ints(data, signed), 1):
+        if len(values) != arity:
+            raise ValueError(f"Expected {arity} integers in line {n}, found {len(values)}")
+        result.append(tuple(values))
+    return result
+
+
+def _words(value: bytes) -> list[str]:
+    return value.decode().split(", ")
+
+
+# regex and conversion of each kind of placeholder, builtins where possible as they are called for
+# every field of every match
+_FIELDS: dict[str, tuple[str, Callable[[bytes], object]]] = {
+    "int": (r"(-?\d+)", int),
+    "uint": (r"(\d+)", int),
+    "ints": (r"([-\d, ]*)", ints),
+    "word": (r"(\w+)", bytes.decode),
+    "str": (r"(\S+)", bytes.decode),
+    "words": (r"(\w+(?:, \w+)*)", _words),
+}
+
+
+class Template:
+    """
+    A regular expression with typed placeholders: `{int}`, `{uint}` without a sign, `{word}`,
+    `{str}` for anything up to a space, and `{ints}` or `{words}` for comma separated lists. It may
+    span many lines.
+    """
+
+    def __init__(self, pattern: str) -> None:
+        parts = re.split(r"\{(\w+)\}", pattern)
+        regex: list[str] = []
+        self.converters: list[Callable[[bytes], object]] = []
+        for i, part in enumerate(parts):
+            if i % 2 == 0:
+                regex.append(part)
+                continue
+            if part not in _FIELDS:
+                raise ValueError(f"Unknown placeholder {{{part}}} in {pattern!r}")
+            field, converter = _FIELDS[part]
+            regex.append(field)
+            self.converters.append(converter)
+        self.regex = re.compile("".join(regex).encode(), re.MULTILINE)
+
+    def match(self, line: Bytes | memoryview) -> tuple[Any, ...]:
+        """The fields of the line, which must match all of it."""
+        if (match := self.regex.fullmatch(line)) is None:
+            raise ValueError(f"Invalid line: {bytes(line)!r}")
+        return self._convert(match)
+
+    def scan(self, data: Bytes) -> Iterator[tuple[Any, ...]]:
+        """The fields of every match in data, skipping what is between them."""
+        return map(self._convert, self.regex.finditer(data))
+
+    def match_all(self, data: Bytes) -> Iterator[tuple[Any, ...]]:
+        """Like `scan`, but the matches must cover all of data, only whitespace between them."""
+        end = 0
+        for match in self.regex.finditer(data):
+            self._check_gap(data, end, match.start())
+            end = match.end()
+            yield self._convert(match)
+        self._check_gap(data, end, len(data))
+
+    def _check_gap(self, data: Bytes, start: int, stop: int) -> None:
+        if gap := data[start:stop].strip():
+            raise ValueError(f"Unexpected text: {gap[:80]!r}")
+
+    def _convert(self, match: re.Match[bytes]) -> tuple[Any, ...]:
+        return tuple(map(call, self.converters, match.groups()))
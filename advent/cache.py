@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import ast
+import hashlib
+import importlib.util
+import os
+import pickle
+import sys
+from collections.abc import Callable, Iterable, Iterator
+from functools import cache
+from importlib.machinery import ModuleSpec
+from pathlib import Path
+
+DEFAULT_DIR = Path(__file__).parent.parent / ".cache" / "parsed"
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+_SUFFIX = ".pickle"
+
+
+@cache
+def source_hash(cls: type) -> bytes:
+    """
+    Hash of the source of every advent module the class is built from: the modules of its bases
+    and every advent module they import, directly or not (common.py, grid.py, search.py, ...).
+    """
+    h = hashlib.sha256()
+    modules = {c.__module__ for c in cls.__mro__ if _in_package(c.__module__)}
+    for name in sorted(_imported(modules)):
+        spec = _find_spec(name)
+        assert spec is not None and spec.origin
+        h.update(name.encode())
+        h.update(Path(spec.origin).read_bytes())
+    return h.digest()
+
+
+def _in_package(module: str) -> bool:
+    return module.partition(".")[0] == "advent"
+
+
+def _imported(modules: Iterable[str]) -> set[str]:
+    # the advent modules reachable through imports, found in the sources without importing them
+    seen: set[str] = set()
+    pending = list(modules)
+    while pending:
+        name = pending.pop()
+        if name in seen or (imports := _direct_imports(name)) is None:
+            continue
+        seen.add(name)
+        pending.extend(imports)
+    return seen
+
+
+@cache
+def _direct_imports(name: str) -> tuple[str, ...] | None:
+    """The advent modules, and names, imported by the module; None if name is no module."""
+    spec = _find_spec(name)
+    if spec is None or not spec.origin:
+        # `from advent.grid import Grid` also yields advent.grid.Grid, which is no module
+        return None
+    package = name if spec.submodule_search_locations is not None else name.rpartition(".")[0]
+    tree = ast.parse(Path(spec.origin).read_bytes())
+    return tuple(m for m in _imports(tree, package) if _in_package(m))
+
+
+def _imports(tree: ast.Module, package: str) -> Iterator[str]:
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            yield from (alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            base = node.module or ""
+            if node.level:
+                parent = package.rsplit(".", node.level - 1)[0] if node.level > 1 else package
+                base = f"{parent}.{base}" if base else parent
+            yield base
+            # `from advent import grid` imports a module, not a name
+            yield from (f"{base}.{alias.name}" for alias in node.names)
+
+
+def _find_spec(name: str) -> ModuleSpec | None:
+    try:
+        return importlib.util.find_spec(name)
+    except ModuleNotFoundError:
+        return None
+
+
+class ParseCache:
+    """On-disk store of parsed inputs, evicting the least recently used entries over max_bytes."""
+
+    directory: Path
+    max_bytes: int
+
+    def __init__(self, directory: Path = DEFAULT_DIR, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        self.directory = directory
+        self.max_bytes = max_bytes
+
+    def key(self, cls: type, text: str) -> str:
+        # the source hash covers the modules of the pickled objects too (grid.py, graph.py, ...)
+        h = hashlib.sha256(sys.implementation.cache_tag.encode())
+        h.update(source_hash(cls))
+        h.update(text.encode())
+        return f"{cls.__name__.lower()}-{h.hexdigest()}"
+
+    def get_or_parse[T](self, key: str, parse: Callable[[], T]) -> T:
+        path = self.directory / f"{key}{_SUFFIX}"
+        try:
+            data = path.read_bytes()
+        except FileNotFoundError:
+            pass
+        else:
+            try:
+                value: T = pickle.loads(data)
+            except Exception:
+                path.unlink(missing_ok=True)
+            else:
+                os.utime(path)
+                return value
+
+        value = parse()
+        self._store(path, value)
+        return value
+
+    def _store(self, path: Path, value: object) -> None:
+        try:
+            data = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        except (pickle.PicklingError, TypeError, AttributeError):
+            return
+
+        if len(data) > self.max_bytes:
+            return
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_bytes(data)
+        tmp.replace(path)
+        self._evict()
+
+    def _evict(self) -> None:
+        entries: list[tuple[float, int, Path]] = []
+        for path in self.directory.glob(f"*{_SUFFIX}"):
+            try:
+                st = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((st.st_mtime, st.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
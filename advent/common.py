@@ -1,6 +1,17 @@
+from __future__ import annotations
+
+import io
+import time
 from abc import ABCMeta, abstractmethod
-from dataclasses import dataclass
-from typing import Literal, Protocol, TextIO, override
+from collections import Counter
+from collections.abc import Callable, Iterable, Iterator
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Final, Literal, Protocol, Self, TextIO, override
+
+if TYPE_CHECKING:
+    from .buffers import Bytes
+    from .cache import ParseCache
 
 
 class ResultProtocol(Protocol):
@@ -10,15 +21,179 @@ class ResultProtocol(Protocol):
 
 type Variant = Literal[1, 2]
 
+VARIANTS: Final[tuple[Variant, ...]] = (1, 2)
+
+_NO_SPAN = nullcontext()
+
+
+class RunStats:
+    """
+    Durations and counters collected while solving a day.
+
+    The parse and solve durations are always recorded; counters and custom spans only when
+    enabled, otherwise `incr` and `span` do nothing. In very hot loops, count in a local
+    variable and `incr` the total once.
+    """
+
+    __slots__ = ("enabled", "counters", "timings")
+
+    enabled: bool
+    counters: Counter[str]
+    timings: dict[str, float]
+
+    def __init__(self, enabled: bool = False) -> None:
+        self.enabled = enabled
+        self.counters = Counter()
+        self.timings = {}
+
+    def incr(self, name: str, n: int = 1) -> None:
+        if self.enabled:
+            self.counters[name] += n
+
+    def span(self, name: str) -> AbstractContextManager[None]:
+        if not self.enabled:
+            return _NO_SPAN
+        return self._timed(name)
+
+    def add_time(self, name: str, seconds: float) -> None:
+        self.timings[name] = self.timings.get(name, 0.0) + seconds
+
+    def elapsed(self, variant: Variant) -> float:
+        # the phases shared by the variants (parse, stream) are counted in full for each one
+        return sum(self.timings.get(name, 0.0) for name in ("parse", "stream", f"solve {variant}"))
+
+    @contextmanager
+    def _timed(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(name, time.perf_counter() - start)
+
+
+class Cancelled(Exception):
+    """Raised by `Progress.checkpoint` once the solve was cancelled or ran out of time."""
+
+
+class Progress:
+    """
+    Cooperative cancellation and progress reporting for long searches.
+
+    Searches call `checkpoint` once per state: it only looks at the clock every `CHECK_EVERY`
+    steps, raising `Cancelled` once the timeout expired or `cancel` was called, and calls the
+    listener at most once per `interval` seconds. Through `start` and `advance` a search tells
+    how many of its top-level branches it went through, and registers a callable computing the
+    best answer found so far, only called when the solve was cancelled.
+    """
+
+    CHECK_EVERY: Final = 1024
+
+    __slots__ = (
+        "deadline",
+        "cancelled",
+        "total",
+        "done",
+        "listener",
+        "interval",
+        "_best",
+        "_countdown",
+        "_steps",
+        "_next_report",
+    )
+
+    deadline: float | None
+    cancelled: bool
+    total: int | None
+    done: int
+    listener: Callable[[Progress], None] | None
+    interval: float
+
+    def __init__(
+        self,
+        timeout: float | None = None,
+        listener: Callable[[Progress], None] | None = None,
+        interval: float = 1.0,
+    ) -> None:
+        now = time.monotonic()
+        self.deadline = now + timeout if timeout is not None else None
+        self.cancelled = False
+        self.total = None
+        self.done = 0
+        self.listener = listener
+        self.interval = interval
+        self._best: Callable[[], object] | None = None
+        self._countdown = self.CHECK_EVERY
+        self._steps = 0
+        self._next_report = now + interval
+
+    def start(self, total: int | None = None, best: Callable[[], object] | None = None) -> None:
+        self.total = total
+        self.done = 0
+        self._best = best
+
+    def advance(self, n: int = 1) -> None:
+        self.done += n
+
+    def cancel(self) -> None:
+        # noticed by the next clock check of the search
+        self.cancelled = True
+
+    def checkpoint(self, steps: int = 1) -> None:
+        # steps weighs the work done since the last call, for loops coarser than a state
+        self._countdown -= steps
+        if self._countdown <= 0:
+            self._check()
+
+    @property
+    def steps(self) -> int:
+        return self._steps + self.CHECK_EVERY - self._countdown
+
+    @property
+    def explored(self) -> float | None:
+        return self.done / self.total if self.total else None
+
+    @property
+    def best(self) -> object | None:
+        return self._best() if self._best is not None else None
+
+    def _check(self) -> None:
+        self._steps += self.CHECK_EVERY - self._countdown
+        self._countdown = self.CHECK_EVERY
+        now = time.monotonic()
+        if self.listener is not None and now >= self._next_report:
+            self._next_report = now + self.interval
+            self.listener(self)
+        if self.cancelled or (self.deadline is not None and now >= self.deadline):
+            self.cancelled = True
+            raise Cancelled
+
 
 @dataclass
 class BaseAdventDay[T](metaclass=ABCMeta):
     input: TextIO
+    cache: ParseCache | None = field(default=None, kw_only=True)
+    stats: RunStats = field(default_factory=RunStats, kw_only=True)
+    progress: Progress = field(default_factory=Progress, kw_only=True)
+    # raw content of the input, parsed with parse_buffer instead of parse_input when given
+    buffer: Bytes | None = field(default=None, kw_only=True)
+
+    @classmethod
+    def from_buffer(cls, data: Bytes, **kwargs: Any) -> Self:
+        return cls(io.StringIO(), buffer=data, **kwargs)
+
+    @classmethod
+    def reads_bytes(cls) -> bool:
+        return cls.parse_buffer is not BaseAdventDay.parse_buffer
 
     @abstractmethod
     def parse_input(self) -> T:
         pass
 
+    def parse_buffer(self, data: Bytes) -> T:
+        # days that can take their numbers straight from the bytes override it
+        self.input = io.StringIO(str(data, "utf-8"))
+        return self.parse_input()
+
     @abstractmethod
     def _run_1(self, input: T) -> ResultProtocol:
         pass
@@ -27,14 +202,51 @@ class BaseAdventDay[T](metaclass=ABCMeta):
     def _run_2(self, input: T) -> ResultProtocol:
         pass
 
+    def snapshot(self, input: T) -> T:
+        # copy of the input handed by run_many to every variant but the last one,
+        # days that mutate their input while solving must override it
+        return input
+
     def run(self, variant: Variant) -> ResultProtocol:
-        input = self.parse_input()
+        return self._run_variant(variant, self._load_input())
+
+    def run_many(self, variants: Iterable[Variant]) -> dict[Variant, ResultProtocol]:
+        variants = list(variants)
+        input = self._load_input()
+        last = len(variants) - 1
+
+        return {
+            variant: self._run_variant(variant, input if i == last else self.snapshot(input))
+            for i, variant in enumerate(variants)
+        }
+
+    def run_all(self) -> dict[Variant, ResultProtocol]:
+        return self.run_many(VARIANTS)
 
-        match variant:
-            case 1:
-                return self._run_1(input)
-            case 2:
-                return self._run_2(input)
+    def _load_input(self) -> T:
+        start = time.perf_counter()
+        try:
+            if self.buffer is not None:
+                return self.parse_buffer(self.buffer)
+            if self.cache is None:
+                return self.parse_input()
+
+            text = self.input.read()
+            self.input = io.StringIO(text)
+            return self.cache.get_or_parse(self.cache.key(type(self), text), self.parse_input)
+        finally:
+            self.stats.add_time("parse", time.perf_counter() - start)
+
+    def _run_variant(self, variant: Variant, input: T) -> ResultProtocol:
+        start = time.perf_counter()
+        try:
+            match variant:
+                case 1:
+                    return self._run_1(input)
+                case 2:
+                    return self._run_2(input)
+        finally:
+            self.stats.add_time(f"solve {variant}", time.perf_counter() - start)
 
 
 @dataclass
@@ -53,3 +265,34 @@ class SameComputationAdventDay[T](BaseAdventDay[T], metaclass=ABCMeta):
 
     def _common_run(self, variant: Variant, input: T) -> ResultProtocol:
         return self.compute(variant, input)
+
+
+class LineConsumer(Protocol):
+    def feed(self, line: str) -> None: ...
+
+    def finish(self) -> ResultProtocol: ...
+
+
+@dataclass
+class StreamingAdventDay[T](BaseAdventDay[T], metaclass=ABCMeta):
+    """
+    A day that can also solve its variants in a single pass over the input lines, keeping only
+    the state of one consumer per variant instead of the whole parsed input. The runner uses
+    `stream` instead of `run_many` for these days.
+    """
+
+    @abstractmethod
+    def consumer(self, variant: Variant) -> LineConsumer:
+        pass
+
+    def stream(self, variants: Iterable[Variant]) -> dict[Variant, ResultProtocol]:
+        consumers = {variant: self.consumer(variant) for variant in variants}
+        feeds = [c.feed for c in consumers.values()]
+        start = time.perf_counter()
+        try:
+            for line in self.input:
+                for feed in feeds:
+                    feed(line)
+            return {variant: c.finish() for variant, c in consumers.items()}
+        finally:
+            self.stats.add_time("stream", time.perf_counter() - start)
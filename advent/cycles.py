@@ -0,0 +1,85 @@
+"""
+Fast-forwarding deterministic simulations: once a state repeats, the steps after it repeat too,
+so the observation after any number of steps follows from a single cycle.
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Callable, Hashable
+from dataclasses import dataclass
+from typing import cast
+
+# what is measured after each step, growing by the same amount in every cycle
+type Observation = int | tuple[int, ...]
+
+
+@dataclass(frozen=True)
+class Cycle:
+    # first step of the first cycle, and number of steps in each
+    start: int
+    length: int
+
+
+@dataclass(frozen=True)
+class Forwarded[O: Observation]:
+    value: O
+    # steps actually run, the others were extrapolated
+    simulated: int
+    cycle: Cycle | None
+
+
+def fast_forward[S, O: Observation](
+    state: S,
+    step: Callable[[S], S],
+    steps: int,
+    fingerprint: Callable[[S], Hashable],
+    observe: Callable[[S], O],
+    memory: int | None = None,
+) -> Forwarded[O]:
+    """
+    The observation of the state after `steps` calls of `step`, which may mutate and return it.
+    Two states with the same fingerprint must evolve the same way from there on. The history of
+    the fingerprints is hashed; with `memory` only the last ones are kept, finding the cycles up
+    to that length only.
+    """
+    if memory is not None and memory < 1:
+        raise ValueError(f"memory must be positive, not {memory}")
+    seen: dict[Hashable, int] = {fingerprint(state): 0}
+    order: deque[Hashable] = deque(seen)
+    history: deque[O] = deque([observe(state)], maxlen=None if memory is None else memory + 1)
+
+    for k in range(1, steps + 1):
+        state = step(state)
+        history.append(observe(state))
+        fp = fingerprint(state)
+
+        if (start := seen.get(fp)) is not None:
+            first = k + 1 - len(history)
+            cycles, remainder = divmod(steps - start, k - start)
+            value = _extrapolate(
+                history[start + remainder - first],
+                history[start - first],
+                history[k - first],
+                cycles,
+            )
+            return Forwarded(value, k, Cycle(start, k - start))
+
+        seen[fp] = k
+        order.append(fp)
+        if memory is not None and len(order) > memory:
+            del seen[order.popleft()]
+
+    return Forwarded(history[-1], steps, None)
+
+
+def _extrapolate[O: Observation](base: O, start: O, end: O, cycles: int) -> O:
+    if isinstance(base, int):
+        return cast(O, base + cycles * (cast(int, end) - cast(int, start)))
+    return cast(
+        O,
+        tuple(
+            b + cycles * (e - s)
+            for b, s, e in zip(base, cast(tuple[int, ...], start), cast(tuple[int, ...], end))
+        ),
+    )
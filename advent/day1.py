@@ -1,11 +1,40 @@
+import heapq
 from dataclasses import dataclass
 from typing import override
 
-from advent.common import BaseAdventDay
+from advent.buffers import Bytes
+from advent.common import LineConsumer, StreamingAdventDay, Variant
+
+
+class _TopElves:
+    """Total calories of the `count` elves carrying the most, without keeping the others."""
+
+    def __init__(self, count: int) -> None:
+        self.count = count
+        self.current = 0
+        self.top: list[int] = []
+
+    def feed(self, line: str) -> None:
+        line = line.strip()
+        if line:
+            self.current += int(line)
+        else:
+            self._close_elf()
+
+    def finish(self) -> int:
+        self._close_elf()
+        return sum(self.top)
+
+    def _close_elf(self) -> None:
+        if len(self.top) < self.count:
+            heapq.heappush(self.top, self.current)
+        else:
+            heapq.heappushpop(self.top, self.current)
+        self.current = 0
 
 
 @dataclass
-class Day1(BaseAdventDay[list[int]]):
+class Day1(StreamingAdventDay[list[int]]):
     @override
     def parse_input(self) -> list[int]:
         calories = [0]
@@ -17,6 +46,11 @@ class Day1(BaseAdventDay[list[int]]):
                 calories.append(0)
         return calories
 
+    @override
+    def parse_buffer(self, data: Bytes) -> list[int]:
+        elves = data.replace(b"\r\n", b"\n").split(b"\n\n")
+        return [sum(map(int, elf.split())) for elf in elves]
+
     @override
     def _run_1(self, input: list[int]) -> int:
         return max(input)
@@ -24,3 +58,7 @@ class Day1(BaseAdventDay[list[int]]):
     @override
     def _run_2(self, input: list[int]) -> int:
         return sum(sorted(input, reverse=True)[:3])
+
+    @override
+    def consumer(self, variant: Variant) -> LineConsumer:
+        return _TopElves(1 if variant == 1 else 3)
@@ -4,12 +4,12 @@ from abc import ABCMeta, abstractmethod
 from dataclasses import dataclass
 from typing import Any, ClassVar, override
 
-from advent.common import BaseAdventDay
+from advent.common import StreamingAdventDay, Variant
 
 _REG: dict[str, type[Instr]] = {}
 
 
-@dataclass
+@dataclass(slots=True)
 class Instr(metaclass=ABCMeta):
     CYCLES: ClassVar[int]
     NAME: ClassVar[str]
@@ -33,7 +33,7 @@ class Instr(metaclass=ABCMeta):
         pass
 
 
-@dataclass
+@dataclass(slots=True)
 class AddX(Instr):
     CYCLES = 2
     NAME = "addx"
@@ -51,7 +51,7 @@ class AddX(Instr):
         return x + self.amount
 
 
-@dataclass
+@dataclass(slots=True)
 class NoOp(Instr):
     CYCLES = 1
     NAME = "noop"
@@ -66,56 +66,95 @@ class NoOp(Instr):
         return x
 
 
-@dataclass
-class Day10(BaseAdventDay[list[Instr]]):
+class _Cpu(metaclass=ABCMeta):
+    @abstractmethod
+    def execute(self, instr: Instr) -> None:
+        pass
+
+    @abstractmethod
+    def finish(self) -> Any:
+        pass
+
+    def feed(self, line: str) -> None:
+        self.execute(Instr.parse(line))
+
+
+class _SignalStrength(_Cpu):
+    def __init__(self) -> None:
+        self.x = 1
+        self.cycles = 1
+        self.strength = 0
+        self.target = 20
+
     @override
-    def parse_input(self) -> list[Instr]:
-        return [Instr.parse(line) for line in self.input]
+    def execute(self, instr: Instr) -> None:
+        self.cycles += instr.CYCLES
+        new_x = instr.apply(self.x)
+
+        if self.cycles >= self.target:
+            if self.cycles > self.target:
+                x_to_add = self.x
+            else:
+                x_to_add = new_x
+
+            self.strength += x_to_add * self.target
+            self.target += 40
+
+        self.x = new_x
 
     @override
-    def _run_1(self, input: list[Instr]) -> int:
-        x = 1
-        cycles = 1
-        strength = 0
-        target = 20
+    def finish(self) -> int:
+        return self.strength
 
-        for instr in input:
-            instr_cycles = instr.CYCLES
-            cycles += instr_cycles
-            new_x = instr.apply(x)
 
-            if cycles >= target:
-                if cycles > target:
-                    x_to_add = x
-                else:
-                    x_to_add = new_x
+class _Crt(_Cpu):
+    LINE = 40
 
-                strength += x_to_add * target
-                target += 40
+    def __init__(self) -> None:
+        self.x = 1
+        self.cycles = 0
+        self.buf: list[list[str]] = []
 
-            x = new_x
+    @override
+    def execute(self, instr: Instr) -> None:
+        x = self.x
+        for c in range(self.cycles, self.cycles + instr.CYCLES):
+            pixel = c % self.LINE
+            if pixel == 0:
+                self.buf.append([])
 
-        return strength
+            if x - 1 <= pixel <= x + 1:
+                self.buf[-1].append("#")
+            else:
+                self.buf[-1].append(".")
+
+        self.x = instr.apply(x)
+        self.cycles += instr.CYCLES
 
     @override
-    def _run_2(self, input: list[Instr]) -> str:
-        x = 1
-        cycles = 0
-        line = 40
-        buf: list[list[str]] = []
+    def finish(self) -> str:
+        return "\n".join("".join(x) for x in self.buf)
 
-        for instr in input:
-            for c in range(cycles, cycles + instr.CYCLES):
-                pixel = c % line
-                if pixel == 0:
-                    buf.append([])
 
-                if x - 1 <= pixel <= x + 1:
-                    buf[-1].append("#")
-                else:
-                    buf[-1].append(".")
+@dataclass
+class Day10(StreamingAdventDay[list[Instr]]):
+    @override
+    def parse_input(self) -> list[Instr]:
+        return [Instr.parse(line) for line in self.input]
+
+    @override
+    def _run_1(self, input: list[Instr]) -> int:
+        return self._execute(_SignalStrength(), input)
 
-            x = instr.apply(x)
-            cycles += instr.CYCLES
+    @override
+    def _run_2(self, input: list[Instr]) -> str:
+        return self._execute(_Crt(), input)
+
+    @override
+    def consumer(self, variant: Variant) -> _Cpu:
+        return _SignalStrength() if variant == 1 else _Crt()
 
-        return "\n".join("".join(x) for x in buf)
+    def _execute(self, cpu: _Cpu, input: list[Instr]) -> Any:
+        for instr in input:
+            cpu.execute(instr)
+        return cpu.finish()
@@ -1,19 +1,20 @@
 from __future__ import annotations
 
-import re
-from collections import Counter, deque
+from collections import deque
 from collections.abc import Callable
 from dataclasses import dataclass
 from math import lcm
 from operator import add, mul
-from typing import Literal, TypedDict, cast, override
+from typing import Literal, NamedTuple, override
 
+from advent.buffers import Bytes, Template
 from advent.common import SameComputationAdventDay, Variant
+from advent.cycles import fast_forward
 
 type Old = Literal["old"]
 
 
-@dataclass
+@dataclass(slots=True)
 class Monkey:
     id: int
     items: deque[int]
@@ -25,59 +26,78 @@ class Monkey:
     operation: Callable[[int, int], int]
     post_op: Callable[[int], int]
 
-    def do_turn(self, counter: Counter[int], monkeys: dict[int, Monkey]):
-        while self.items:
-            counter[self.id] += 1
-            old = self.items.popleft()
-            new, div = self._process(old)
-            if div:
-                dest = self.if_true
-            else:
-                dest = self.if_false
-
-            monkeys[dest].items.append(new)
-
-    def _process(self, old: int) -> tuple[int, bool]:
+    def throw(self, old: int) -> tuple[int, int]:
+        """The new worry level of the item, and the monkey it is thrown to."""
         op1 = old if self.operand1 == "old" else self.operand1
         op2 = old if self.operand2 == "old" else self.operand2
         new = self.post_op(self.operation(op1, op2))
-        return new, new % self.test_den == 0
-
-
-MONKEY_REGEX = re.compile(
-    (
-        r"^Monkey (?P<id>\d+):$\n"
-        r"^\s+Starting items:(?P<items>[0-9, ]*)$\n"
-        r"^\s+Operation: new = (?P<op1>[0-9]+|old)\s*(?P<op>[*+])\s*(?P<op2>[0-9]+|old)$\n"
-        r"^\s+Test: divisible by (?P<den>\d+)$\n"
-        r"^\s+If true: throw to monkey (?P<idt>\d+)$\n"
-        r"^\s+If false: throw to monkey (?P<idf>\d+)$"
-    ),
-    re.MULTILINE,
+        return new, self.if_true if new % self.test_den == 0 else self.if_false
+
+
+class _Item:
+    """
+    The monkeys handle each item on its own, so the inspections of every item can be counted
+    separately, and fast-forwarded once its (monkey, worry level) repeats at the end of a round.
+    """
+
+    __slots__ = ("monkeys", "holder", "worry", "inspections")
+
+    def __init__(self, monkeys: list[Monkey], holder: int, worry: int) -> None:
+        self.monkeys = monkeys
+        self.holder = holder
+        self.worry = worry
+        self.inspections = [0] * len(monkeys)
+
+    def round(self) -> _Item:
+        # the monkeys take turns in order, so a throw to a later one is handled in the same round
+        while True:
+            self.inspections[self.holder] += 1
+            self.worry, dest = self.monkeys[self.holder].throw(self.worry)
+            thrown_back = dest < self.holder
+            self.holder = dest
+            if thrown_back:
+                return self
+
+    def fingerprint(self) -> tuple[int, int]:
+        return self.holder, self.worry
+
+    def observe(self) -> tuple[int, ...]:
+        return tuple(self.inspections)
+
+
+MONKEY = Template(
+    r"^Monkey {int}:\s+"
+    r"Starting items:{ints}$\s+"
+    r"Operation: new = {str} {str} {str}\s+"
+    r"Test: divisible by {int}\s+"
+    r"If true: throw to monkey {int}\s+"
+    r"If false: throw to monkey {int}$"
 )
 
 
-class GroupDict(TypedDict):
-    id: str
-    items: str
+class Notes(NamedTuple):
+    id: int
+    items: list[int]
     op1: str
-    op2: str
     op: str
-    den: str
-    idt: str
-    idf: str
+    op2: str
+    den: int
+    idt: int
+    idf: int
 
 
 @dataclass
-class Day11(SameComputationAdventDay[list[GroupDict]]):
+class Day11(SameComputationAdventDay[list[Notes]]):
     @override
-    def parse_input(self) -> list[GroupDict]:
-        return [
-            cast(GroupDict, match.groupdict()) for match in MONKEY_REGEX.finditer(self.input.read())
-        ]
+    def parse_input(self) -> list[Notes]:
+        return self.parse_buffer(self.input.read().encode())
 
     @override
-    def compute(self, var: Variant, input: list[GroupDict]) -> int:
+    def parse_buffer(self, data: Bytes) -> list[Notes]:
+        return list(map(Notes._make, MONKEY.match_all(data)))
+
+    @override
+    def compute(self, var: Variant, input: list[Notes]) -> int:
         if var == 1:
             rounds = 20
 
@@ -86,32 +106,35 @@ class Day11(SameComputationAdventDay[list[GroupDict]]):
 
         else:
             rounds = 10_000
-            total = lcm(*(int(g["den"]) for g in input))
+            total = lcm(*(notes.den for notes in input))
 
             def post_op(x: int) -> int:
                 return x % total
 
-        monkey_list = [self._parse(g, post_op) for g in input]
-        monkeys: dict[int, Monkey] = {m.id: m for m in monkey_list}
-
-        counter: Counter[int] = Counter()
-        for _ in range(rounds):
-            for monkey in monkeys.values():
-                monkey.do_turn(counter, monkeys)
-
-        m1, m2 = counter.most_common(2)
-        return m1[1] * m2[1]
-
-    def _parse(self, group_dict: GroupDict, post_op: Callable[[int], int]) -> Monkey:
+        monkeys = [self._parse(notes, post_op) for notes in input]
+        assert [m.id for m in monkeys] == list(range(len(monkeys)))
+
+        inspections = [0] * len(monkeys)
+        for monkey in monkeys:
+            for worry in monkey.items:
+                item = fast_forward(
+                    _Item(monkeys, monkey.id, worry),
+                    _Item.round,
+                    rounds,
+                    fingerprint=_Item.fingerprint,
+                    observe=_Item.observe,
+                )
+                self.stats.incr("rounds simulated", item.simulated)
+                inspections = [a + b for a, b in zip(inspections, item.value)]
+
+        m1, m2 = sorted(inspections, reverse=True)[:2]
+        return m1 * m2
+
+    def _parse(self, notes: Notes, post_op: Callable[[int], int]) -> Monkey:
         def _parse(val: str) -> int | Old:
             return val if val == "old" else int(val)
 
-        items_str = [
-            element for element in group_dict["items"].replace(" ", "").split(",") if element
-        ]
-        items = deque(item for item in map(int, items_str))
-
-        match group_dict["op"]:
+        match notes.op:
             case "+":
                 operation = add
             case "*":
@@ -120,13 +143,13 @@ class Day11(SameComputationAdventDay[list[GroupDict]]):
                 raise ValueError(f"Invalid op: {opd}")
 
         return Monkey(
-            id=int(group_dict["id"]),
-            items=items,
-            test_den=int(group_dict["den"]),
-            if_false=int(group_dict["idf"]),
-            if_true=int(group_dict["idt"]),
+            id=notes.id,
+            items=deque(notes.items),
+            test_den=notes.den,
+            if_false=notes.idf,
+            if_true=notes.idt,
             operation=operation,
-            operand1=_parse(group_dict["op1"]),
-            operand2=_parse(group_dict["op2"]),
+            operand1=_parse(notes.op1),
+            operand2=_parse(notes.op2),
             post_op=post_op,
         )
@@ -10,7 +10,7 @@ from advent.common import BaseAdventDay
 type PacketElement = int | list["PacketElement"]
 
 
-@dataclass(order=False, eq=True)
+@dataclass(order=False, eq=True, slots=True)
 @total_ordering
 class Packet:
     elements: list[PacketElement]
@@ -2,19 +2,21 @@ from __future__ import annotations
 
 from collections.abc import Iterable
 from dataclasses import dataclass
-from enum import Enum, auto
+from enum import IntEnum
 from itertools import pairwise
 from typing import override
 
+from advent.buffers import Bytes, group, line_ints
 from advent.common import BaseAdventDay
+from advent.grid import Grid
 
 Pos = tuple[int, int]
 
 
-class CellType(Enum):
-    Empty = auto()
-    Wall = auto()
-    Sand = auto()
+class CellType(IntEnum):
+    Empty = 0
+    Wall = 1
+    Sand = 2
 
 
 class Path:
@@ -46,80 +48,72 @@ class Path:
 
 class Board:
     paths: list[Path]
-    blocked: dict[Pos, CellType]
+    grid: Grid | None
 
     def __init__(self, paths: list[Path], start: Pos = (500, 0)):
         self.paths = paths
         self.start = start
         self.sand = 0
-        self.blocked = {}
+        self.grid = None
         self.edge = max(y for p in self.paths for (_, y) in p)
 
     def simulate(self, add_bottom_at: int | None = None):
-        end = False
-
+        # the sand falls at most one column sideways per row, so the cave is only as wide as it
+        # is deep on each side of the start; the last row is the floor, or the abyss without it
+        depth = self.edge + (add_bottom_at or 1)
+        x_start, y_start = self.start
+        left = x_start - depth - 1
+        grid = self.grid = Grid.filled(depth + 1, 2 * depth + 3, CellType.Empty)
+
+        for p in self.paths:
+            for x, y in p:
+                if 0 <= x - left < grid.cols and y <= depth:
+                    grid[y, x - left] = CellType.Wall
         if add_bottom_at is not None:
-            edge = self.edge = self.edge + add_bottom_at
-            x_start = self.start[0]
-            bottom = Path([(x_start - edge, edge), (x_start + edge, edge)])
-            self.paths.append(bottom)
-            self.edge += add_bottom_at
-
-        while not end:
-            cur = self.start
+            grid.row(depth)[:] = bytes([CellType.Wall]) * grid.cols
+
+        cells = grid.cells
+        below = grid.cols
+        abyss = depth * grid.cols
+        start = grid.index(y_start, x_start - left)
+
+        while True:
+            cur = start
             while True:
-                next_pos = self._next_pos(cur)
-                if not next_pos:
-                    break
-                if next_pos[1] > self.edge:
-                    end = True
-                    break
-                cur = next_pos
-
-            if not end:
-                self.sand += 1
-                self.blocked[cur] = CellType.Sand
-
-            if cur == self.start:
-                end = True
-
-        return self.sand
-
-    def _next_pos(self, cur: Pos) -> Pos | None:
-        x, y = cur
-        ny = y + 1
-        for nx in [x, x - 1, x + 1]:
-            new = (nx, ny)
-            if not self._is_blocked(new):
-                return new
-        return None
-
-    def _is_blocked(self, pos: Pos) -> bool:
-        cell = self.blocked.get(pos)
-        if cell is None:
-            if wall_present := any(pos in p for p in self.paths):
-                self.blocked[pos] = CellType.Wall
-            else:
-                self.blocked[pos] = CellType.Empty
-            return wall_present
-        return cell != CellType.Empty
+                nxt = cur + below
+                if cells[nxt]:
+                    if not cells[nxt - 1]:
+                        nxt -= 1
+                    elif not cells[nxt + 1]:
+                        nxt += 1
+                    else:
+                        break
+                if nxt >= abyss:
+                    return self.sand
+                cur = nxt
+
+            self.sand += 1
+            cells[cur] = CellType.Sand
+
+            if cur == start:
+                return self.sand
 
 
 @dataclass
 class Day14(BaseAdventDay[Board]):
     @override
     def parse_input(self) -> Board:
-        output: list[Path] = []
-        for line in self.input:
-            parts = line.split("->")
-            pos: list[Pos] = []
-            for p in parts:
-                p = p.strip().split(",")
-                assert len(p) == 2
-                pos.append(tuple(map(int, p)))  # type: ignore
-            output.append(Path(tuple(pos)))
-
-        return Board(output)
+        return self.parse_buffer(self.input.read().encode())
+
+    @override
+    def parse_buffer(self, data: Bytes) -> Board:
+        # the `->` separators are not signs
+        paths = (group(values, 2) for values in line_ints(data, signed=False))
+        return Board([Path(pos) for pos in paths if pos])  # pyright: ignore[reportArgumentType]
+
+    @override
+    def snapshot(self, input: Board) -> Board:
+        return Board(list(input.paths), input.start)
 
     @override
     def _run_1(self, input: Board):
@@ -1,79 +1,63 @@
 from __future__ import annotations
 
-import re
-from bisect import bisect_left
-from collections.abc import Callable
-from dataclasses import dataclass
-from functools import cached_property, lru_cache
+from dataclasses import dataclass, field
 from itertools import combinations
-from typing import ClassVar, override
+from typing import override
 
+from advent.buffers import Bytes, rows
 from advent.common import BaseAdventDay
+from advent.intervals import IntervalSet
+from advent.memo import MemoStore
 
 type Pos = tuple[int, int]
+# the segments just outside the reach of a sensor
+type Borders = tuple[tuple[Pos, Pos], ...]
 
 
-@dataclass(order=True, repr=False)
-class Range:
-    from_: int
-    to: int
-
-    def can_merge_with(self, other: Range) -> bool:
-        return self.to - other.from_ >= -1
-
-    def merge_with(self, other: Range) -> Range:
-        return Range(min(self.from_, other.from_), max(self.to, other.to))
-
-    @property
-    def cells_inside(self) -> int:
-        return self.to - self.from_ + 1
-
-    @override
-    def __repr__(self) -> str:
-        return f"<{self.from_}, {self.to}>"
-
-
-@dataclass(unsafe_hash=True)
+@dataclass(unsafe_hash=True, slots=True)
 class Sensor:
     sensor: Pos
     beacon: Pos
+    distance: int = field(init=False, compare=False)
 
-    REGEX: ClassVar[re.Pattern[str]] = re.compile(
-        r"Sensor at x=(-?\d+), y=(-?\d+): closest beacon is at x=(-?\d+), y=(-?\d+)"
-    )
-
-    @cached_property
-    def distance(self) -> int:
-        return _manhattan(self.beacon, self.sensor)
-
-    @classmethod
-    def parse(cls, row: str) -> Sensor:
-        if match := cls.REGEX.match(row):
-            sx, sy, bx, by = map(int, match.groups())
-            return cls((sx, sy), (bx, by))
-        raise ValueError(row)
+    def __post_init__(self) -> None:
+        self.distance = _manhattan(self.beacon, self.sensor)
 
 
 @dataclass
 class Day15(BaseAdventDay[list[Sensor]]):
     @override
     def parse_input(self) -> list[Sensor]:
-        return [Sensor.parse(row) for row in self.input]
+        return self.parse_buffer(self.input.read().encode())
+
+    @override
+    def parse_buffer(self, data: Bytes) -> list[Sensor]:
+        return [Sensor((sx, sy), (bx, by)) for sx, sy, bx, by in rows(data, 4)]
 
     @override
     def _run_1(self, input: list[Sensor]) -> int:
         target = 2_000_000
         covered, beacons = self._covered_row(input, target)
-        return sum(r.cells_inside for r in covered) - len(beacons)
+        return covered.coverage() - len(beacons)
 
     @override
     def _run_2(self, input: list[Sensor]) -> int | None:
         target = 4_000_000
         freq = 4_000_000
 
+        # every sensor is paired with all the others, an LRU smaller than that misses every time
+        borders = MemoStore[Sensor, Borders](max_entries=max(len(input), 1))
+        try:
+            return self._intersect(input, borders, target, freq)
+        finally:
+            borders.report(self.stats, "border bounds")
+
+    def _intersect(
+        self, input: list[Sensor], borders: MemoStore[Sensor, Borders], target: int, freq: int
+    ) -> int | None:
         for s1, s2 in combinations(input, 2):
-            for (x1, y1), (x2, y2) in _border_bounds(s1):
-                for (x3, y3), (x4, y4) in _border_bounds(s2):
+            for (x1, y1), (x2, y2) in borders.get_or_compute(s1, _border_bounds):
+                for (x3, y3), (x4, y4) in borders.get_or_compute(s2, _border_bounds):
                     d = _det(x2 - x1, x3 - x4, y2 - y1, y3 - y4)
                     if d == 0:
                         # parallel borders, skip
@@ -99,65 +83,28 @@ class Day15(BaseAdventDay[list[Sensor]]):
         target: int,
         from_: int | None = None,
         to: int | None = None,
-    ) -> tuple[list[Range], set[int]]:
-        covered: list[Range] = []
+    ) -> tuple[IntervalSet, set[int]]:
+        ranges: list[tuple[int, int]] = []
         beacons: set[int] = set()
 
-        get_from = _getter(from_, max)
-        get_to = _getter(to, min)
-
         for s in input:
             sx, sy = s.sensor
-            d = s.distance
-
-            if target >= sy:
-                r = sy + d - target
-            else:
-                r = target - sy + d
-
+            r = s.distance - abs(target - sy)
             if r < 0:
                 continue
 
             if s.beacon[1] == target:
                 beacons.add(s.beacon[0])
+            ranges.append((sx - r, sx + r))
 
-            rg = Range(get_from(sx - r), get_to(sx + r))
-            t = bisect_left(covered, rg)
-
-            p = t - 1
-            while p >= 0:
-                cp = covered[p]
-                if not cp.can_merge_with(rg):
-                    break
-                rg = cp.merge_with(rg)
-                p -= 1
-
-            n = t
-            while n < len(covered):
-                cn = covered[n]
-                if not rg.can_merge_with(cn):
-                    break
-                rg = rg.merge_with(cn)
-                n += 1
-
-            covered[p + 1 : n] = [rg]
-
-        return covered, beacons
-
-
-def _getter(val: int | None, fn: Callable[[int, int], int]) -> Callable[[int], int]:
-    if val is None:
-        return lambda x: x
-    else:
-        return lambda x: fn(x, val)
+        return IntervalSet(ranges).clip(from_, to), beacons
 
 
 def _manhattan(p1: Pos, p2: Pos) -> int:
     return abs(p1[0] - p2[0]) + abs(p1[1] - p2[1])
 
 
-@lru_cache(30)
-def _border_bounds(s: Sensor) -> tuple[tuple[Pos, Pos], ...]:
+def _border_bounds(s: Sensor) -> Borders:
     dist = s.distance + 1
     sx, sy = s.sensor
 
@@ -1,17 +1,28 @@
 from __future__ import annotations
 
-import re
+from collections.abc import Iterator
 from dataclasses import dataclass
-from itertools import permutations, product
 from typing import override
 
+from advent.buffers import Bytes, Template
 from advent.common import BaseAdventDay
+from advent.graph import Graph as IndexedGraph
+from advent.graph import all_pairs
+from advent.memo import MemoStore
+from advent.search import Memo, Search
+
+# states kept by the memo of the searches, evicting the ones not recently used over it
+MEMO_ENTRIES = 1 << 18
+
+VALVE = Template(r"Valve {word} has flow rate={int}; tunnels? leads? to valves? {words}")
 
 
 @dataclass(slots=True, unsafe_hash=True)
 class Node:
     name: str
     rate: int
+    # position in the distance matrix
+    index: int
 
 
 class Graph:
@@ -35,34 +46,38 @@ class Graph:
             for nt in nts:
                 assert nt in self.nodes, nt
 
+    def indexed(self) -> IndexedGraph:
+        return IndexedGraph.from_adjacency(
+            [self.nodes[t].index for t in self.edges[name]] for name in self.nodes
+        )
+
 
 @dataclass(slots=True)
 class State:
-    opened: frozenset[Node]
-    remaining: frozenset[Node]
-    pos: str
+    # bit i stands for the i-th valve with a positive rate
+    opened: int
+    remaining: int
+    pos: int
     t: int
     current_best: int
 
 
-DistanceMatrix = dict[tuple[str, str], int]
+DistanceMatrix = list[list[int]]
 
 
 @dataclass
 class Day16(BaseAdventDay[Graph]):
-    REGEX = re.compile(r"Valve (\w+) has flow rate=(\d+); tunnels? leads? to valves? (.+)")
-
     @override
     def parse_input(self) -> Graph:
-        graph = Graph()
+        return self.parse_buffer(self.input.read().encode())
 
-        for line in self.input:
-            if (match := self.REGEX.match(line)) is None:
-                continue
+    @override
+    def parse_buffer(self, data: Bytes) -> Graph:
+        graph = Graph()
 
-            valve, rate, out_valves = match.groups()
-            graph.add_node(Node(valve, int(rate)))
-            for out_valve in out_valves.split(", "):
+        for valve, rate, out_valves in VALVE.scan(data):
+            graph.add_node(Node(valve, rate, len(graph.nodes)))
+            for out_valve in out_valves:
                 graph.add_edge(valve, out_valve)
 
         graph.check()
@@ -70,70 +85,100 @@ class Day16(BaseAdventDay[Graph]):
 
     @override
     def _run_1(self, input: Graph):
-        start = State(
-            opened=frozenset(),
-            remaining=frozenset(n for n in input.nodes.values() if n.rate > 0),
-            pos="AA",
-            t=0,
-            current_best=0,
-        )
-
-        dist = self._compute_distance_matrix(input)
-        ans = self._visit(start, dist, 30, {})
-        return max(ans.values())
+        search = self._search(input, 30)
+        start = self._start(input)
+        self.progress.start(len(list(search.successors(start))), best=lambda: search.best)
+        best = search.run(start)
+        search.report(self.stats)
+        return best
 
     @override
     def _run_2(self, input: Graph):
-        dist = self._compute_distance_matrix(input)
-        start_valve = "AA"
+        # best pressure of every set of valves opened in 26 minutes, pruning would lose some
+        res: dict[int, int] = {}
+
+        def record(state: State) -> None:
+            res[state.opened] = max(res.get(state.opened, 0), state.current_best)
+
+        search = self._search(input, 26)
+        search.bound = None
+        search.on_expand = record
+        start = self._start(input)
+        # a lower bound, the elephant might as well stay put
+        self.progress.start(
+            len(list(search.successors(start))), best=lambda: max(res.values(), default=0)
+        )
+        search.run(start)
+        search.report(self.stats)
+
+        # pairing the disjoint paths is the longer part, make it cancellable too
+        best = 0
+        paths = list(res.items())
+        self.progress.start(len(paths), best=lambda: best)
+        for k1, m1 in paths:
+            self.progress.checkpoint(len(paths))
+            best = max(best, max((m1 + m2 for k2, m2 in paths if not k1 & k2), default=0))
+            self.progress.advance()
+        return best
 
-        start = State(
-            opened=frozenset(),
-            remaining=frozenset(n for n in input.nodes.values() if n.rate > 0),
-            pos=start_valve,
+    def _compute_distance_matrix(self, input: Graph) -> DistanceMatrix:
+        with self.stats.span("distance matrix"):
+            return all_pairs(input.indexed())
+
+    def _start(self, input: Graph) -> State:
+        valves = sum(1 for n in input.nodes.values() if n.rate > 0)
+        return State(
+            opened=0,
+            remaining=(1 << valves) - 1,
+            pos=input.nodes["AA"].index,
             t=0,
             current_best=0,
         )
-        ans = self._visit(start, dist, 26, {})
-
-        return max(m1 + m2 for k1, m1 in ans.items() for k2, m2 in ans.items() if not k1 & k2)
 
-    def _compute_distance_matrix(self, input: Graph) -> DistanceMatrix:
-        dist = {
-            (i, j): 1 if j in input.edges[i] else 100000
-            for i, j in product(input.nodes, repeat=2)
-            if i != j
-        }
-
-        for k, i, j in permutations(input.nodes, 3):
-            dist[i, j] = min(dist[i, j], dist[i, k] + dist[k, j])
-        return dist
-
-    def _visit(
-        self,
-        state: State,
-        dist: DistanceMatrix,
-        max_time: int,
-        res: dict[frozenset[Node], int],
-    ) -> dict[frozenset[Node], int]:
-        res[state.opened] = max(res.get(state.opened, 0), state.current_best)
-
-        if state.t == max_time or not state.remaining:
-            return res
-
-        cur = state.pos
-        for adj in state.remaining:
-            next_t = state.t + dist[cur, adj.name] + 1
-            if next_t > max_time:
-                continue
-
-            next_state = State(
-                opened=state.opened | {adj},
-                remaining=state.remaining - {adj},
-                pos=adj.name,
-                t=next_t,
-                current_best=state.current_best + (max_time - next_t) * adj.rate,
-            )
-            self._visit(next_state, dist, max_time, res)
-
-        return res
+    def _search(self, input: Graph, max_time: int) -> Search[State, tuple[int, int, int]]:
+        dist = self._compute_distance_matrix(input)
+        # the highest rates first, for the bound
+        valves = sorted((n for n in input.nodes.values() if n.rate > 0), key=lambda n: -n.rate)
+        rates = [n.rate for n in valves]
+
+        def successors(state: State) -> Iterator[State]:
+            if state.t == max_time:
+                return
+
+            from_cur = dist[state.pos]
+            for i, adj in enumerate(valves):
+                bit = 1 << i
+                if not state.remaining & bit:
+                    continue
+                next_t = state.t + from_cur[adj.index] + 1
+                if next_t <= max_time:
+                    yield State(
+                        opened=state.opened | bit,
+                        remaining=state.remaining & ~bit,
+                        pos=adj.index,
+                        t=next_t,
+                        current_best=state.current_best + (max_time - next_t) * adj.rate,
+                    )
+
+        def bound(state: State) -> int:
+            # every other valve opened as early as possible, the best ones first: each one takes
+            # at least a minute to reach and one to open
+            total = state.current_best
+            left = max_time - state.t
+            for i, rate in enumerate(rates):
+                if state.remaining >> i & 1:
+                    left -= 2
+                    if left <= 0:
+                        break
+                    total += rate * left
+            return total
+
+        return Search(
+            successors,
+            value=lambda s: s.current_best,
+            bound=bound,
+            key=lambda s: (s.pos, s.opened, s.t),
+            memo=Memo(MemoStore(MEMO_ENTRIES, eviction="clock")),
+            progress=self.progress,
+            branches=True,
+        )
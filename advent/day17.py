@@ -3,10 +3,12 @@ from __future__ import annotations
 from dataclasses import dataclass, field
 from enum import Enum, auto
 from functools import cached_property
-from itertools import count, cycle
+from itertools import count
 from typing import Self, override
 
 from advent.common import BaseAdventDay
+from advent.cycles import fast_forward
+from advent.grid import Grid
 
 PRINT = False
 
@@ -16,7 +18,7 @@ class Direction(Enum):
     Right = auto()
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Jet:
     index: int
     direction: Direction
@@ -31,74 +33,65 @@ class Piece:
     def shape(self) -> tuple[int, int]:
         return self.board.shape
 
+    @cached_property
+    def cells(self) -> tuple[tuple[int, int], ...]:
+        """(x, y) of the filled cells."""
+        return tuple(
+            (x, y) for x in range(self.shape[0]) for y in range(self.shape[1]) if self.board[x, y]
+        )
+
 
 @dataclass
 class Board:
     cols: int
-    board: list[list[bool]] = field(init=False, default_factory=list)
+    grid: Grid = field(init=False)
+
+    def __post_init__(self) -> None:
+        self.grid = Grid.filled(0, self.cols)
 
     @classmethod
     def from_(cls, board: list[list[bool]]) -> Self:
         b = cls(len(board[0]))
-        b.board = board
+        b.grid = Grid.from_rows(board)
         return b
 
     @cached_property
     def shape(self) -> tuple[int, int]:
-        return len(self.board[0]), len(self.board)
+        return self.grid.cols, self.grid.rows
 
     def __getitem__(self, item: tuple[int, int]) -> bool:
         xr, yr = item
-        return self.board[yr][xr]
+        return bool(self.grid[yr, xr])
 
     def __setitem__(self, key: tuple[int, int], value: bool) -> None:
         x, y = key
-        self.board[y][x] = value
+        self.grid[y, x] = value
 
     def __len__(self) -> int:
-        return len(self.board)
+        return self.grid.rows
 
     def append_row_top(self, n: int = 1) -> None:
-        for _ in range(n):
-            self.board.append([False] * self.cols)
+        self.grid.append_rows(n)
 
     def ensure_rows(self, n: int) -> None:
-        to_add = n - len(self.board)
+        to_add = n - self.grid.rows
         if to_add > 0:
             self.append_row_top(to_add)
 
     def can_move_left(self, rock: Piece, x: int, y: int) -> bool:
-        if x == 0:
-            return False
-
-        for xr in range(rock.shape[0]):
-            for yr in range(rock.shape[1]):
-                if rock.board[xr, yr] and self[x - 1 + xr, yr + y]:
-                    return False
-
-        return True
+        return x > 0 and self._fits(rock, x - 1, y)
 
     def can_move_right(self, rock: Piece, x: int, y: int) -> bool:
-        if x == self.cols - rock.shape[0]:
-            return False
-
-        for xr in range(rock.shape[0]):
-            for yr in range(rock.shape[1]):
-                if rock.board[xr, yr] and self[x + 1 + xr, yr + y]:
-                    return False
-
-        return True
+        return x < self.cols - rock.shape[0] and self._fits(rock, x + 1, y)
 
     def can_move_down(self, rock: Piece, x: int, y: int) -> bool:
-        if y == 0:
-            return False
-
-        for xr in range(rock.shape[0]):
-            for yr in range(rock.shape[1]):
-                if rock.board[xr, yr] and self[x + xr, yr - 1 + y]:
-                    return False
+        return y > 0 and self._fits(rock, x, y - 1)
 
-        return True
+    def _fits(self, rock: Piece, x: int, y: int) -> bool:
+        cells = self.grid.cells
+        cols = self.cols
+        base = y * cols + x
+        return not any(cells[base + yr * cols + xr] for xr, yr in rock.cells)
 
     def apply(self, board: Board, x: int, y: int) -> None:
         xs, ys = board.shape
@@ -173,62 +166,82 @@ class Day17(BaseAdventDay[list[Jet]]):
         return self._drop_rocks(input, 1000000000000)
 
     def _drop_rocks(self, jet_list: list[Jet], rock_count: int) -> int:
-        board = Board(7)
-        height = 0
-        jets = cycle(jet_list)
-        rocks = cycle(ROCKS)
-
-        states: dict[tuple[int, int, int], tuple[int, int]] = {}
-        jet = None
-
-        for rock_num in range(rock_count):
-            rock = next(rocks)
-
-            x = 2
-            y = height + 3
-            board.ensure_rows(y + rock.shape[1])
-
-            _print(board, (rock, x, y), "START")
-            stop = False
-
-            while not stop:
-                jet = next(jets)
-
-                match jet.direction:
-                    case Direction.Left if board.can_move_left(rock, x, y):
-                        x -= 1
-                    case Direction.Right if board.can_move_right(rock, x, y):
-                        x += 1
-                    case _:
-                        pass
-
-                _print(board, (rock, x, y), jet.direction.name.upper())
-
-                # check if the rock collides down
-                if board.can_move_down(rock, x, y):
-                    y -= 1
-                    _print(board, (rock, x, y), "DOWN")
-                else:
-                    stop = True
-
-            board.apply(rock.board, x, y)
-
-            height = max(height, y + rock.shape[1])
-            _print(board, None, f"FINISH (height={height})")
-
-            assert jet is not None
-            state = (jet.index, rock.index, x)
-            if prev := states.get(state):
-                rocks_in_cycle = rock_num - prev[0]
-                height_delta = height - prev[1]
-                rock_remaining = rock_count - rock_num - 1
-                cycles, remainder = divmod(rock_remaining, rocks_in_cycle)
-                if remainder == 0:
-                    return height_delta * cycles + height
-            else:
-                states[state] = (rock_num, height)
+        dropped = fast_forward(
+            Tower(jet_list),
+            Tower.drop,
+            rock_count,
+            fingerprint=Tower.fingerprint,
+            observe=lambda tower: tower.height,
+        )
+        self.stats.incr("rocks simulated", dropped.simulated)
+        return dropped.value
+
+
+class Tower:
+    # rows below the top compared at least to recognize a repeating state
+    SURFACE_ROWS = 40
+
+    def __init__(self, jet_list: list[Jet]) -> None:
+        self.board = Board(7)
+        self.height = 0
+        self.jet_list = jet_list
+        # indices of the next jet and rock
+        self.jet = 0
+        self.rock = 0
+        # rows below the top read by the rock that fell the deepest
+        self.deepest = 0
+
+    def drop(self) -> Tower:
+        board = self.board
+        rock = ROCKS[self.rock]
+        self.rock = (self.rock + 1) % len(ROCKS)
+
+        x = 2
+        y = self.height + 3
+        board.ensure_rows(y + rock.shape[1])
+
+        _print(board, (rock, x, y), "START")
+        stop = False
+
+        while not stop:
+            jet = self.jet_list[self.jet]
+            self.jet = (self.jet + 1) % len(self.jet_list)
+
+            match jet.direction:
+                case Direction.Left if board.can_move_left(rock, x, y):
+                    x -= 1
+                case Direction.Right if board.can_move_right(rock, x, y):
+                    x += 1
+                case _:
+                    pass
 
-        return height
+            _print(board, (rock, x, y), jet.direction.name.upper())
+
+            # check if the rock collides down
+            if board.can_move_down(rock, x, y):
+                y -= 1
+                _print(board, (rock, x, y), "DOWN")
+            else:
+                stop = True
+
+        board.apply(rock.board, x, y)
+
+        # down to the row below the rock, where it stopped
+        self.deepest = max(self.deepest, self.height - y + 1)
+        self.height = max(self.height, y + rock.shape[1])
+        _print(board, None, f"FINISH (height={self.height})")
+        return self
+
+    def fingerprint(self) -> tuple[int, int, bytes]:
+        """
+        The next jet and rock and the rows below the top, as deep as any rock fell so far: if two
+        states match, the rocks in between fell within those rows, so the ones after them do too.
+        """
+        cells = self.board.grid.cells
+        cols = self.board.cols
+        rows = max(self.SURFACE_ROWS, self.deepest)
+        surface = cells[max(0, self.height - rows) * cols : self.height * cols]
+        return self.jet, self.rock, bytes(surface)
 
 
 def _print(board: Board, rockT: tuple[Piece, int, int] | None, msg: str):
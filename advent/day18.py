@@ -1,37 +1,36 @@
 from __future__ import annotations
 
-from collections import deque
+from collections.abc import Iterator
 from dataclasses import dataclass
-from typing import override
+from typing import NamedTuple, override
 
+from advent.buffers import Bytes, rows
 from advent.common import BaseAdventDay
+from advent.graph import INF, Graph, bfs
 
+_DIRECTIONS = ((1, 0, 0), (-1, 0, 0), (0, 1, 0), (0, -1, 0), (0, 0, 1), (0, 0, -1))
 
-@dataclass(frozen=True)
-class Cube:
+
+class Cube(NamedTuple):
     x: int
     y: int
     z: int
 
-    def adjacents(self) -> set[Cube]:
-        return {
-            Cube(self.x + x, self.y + y, self.z + z)
-            for x, y, z in (
-                (1, 0, 0),
-                (-1, 0, 0),
-                (0, 1, 0),
-                (0, -1, 0),
-                (0, 0, 1),
-                (0, 0, -1),
-            )
-        }
+    def adjacents(self) -> Iterator[tuple[int, int, int]]:
+        x, y, z = self
+        # plain tuples hash and compare equal to the cubes, without building them
+        return ((x + dx, y + dy, z + dz) for dx, dy, dz in _DIRECTIONS)
 
 
 @dataclass
 class Day18(BaseAdventDay[list[Cube]]):
     @override
     def parse_input(self) -> list[Cube]:
-        return [Cube(*map(int, line.strip().split(","))) for line in self.input]
+        return self.parse_buffer(self.input.read().encode())
+
+    @override
+    def parse_buffer(self, data: Bytes) -> list[Cube]:
+        return list(map(Cube._make, rows(data, 3)))
 
     @override
     def _run_1(self, input: list[Cube]):
@@ -47,34 +46,31 @@ class Day18(BaseAdventDay[list[Cube]]):
 
     @override
     def _run_2(self, input: list[Cube]):
-        cubes = set(input)
-        mx = max(c.x for c in input) + 1
-        my = max(c.y for c in input) + 1
-        mz = max(c.z for c in input) + 1
-
-        start = Cube(-1, -1, -1)
-
-        frontier = deque([start])
-        visited = set[Cube]()
-        sides = 0
-
-        while frontier:
-            c = frontier.popleft()
-            if c in visited or (c.x > mx or c.y > my or c.z > mz):
-                continue
-
-            visited.add(c)
-
-            adjs = set(c.adjacents())
-            for adj in adjs:
-                if adj in cubes:
-                    sides += 1
-
-                if (
-                    adj not in cubes
-                    and adj not in visited
-                    and all(q >= -1 for q in (adj.x, adj.y, adj.z))
-                ):
-                    frontier.append(adj)
-
-        return sides
+        # the bounding box with a layer of air all around, so that the outside is connected
+        axes = list(zip(*input))
+        lo = [min(axis) - 1 for axis in axes]
+        sx, sy, sz = (max(axis) + 2 - low for axis, low in zip(axes, lo))
+        steps = (1, sx, sx * sy)
+
+        def index(x: int, y: int, z: int) -> int:
+            return (x - lo[0]) + (y - lo[1]) * sx + (z - lo[2]) * sx * sy
+
+        def adjacents(i: int) -> list[int]:
+            coords = (i % sx, i // sx % sy, i // (sx * sy))
+            return [
+                i + d * step
+                for step, coord, size in zip(steps, coords, (sx, sy, sz))
+                for d in (-1, 1)
+                if 0 <= coord + d < size
+            ]
+
+        solid = bytearray(sx * sy * sz)
+        for c in input:
+            solid[index(*c)] = 1
+
+        air = Graph.from_adjacency(
+            [j for j in adjacents(i) if not solid[j]] if not solid[i] else []
+            for i in range(len(solid))
+        )
+        outside = bfs(air, index(*lo))
+        return sum(solid[j] for i, d in enumerate(outside) if d != INF for j in adjacents(i))
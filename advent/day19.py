@@ -1,15 +1,22 @@
 from __future__ import annotations
 
-import re
+from collections.abc import Iterator
 from dataclasses import dataclass
 from typing import Self, override
 
+from advent.buffers import Bytes, Template, lines
 from advent.common import BaseAdventDay
+from advent.memo import MemoStore
+from advent.search import Memo, Search
 
-PATTERN: re.Pattern[str] = re.compile(
-    r"Blueprint (\d+): Each ore robot costs (\d+) ore\. Each clay robot costs (\d+) ore\. "
-    r"Each obsidian robot costs (\d+) ore and (\d+) clay\. "
-    r"Each geode robot costs (\d+) ore and (\d+) obsidian\.",
+# states kept by the memo of the search of each blueprint, evicting the ones not recently used
+# over it
+MEMO_ENTRIES = 1 << 18
+
+BLUEPRINT = Template(
+    r"Blueprint {int}: Each ore robot costs {int} ore\. Each clay robot costs {int} ore\. "
+    r"Each obsidian robot costs {int} ore and {int} clay\. "
+    r"Each geode robot costs {int} ore and {int} obsidian\.",
 )
 
 
@@ -24,14 +31,8 @@ class Blueprint:
     ]
 
     @classmethod
-    def from_string(cls, blueprint: str) -> Self:
-        match = PATTERN.match(blueprint)
-        if not match:
-            raise ValueError(f"Invalid blueprint: {blueprint}")
-
-        id = int(match.group(1))
-        costs = tuple(int(match.group(i)) for i in range(2, 8))
-        assert len(costs) == 6
+    def from_line(cls, line: Bytes | memoryview) -> Self:
+        id, *costs = BLUEPRINT.match(line)
         return cls(
             id,
             (
@@ -83,39 +84,90 @@ class State:
 class Day19(BaseAdventDay[list[Blueprint]]):
     @override
     def parse_input(self) -> list[Blueprint]:
-        return [Blueprint.from_string(line) for line in self.input]
+        return self.parse_buffer(self.input.read().encode())
+
+    @override
+    def parse_buffer(self, data: Bytes) -> list[Blueprint]:
+        return [Blueprint.from_line(line) for line in lines(data) if line]
 
     @override
     def _run_1(self, input: list[Blueprint]):
         tot = 0
         minutes = 24
+        # best geodes of each blueprint, a lower bound for the one being simulated
+        geodes_by_id: dict[int, int] = {}
+        search: Search[State, tuple[object, ...]] | None = None
+        current = 0
+        self.progress.start(
+            len(input),
+            best=lambda: {**geodes_by_id, current: search.best if search is not None else 0},
+        )
         for bp in input:
             initial_state = State((1, 0, 0, 0), (0, 0, 0), 0, minutes, minutes)
-            visited: dict[State, int] = {}
-            geodes = self._simulate(bp, initial_state, visited)
+            current = bp.id
+            search = self._search(bp)
+            geodes = geodes_by_id[bp.id] = search.run(initial_state)
+            search.report(self.stats)
             tot += bp.id * geodes
+            self.progress.advance()
         return tot
 
     @override
     def _run_2(self, input: list[Blueprint]):
         pass
 
-    def _simulate(self, blueprint: Blueprint, state: State, visited: dict[State, int]) -> int:
-        new_states = [state.new_state_buying(blueprint, i) for i in range(4)] + [
-            state.new_state_not_buying()
-        ]
-
-        geodes: list[int] = []
-        for s in new_states:
-            if s is None:
-                continue
-
-            if s.minutes == 0 or s in visited:
-                g = s.geodes
-            else:
-                g = self._simulate(blueprint, s, visited)
-
-            visited[s] = g
-            geodes.append(g)
-
-        return max(geodes, default=0)
+    def _search(self, blueprint: Blueprint) -> Search[State, tuple[object, ...]]:
+        # no point in producing more of a resource per minute than any robot costs
+        max_robots = [max(cost[i] for cost in blueprint.costs) for i in range(3)] + [99]
+
+        def successors(state: State) -> Iterator[State]:
+            if state.minutes == 0:
+                return
+            yield state.new_state_not_buying()
+            for i in range(4):
+                if state.robots[i] < max_robots[i]:
+                    if (s := state.new_state_buying(blueprint, i)) is not None:
+                        yield s
+
+        def value(state: State) -> int:
+            # the geodes at the end if no more robots are bought
+            return state.geodes + state.robots[3] * state.minutes
+
+        obsidian_cost = blueprint.costs[2][1]
+        geode_cost = blueprint.costs[3][2]
+
+        def bound(state: State) -> int:
+            # free ore, and every minute a clay robot plus an obsidian and a geode robot whenever
+            # affordable, each paid from its own resource
+            _, clay, obsidian = state.resources
+            _, clay_robots, obsidian_robots, geode_robots = state.robots
+            geodes = state.geodes
+            for _ in range(state.minutes):
+                new_geode = obsidian >= geode_cost
+                new_obsidian = clay >= obsidian_cost
+                if new_geode:
+                    obsidian -= geode_cost
+                if new_obsidian:
+                    clay -= obsidian_cost
+                geodes += geode_robots
+                obsidian += obsidian_robots
+                clay += clay_robots
+                geode_robots += new_geode
+                obsidian_robots += new_obsidian
+                clay_robots += 1
+            return geodes
+
+        def key(state: State) -> tuple[object, ...]:
+            # more of a resource than can be spent before the end makes no difference
+            m = state.minutes
+            resources = tuple(min(r, c * m) for r, c in zip(state.resources, max_robots))
+            return state.robots, resources, m
+
+        return Search(
+            successors,
+            value,
+            bound,
+            key=key,
+            memo=Memo(MemoStore(MEMO_ENTRIES, eviction="clock")),
+            progress=self.progress,
+        )
@@ -2,7 +2,7 @@ from abc import ABCMeta, abstractmethod
 from dataclasses import dataclass
 from typing import Literal, override
 
-from advent.common import SameComputationAdventDay, Variant
+from advent.common import LineConsumer, SameComputationAdventDay, StreamingAdventDay, Variant
 
 type Play = Literal["P", "R", "S"]
 type OppChar = Literal["A", "B", "C"]
@@ -60,8 +60,21 @@ type InputRow = tuple[OppChar, YourChar]
 Input = list[InputRow]
 
 
+class _Total:
+    def __init__(self, fn: Base) -> None:
+        self.fn = fn
+        self.total = 0
+
+    def feed(self, line: str) -> None:
+        o, y = line.split()
+        self.total += self.fn(o, y)  # type: ignore
+
+    def finish(self) -> int:
+        return self.total
+
+
 @dataclass
-class Day2(SameComputationAdventDay[Input]):
+class Day2(SameComputationAdventDay[Input], StreamingAdventDay[Input]):
     @override
     def parse_input(self) -> list[InputRow]:
         ret: list[InputRow] = []
@@ -74,9 +87,15 @@ class Day2(SameComputationAdventDay[Input]):
 
     @override
     def compute(self, var: Variant, input: Input) -> int:
+        fn = self._scorer(var)
+        return sum(fn(*r) for r in input)
+
+    @override
+    def consumer(self, variant: Variant) -> LineConsumer:
+        return _Total(self._scorer(variant))
+
+    def _scorer(self, var: Variant) -> Base:
         if var == 1:
-            fn = Result1()
+            return Result1()
         else:
-            fn = Result2()
-
-        return sum(fn(*r) for r in input)
+            return Result2()
@@ -1,23 +1,59 @@
+from __future__ import annotations
+
 import itertools as it
+import string
+from collections.abc import Iterable
 from dataclasses import dataclass
-from functools import cache, reduce
+from functools import reduce
 from typing import override
 
-from advent.common import BaseAdventDay
+from advent.common import LineConsumer, StreamingAdventDay, Variant
+
+# a to z are 1 to 26, A to Z 27 to 52
+PRIORITIES = {c: i for i, c in enumerate(string.ascii_lowercase + string.ascii_uppercase, 1)}
+
+
+class _Priorities:
+    """Sum of the priorities of the item shared by the halves of each rucksack (variant 1)."""
+
+    def __init__(self, day: Day3) -> None:
+        self.day = day
+        self.total = 0
+
+    def feed(self, line: str) -> None:
+        self.total += self.day.misplaced_score(line.strip())
+
+    def finish(self) -> int:
+        return self.total
+
 
-cached_ord = cache(ord)
+class _Badges:
+    """Sum of the priorities of the badge of each group of three rucksacks (variant 2)."""
+
+    def __init__(self, day: Day3) -> None:
+        self.day = day
+        self.group: list[str] = []
+        self.total = 0
+
+    def feed(self, line: str) -> None:
+        self.group.append(line.strip())
+        if len(self.group) == 3:
+            self.total += self.day.badge_score(self.group)
+            self.group.clear()
+
+    def finish(self) -> int:
+        if self.group:
+            self.total += self.day.badge_score(self.group)
+        return self.total
 
 
 @dataclass
-class Day3(BaseAdventDay[list[str]]):
+class Day3(StreamingAdventDay[list[str]]):
     def get_score(self, letter: str) -> int:
-        o = ord(letter)
-        if cached_ord("a") <= o <= cached_ord("z"):
-            return o - cached_ord("a") + 1
-        elif cached_ord("A") <= o <= cached_ord("Z"):
-            return o - cached_ord("A") + 27
-        else:
-            raise ValueError(f"Invalid letter {letter}")
+        try:
+            return PRIORITIES[letter]
+        except KeyError:
+            raise ValueError(f"Invalid letter {letter}") from None
 
     @override
     def parse_input(self) -> list[str]:
@@ -25,19 +61,22 @@ class Day3(BaseAdventDay[list[str]]):
 
     @override
     def _run_1(self, input: list[str]) -> int:
-        def process_row(row: str):
-            half = len(row) // 2
-            left, right = row[:half], row[half:]
-            return frozenset(left) & frozenset(right)
-
-        return sum(max(self.get_score(c) for c in process_row(r)) for r in input)
+        return sum(self.misplaced_score(r) for r in input)
 
     @override
     def _run_2(self, input: list[str]) -> int:
-        tot = 0
-        for group in it.batched(input, 3):
-            ret = reduce(set[str].__and__, map(set, group))
-            assert ret
-            badge = ret.pop()
-            tot += self.get_score(badge)
-        return tot
+        return sum(self.badge_score(group) for group in it.batched(input, 3))
+
+    @override
+    def consumer(self, variant: Variant) -> LineConsumer:
+        return _Priorities(self) if variant == 1 else _Badges(self)
+
+    def misplaced_score(self, row: str) -> int:
+        half = len(row) // 2
+        left, right = row[:half], row[half:]
+        return max(self.get_score(c) for c in frozenset(left) & frozenset(right))
+
+    def badge_score(self, group: Iterable[str]) -> int:
+        ret = reduce(set[str].__and__, map(set, group))
+        assert ret
+        return self.get_score(ret.pop())
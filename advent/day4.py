@@ -1,36 +1,58 @@
-import re
+from collections.abc import Callable
 from dataclasses import dataclass
 from typing import override
 
-from advent.common import SameComputationAdventDay, Variant
+from advent.buffers import Bytes, Template, lines
+from advent.common import LineConsumer, SameComputationAdventDay, StreamingAdventDay, Variant
 
-REGEX = re.compile(r"^(\d+)-(\d+),(\d+)-(\d+)$")
 R = tuple[int, int]
 
+ROW = Template(r"{uint}-{uint},{uint}-{uint}")
+
+
+def _parse_row(row: str) -> tuple[R, R]:
+    d1, d2, d3, d4 = ROW.match(row.encode())
+    return (d1, d2), (d3, d4)
+
+
+class _Count:
+    def __init__(self, fn: Callable[[int, int, int, int], bool]) -> None:
+        self.fn = fn
+        self.count = 0
+
+    def feed(self, line: str) -> None:
+        p1, p2 = _parse_row(line.strip())
+        if self.fn(*p1, *p2):
+            self.count += 1
+
+    def finish(self) -> int:
+        return self.count
+
 
 @dataclass
-class Day4(SameComputationAdventDay[list[tuple[R, R]]]):
+class Day4(SameComputationAdventDay[list[tuple[R, R]]], StreamingAdventDay[list[tuple[R, R]]]):
     @override
     def parse_input(self) -> list[tuple[R, R]]:
-        def process(row: str):
-            try:
-                match = REGEX.match(row)
-                assert match
-                d1, d2, d3, d4 = map(int, match.groups())
-                return (d1, d2), (d3, d4)
-            except AttributeError:
-                raise ValueError(f"Invalid row: {row}") from None
+        return self.parse_buffer(self.input.read().encode())
 
-        return [process(row.strip()) for row in self.input]
+    @override
+    def parse_buffer(self, data: Bytes) -> list[tuple[R, R]]:
+        return [((a, b), (c, d)) for a, b, c, d in map(ROW.match, lines(data))]
 
     @override
     def compute(self, var: Variant, input: list[tuple[R, R]]) -> int:
+        fn = self._predicate(var)
+        return sum(1 if fn(*p1, *p2) else 0 for (p1, p2) in input)
+
+    @override
+    def consumer(self, variant: Variant) -> LineConsumer:
+        return _Count(self._predicate(variant))
+
+    def _predicate(self, var: Variant) -> Callable[[int, int, int, int], bool]:
         if var == 1:
-            fn = self._contained
+            return self._contained
         else:
-            fn = self._overlaps
-
-        return sum(1 if fn(*p1, *p2) else 0 for (p1, p2) in input)
+            return self._overlaps
 
     def _contained(self, a: int, b: int, c: int, d: int) -> bool:
         return (a <= c and b >= d) or (a >= c and b <= d)
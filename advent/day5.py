@@ -6,7 +6,7 @@ from typing import TextIO, override
 from advent.common import SameComputationAdventDay, Variant
 
 
-@dataclass
+@dataclass(slots=True)
 class Move:
     target: int
     from_: str
@@ -31,6 +31,10 @@ class Day5(SameComputationAdventDay[Input]):
 
         return Input(crates, moves)
 
+    @override
+    def snapshot(self, input: Input) -> Input:
+        return Input({k: list(v) for k, v in input.crates.items()}, input.moves)
+
     @override
     def compute(self, var: Variant, input: Input):
         if var == 1:
@@ -7,23 +7,20 @@ from operator import itemgetter, mul
 from typing import override
 
 from advent.common import BaseAdventDay
-
-type Matrix = list[list[int]]
-type Grid = tuple[Matrix, Matrix]
+from advent.grid import Grid
 
 
 @dataclass
 class Day8(BaseAdventDay[Grid]):
     @override
     def parse_input(self) -> Grid:
-        by_row = [list(map(int, line.strip())) for line in self.input]
-        by_col = list(map(list, zip(*by_row)))
-        return by_row, by_col
+        # the heights stay ASCII digits, which compare the same
+        return Grid.from_rows(line.strip().encode() for line in self.input)
 
     @override
     def _run_1(self, input: Grid) -> int:
-        r = len(input[0])
-        c = len(input[1])
+        r = input.rows
+        c = input.cols
         edges = 2 * r + 2 * (c - 2)
         return (
             sum(
@@ -36,8 +33,8 @@ class Day8(BaseAdventDay[Grid]):
 
     @override
     def _run_2(self, input: Grid) -> int:
-        r = len(input[0])
-        c = len(input[1])
+        r = input.rows
+        c = input.cols
         return max(self._score(input, i, j) for i in range(1, r - 1) for j in range(1, c - 1))
 
     def _score(self, grid: Grid, i: int, j: int) -> int:
@@ -45,8 +42,8 @@ class Day8(BaseAdventDay[Grid]):
         return reduce(mul, map(itemgetter(0), bl))
 
     def _blocked(self, grid: Grid, i: int, j: int) -> Iterable[tuple[int, int | None]]:
-        row = grid[0][i]
-        col = grid[1][j]
+        row = grid.row(i)
+        col = grid.col(j)
         val = row[j]
         return (
             next(((i, v) for i, v in enumerate(x, start=1) if v >= val), (len(x), None))
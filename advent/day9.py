@@ -1,15 +1,18 @@
 from __future__ import annotations
 
-from collections.abc import Iterable
+from collections.abc import Callable, Iterable
 from dataclasses import dataclass
 from typing import Literal, override
 
-from advent.common import SameComputationAdventDay, Variant
+from advent.buffers import Bytes
+from advent.common import SameComputationAdventDay, StreamingAdventDay, Variant
 
 type Move = Literal["U", "D", "L", "R"]
 type Pos = tuple[int, int]
 Moves = list[tuple[Move, int]]
 
+MOVES: dict[bytes, Move] = {b"U": "U", b"D": "D", b"L": "L", b"R": "R"}
+
 
 def components(p: Pos) -> Iterable[Pos]:
     x, y = p
@@ -22,34 +25,62 @@ def components(p: Pos) -> Iterable[Pos]:
         yield (0, y)
 
 
+def _parse_move(line: str) -> tuple[Move, int]:
+    parts = line.strip().split()
+    assert len(parts) == 2
+    move: Move = parts[0]  # type: ignore
+    return move, int(parts[1])
+
+
+class _Rope:
+    def __init__(
+        self,
+        body_size: int,
+        move_head: Callable[[Pos, Move], Pos],
+        follow: Callable[[Pos, Pos], Pos],
+    ) -> None:
+        self.positions: list[Pos] = [(0, 0)] * body_size
+        self.visited: set[Pos] = set()
+        self.move_head = move_head
+        self.follow = follow
+
+    def move(self, move: Move, steps: int) -> None:
+        positions = self.positions
+        for _ in range(steps):
+            positions[0] = self.move_head(positions[0], move)
+            for i in range(1, len(positions)):
+                positions[i] = self.follow(positions[i - 1], positions[i])
+            self.visited.add(positions[-1])
+
+    def feed(self, line: str) -> None:
+        self.move(*_parse_move(line))
+
+    def finish(self) -> int:
+        return len(self.visited)
+
+
 @dataclass
-class Day9(SameComputationAdventDay[Moves]):
+class Day9(SameComputationAdventDay[Moves], StreamingAdventDay[Moves]):
     @override
     def parse_input(self) -> Moves:
-        moves: list[tuple[Move, int]] = []
-        for line in self.input:
-            line = line.strip().split()
-            assert len(line) == 2
-            move: Move = line[0]  # type: ignore
-            moves.append((move, int(line[1])))
+        return [_parse_move(line) for line in self.input]
 
-        return moves
+    @override
+    def parse_buffer(self, data: Bytes) -> Moves:
+        # alternating directions and steps
+        tokens = data.split()
+        return list(zip(map(MOVES.__getitem__, tokens[::2]), map(int, tokens[1::2]), strict=True))
 
     @override
     def compute(self, var: Variant, input: Moves):
-        body_size = 2 if var == 1 else 10
-
-        positions: list[Pos] = [(0, 0)] * body_size
-        visited: set[Pos] = set()
-
+        rope = self.consumer(var)
         for move in input:
-            for _ in range(move[1]):
-                positions[0] = self._move(positions[0], move[0])
-                for i in range(1, len(positions)):
-                    positions[i] = self._fix(positions[i - 1], positions[i])
-                visited.add(positions[-1])
+            rope.move(*move)
+        return rope.finish()
 
-        return len(visited)
+    @override
+    def consumer(self, variant: Variant) -> _Rope:
+        return _Rope(2 if variant == 1 else 10, self._move, self._fix)
 
     def _move(self, pos: Pos, move: Move) -> Pos:
         x, y = pos
@@ -0,0 +1,333 @@
+"""
+Generators of synthetic inputs of arbitrary size, valid for the parsers and the solvers of each
+day. The meaning of `size` depends on the day and is given in the docstring of each generator.
+"""
+
+from __future__ import annotations
+
+import itertools as it
+import string
+from collections.abc import Callable
+from dataclasses import dataclass
+from random import Random
+
+
+@dataclass(frozen=True)
+class Generator:
+    fn: Callable[[int, Random], str]
+    base_size: int
+
+    def __call__(self, size: int, seed: int = 0) -> str:
+        return self.fn(size, Random(seed))
+
+    @property
+    def unit(self) -> str:
+        return (self.fn.__doc__ or "").strip().partition("\n")[0]
+
+
+GENERATORS: dict[int, Generator] = {}
+
+
+def generator(day: int, base_size: int) -> Callable[[Callable[[int, Random], str]], Generator]:
+    def decorator(fn: Callable[[int, Random], str]) -> Generator:
+        gen = GENERATORS[day] = Generator(fn, base_size)
+        return gen
+
+    return decorator
+
+
+def generate(day: int, size: int, seed: int = 0) -> str:
+    return GENERATORS[day](size, seed)
+
+
+def _lines(rows: list[str]) -> str:
+    return "\n".join(rows) + "\n"
+
+
+@generator(1, base_size=1000)
+def _day1(size: int, rng: Random) -> str:
+    """elves"""
+    groups = (
+        "\n".join(str(rng.randint(1000, 9999)) for _ in range(rng.randint(1, 10)))
+        for _ in range(size)
+    )
+    return "\n\n".join(groups) + "\n"
+
+
+@generator(2, base_size=1000)
+def _day2(size: int, rng: Random) -> str:
+    """rounds"""
+    return _lines([f"{rng.choice('ABC')} {rng.choice('XYZ')}" for _ in range(size)])
+
+
+@generator(3, base_size=300)
+def _day3(size: int, rng: Random) -> str:
+    """groups of three rucksacks"""
+    letters = string.ascii_letters
+    rows: list[str] = []
+    for _ in range(size):
+        badge = rng.choice(letters)
+        for _ in range(3):
+            half = rng.randint(4, 20)
+            common = rng.choice(letters)
+            left = [rng.choice(letters) for _ in range(half - 1)] + [common]
+            right = [rng.choice(letters) for _ in range(half - 2)] + [common, badge]
+            rng.shuffle(left)
+            rng.shuffle(right)
+            rows.append("".join(left + right))
+    return _lines(rows)
+
+
+@generator(4, base_size=1000)
+def _day4(size: int, rng: Random) -> str:
+    """pairs of sections"""
+
+    def section() -> str:
+        a = rng.randint(1, 99)
+        return f"{a}-{rng.randint(a, 99)}"
+
+    return _lines([f"{section()},{section()}" for _ in range(size)])
+
+
+@generator(5, base_size=500)
+def _day5(size: int, rng: Random) -> str:
+    """moves"""
+    stacks = [
+        [rng.choice(string.ascii_uppercase) for _ in range(rng.randint(5, 30))] for _ in range(9)
+    ]
+
+    height = max(map(len, stacks))
+    rows = [
+        " ".join(f"[{s[h]}]" if h < len(s) else "   " for s in stacks)
+        for h in range(height - 1, -1, -1)
+    ]
+    rows.append(" ".join(f" {i} " for i in range(1, 10)))
+    rows.append("")
+
+    for _ in range(size):
+        # never empty a stack, the answer is made of the top crates
+        src = rng.choice([i for i, s in enumerate(stacks) if len(s) > 1])
+        dst = rng.choice([i for i in range(9) if i != src])
+        amount = rng.randint(1, len(stacks[src]) - 1)
+        stacks[dst].extend(stacks[src][-amount:])
+        del stacks[src][-amount:]
+        rows.append(f"move {amount} from {src + 1} to {dst + 1}")
+
+    return _lines(rows)
+
+
+@generator(6, base_size=10_000)
+def _day6(size: int, rng: Random) -> str:
+    """characters"""
+    # low variety noise, the markers are only found at the very end
+    noise = "".join(rng.choice("abc") for _ in range(size))
+    return noise + "".join(rng.sample(string.ascii_lowercase, 14)) + "\n"
+
+
+@generator(7, base_size=500)
+def _day7(size: int, rng: Random) -> str:
+    """filesystem entries"""
+    rows = ["$ cd /"]
+    names = (f"{a}{b}" for a, b in it.product(string.ascii_lowercase, repeat=2))
+    budget = [size]
+
+    def visit(depth: int) -> None:
+        count = min(budget[0], rng.randint(1, 8))
+        budget[0] -= count
+        dirs: list[str] = []
+        rows.append("$ ls")
+        for _ in range(count):
+            name = next(names, None) or f"n{budget[0]}{len(rows)}"
+            if depth < 12 and rng.random() < 0.3:
+                dirs.append(name)
+                rows.append(f"dir {name}")
+            else:
+                rows.append(f"{rng.randint(1000, 300_000)} {name}.txt")
+
+        for d in dirs:
+            rows.append(f"$ cd {d}")
+            visit(depth + 1)
+            rows.append("$ cd ..")
+
+    while budget[0] > 0:
+        visit(0)
+        rows.append("$ cd /")
+    rows.pop()
+    return _lines(rows)
+
+
+@generator(8, base_size=30)
+def _day8(size: int, rng: Random) -> str:
+    """grid side"""
+    return _lines(["".join(rng.choice(string.digits) for _ in range(size)) for _ in range(size)])
+
+
+@generator(9, base_size=500)
+def _day9(size: int, rng: Random) -> str:
+    """moves"""
+    return _lines([f"{rng.choice('UDLR')} {rng.randint(1, 20)}" for _ in range(size)])
+
+
+@generator(10, base_size=1000)
+def _day10(size: int, rng: Random) -> str:
+    """instructions"""
+    return _lines(
+        ["noop" if rng.random() < 0.4 else f"addx {rng.randint(-20, 20)}" for _ in range(size)]
+    )
+
+
+@generator(11, base_size=4)
+def _day11(size: int, rng: Random) -> str:
+    """monkeys"""
+    size = max(size, 2)
+    primes = [2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41, 43, 47]
+    blocks: list[str] = []
+    for i in range(size):
+        items = ", ".join(str(rng.randint(50, 99)) for _ in range(rng.randint(1, 8)))
+        # no `old * old`: variant 1 never reduces the worry levels, repeated squarings make
+        # them grow exponentially and the run time with them
+        if rng.random() < 0.4:
+            op = f"old * {rng.randint(2, 19)}"
+        else:
+            op = f"old + {rng.randint(1, 8)}"
+        others = [m for m in range(size) if m != i]
+        blocks.append(
+            f"Monkey {i}:\n"
+            f"  Starting items: {items}\n"
+            f"  Operation: new = {op}\n"
+            f"  Test: divisible by {rng.choice(primes)}\n"
+            f"    If true: throw to monkey {rng.choice(others)}\n"
+            f"    If false: throw to monkey {rng.choice(others)}"
+        )
+    return "\n\n".join(blocks) + "\n"
+
+
+@generator(12, base_size=40)
+def _day12(size: int, rng: Random) -> str:
+    """grid side"""
+    size = max(size, 2)
+    # a noisy ramp from the top left to the bottom right corner, every step climbable
+    rows: list[str] = []
+    for i in range(size):
+        row: list[str] = []
+        for j in range(size):
+            level = min(25, (i + j) * 26 // (2 * size))
+            if level > 0 and rng.random() < 0.2:
+                level -= 1
+            row.append(chr(ord("a") + level))
+        rows.append("".join(row))
+
+    rows[0] = "S" + rows[0][1:]
+    rows[-1] = rows[-1][:-1] + "E"
+    return _lines(rows)
+
+
+@generator(13, base_size=150)
+def _day13(size: int, rng: Random) -> str:
+    """pairs of packets"""
+
+    def packet(depth: int) -> str:
+        items = (
+            packet(depth + 1) if depth < 4 and rng.random() < 0.3 else str(rng.randint(0, 10))
+            for _ in range(rng.randint(0, 5))
+        )
+        return "[" + ",".join(items) + "]"
+
+    return "\n".join(f"{packet(0)}\n{packet(0)}\n" for _ in range(size))
+
+
+@generator(14, base_size=50)
+def _day14(size: int, rng: Random) -> str:
+    """rock paths, the cave gets one unit deeper with each path"""
+    depth = 10 + size
+    steps = [d for d in range(-6, 7) if d]
+    rows: list[str] = []
+    for _ in range(size):
+        x = rng.randint(500 - depth, 500 + depth)
+        y = rng.randint(5, depth)
+        points = [(x, y)]
+        for k in range(rng.randint(1, 4)):
+            # alternate horizontal and vertical segments
+            if k % 2:
+                y = max(1, min(depth, y + rng.choice(steps)))
+            else:
+                x += rng.choice(steps)
+            points.append((x, y))
+        rows.append(" -> ".join(f"{px},{py}" for px, py in points))
+    return _lines(rows)
+
+
+@generator(15, base_size=30)
+def _day15(size: int, rng: Random) -> str:
+    """sensors, half of them reaching the row of variant 1"""
+    side = 4_000_000
+    reach = max(10_000, side // max(1, int(size**0.5)))
+    rows: list[str] = []
+    for i in range(size):
+        sx = rng.randint(0, side)
+        sy = rng.randint(0, side) if i % 2 else side // 2 + rng.randint(-reach // 2, reach // 2)
+        bx = sx + rng.randint(-reach, reach)
+        by = sy + rng.randint(-reach, reach)
+        rows.append(f"Sensor at x={sx}, y={sy}: closest beacon is at x={bx}, y={by}")
+    return _lines(rows)
+
+
+@generator(16, base_size=20)
+def _day16(size: int, rng: Random) -> str:
+    """valves, a quarter of them with a positive flow rate"""
+    size = max(2, min(size, 26 * 26))
+    names = ["AA"] + rng.sample(
+        [a + b for a, b in it.product(string.ascii_uppercase, repeat=2) if a + b != "AA"],
+        size - 1,
+    )
+    edges: dict[str, set[str]] = {n: set() for n in names}
+
+    def connect(a: str, b: str) -> None:
+        edges[a].add(b)
+        edges[b].add(a)
+
+    for i in range(1, size):
+        connect(names[i], names[rng.randrange(i)])
+    for _ in range(size // 2):
+        a, b = rng.sample(names, 2)
+        connect(a, b)
+
+    working = set(rng.sample(names[1:], max(1, size // 4)))
+    rows: list[str] = []
+    for name in names:
+        rate = rng.randint(1, 25) if name in working else 0
+        out = sorted(edges[name])
+        if len(out) == 1:
+            tunnels = f"tunnel leads to valve {out[0]}"
+        else:
+            tunnels = f"tunnels lead to valves {', '.join(out)}"
+        rows.append(f"Valve {name} has flow rate={rate}; {tunnels}")
+    return _lines(rows)
+
+
+@generator(17, base_size=2000)
+def _day17(size: int, rng: Random) -> str:
+    """jets"""
+    return "".join(rng.choice("<>") for _ in range(size)) + "\n"
+
+
+@generator(18, base_size=1000)
+def _day18(size: int, rng: Random) -> str:
+    """cubes"""
+    side = max(3, round((size * 3) ** (1 / 3)))
+    cubes = rng.sample(list(it.product(range(side), repeat=3)), min(size, side**3))
+    return _lines([f"{x},{y},{z}" for x, y, z in cubes])
+
+
+@generator(19, base_size=1)
+def _day19(size: int, rng: Random) -> str:
+    """blueprints"""
+    return _lines(
+        [
+            f"Blueprint {i}: Each ore robot costs {rng.randint(2, 4)} ore. "
+            f"Each clay robot costs {rng.randint(2, 4)} ore. "
+            f"Each obsidian robot costs {rng.randint(2, 4)} ore and {rng.randint(5, 20)} clay. "
+            f"Each geode robot costs {rng.randint(2, 4)} ore and {rng.randint(5, 20)} obsidian."
+            for i in range(1, size + 1)
+        ]
+    )
@@ -0,0 +1,156 @@
+"""
+Graphs over the integers `0..n-1` in compressed sparse row form, with the shortest path searches
+the days need. The out-edges of node `u` are `targets[offsets[u]:offsets[u + 1]]`, their weights
+at the same positions of `weights`, which is None when they are all 1.
+"""
+
+from __future__ import annotations
+
+import heapq
+from array import array
+from collections import deque
+from collections.abc import Iterable
+from dataclasses import dataclass
+from itertools import repeat
+
+# distance of the nodes a search did not reach
+INF = 1 << 62
+
+type Sources = int | Iterable[int]
+
+
+@dataclass(slots=True)
+class Graph:
+    offsets: array[int]
+    targets: array[int]
+    weights: array[int] | None
+
+    @classmethod
+    def from_adjacency(cls, adjacency: Iterable[Iterable[int]]) -> Graph:
+        """Unit weights, the i-th item holding the targets of node i."""
+        offsets = array("q", [0])
+        targets = array("i")
+        for out in adjacency:
+            targets.extend(out)
+            offsets.append(len(targets))
+        return cls(offsets, targets, None)
+
+    @classmethod
+    def from_edges(cls, n: int, edges: Iterable[tuple[int, int, int]]) -> Graph:
+        """From `(source, target, weight)` triples in any order."""
+        edges = list(edges)
+        counts = [0] * (n + 1)
+        for u, _, _ in edges:
+            counts[u + 1] += 1
+        for u in range(n):
+            counts[u + 1] += counts[u]
+
+        targets = array("i", bytes(4 * len(edges)))
+        weights = array("q", bytes(8 * len(edges)))
+        free = counts[:-1]
+        for u, v, w in edges:
+            i = free[u]
+            free[u] += 1
+            targets[i] = v
+            weights[i] = w
+        return cls(array("q", counts), targets, weights)
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def neighbors(self, u: int) -> array[int]:
+        return self.targets[self.offsets[u] : self.offsets[u + 1]]
+
+    def edges(self, u: int) -> Iterable[tuple[int, int]]:
+        start, end = self.offsets[u], self.offsets[u + 1]
+        weights = self.weights[start:end] if self.weights is not None else repeat(1)
+        return zip(self.targets[start:end], weights)
+
+
+def _sources(sources: Sources) -> list[int]:
+    return [sources] if isinstance(sources, int) else list(sources)
+
+
+def bfs(graph: Graph, sources: Sources) -> list[int]:
+    """Number of edges from the nearest source to every node, ignoring the weights."""
+    dist = [INF] * len(graph)
+    frontier = _sources(sources)
+    for s in frontier:
+        dist[s] = 0
+
+    offsets, targets = graph.offsets, graph.targets
+    d = 0
+    while frontier:
+        d += 1
+        next_frontier: list[int] = []
+        for u in frontier:
+            for v in targets[offsets[u] : offsets[u + 1]]:
+                if dist[v] == INF:
+                    dist[v] = d
+                    next_frontier.append(v)
+        frontier = next_frontier
+    return dist
+
+
+def zero_one_bfs(graph: Graph, sources: Sources) -> list[int]:
+    """Shortest distances when every weight is 0 or 1, without a heap."""
+    if graph.weights is None:
+        return bfs(graph, sources)
+    if any(w not in (0, 1) for w in graph.weights):
+        raise ValueError("0-1 BFS needs weights of 0 or 1")
+
+    dist = [INF] * len(graph)
+    queue = deque[tuple[int, int]]()
+    for s in _sources(sources):
+        dist[s] = 0
+        queue.append((0, s))
+
+    while queue:
+        d, u = queue.popleft()
+        if d > dist[u]:
+            continue
+        for v, w in graph.edges(u):
+            if d + w < dist[v]:
+                dist[v] = d + w
+                if w:
+                    queue.append((d + 1, v))
+                else:
+                    queue.appendleft((d, v))
+    return dist
+
+
+def dijkstra(graph: Graph, sources: Sources, target: int | None = None) -> list[int]:
+    """
+    Shortest distances for non-negative weights. Improved nodes are pushed again instead of
+    updated in place, the stale entries are skipped when popped. Stops once target is settled.
+    """
+    if graph.weights is None:
+        return bfs(graph, sources)
+
+    dist = [INF] * len(graph)
+    heap: list[tuple[int, int]] = []
+    for s in _sources(sources):
+        dist[s] = 0
+        heap.append((0, s))
+    heapq.heapify(heap)
+
+    offsets, targets, weights = graph.offsets, graph.targets, graph.weights
+    while heap:
+        d, u = heapq.heappop(heap)
+        if d > dist[u]:
+            continue
+        if u == target:
+            break
+        for i in range(offsets[u], offsets[u + 1]):
+            v = targets[i]
+            nd = d + weights[i]
+            if nd < dist[v]:
+                dist[v] = nd
+                heapq.heappush(heap, (nd, v))
+    return dist
+
+
+def all_pairs(graph: Graph) -> list[list[int]]:
+    """`dist[u][v]` for every pair, from one BFS (unit weights) or Dijkstra per node."""
+    search = bfs if graph.weights is None else dijkstra
+    return [search(graph, u) for u in range(len(graph))]
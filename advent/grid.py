@@ -0,0 +1,86 @@
+"""
+Compact grids for the map days: one byte per cell in a flat, row-major `bytearray`, so a cell is
+addressed by the single integer `row * cols + col` and its neighbours by adding fixed offsets.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+
+
+@dataclass(slots=True)
+class Grid:
+    rows: int
+    cols: int
+    cells: bytearray
+
+    @classmethod
+    def filled(cls, rows: int, cols: int, value: int = 0) -> Grid:
+        return cls(rows, cols, bytearray([value]) * (rows * cols))
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Iterable[int] | bytes]) -> Grid:
+        """The rows must have the same length; str lines can be passed encoded."""
+        cells = bytearray()
+        count = cols = 0
+        for row in rows:
+            start = len(cells)
+            cells.extend(row)
+            width = len(cells) - start
+            if count == 0:
+                cols = width
+            elif width != cols:
+                raise ValueError(f"Row {count} has {width} cells instead of {cols}")
+            count += 1
+        return cls(count, cols, cells)
+
+    def index(self, row: int, col: int) -> int:
+        return row * self.cols + col
+
+    def pos(self, index: int) -> tuple[int, int]:
+        return divmod(index, self.cols)
+
+    def __getitem__(self, pos: tuple[int, int]) -> int:
+        row, col = pos
+        return self.cells[row * self.cols + col]
+
+    def __setitem__(self, pos: tuple[int, int], value: int) -> None:
+        row, col = pos
+        self.cells[row * self.cols + col] = value
+
+    def __len__(self) -> int:
+        return len(self.cells)
+
+    # while a view is alive the bytearray cannot be resized, append_rows raises BufferError
+    def row(self, row: int) -> memoryview:
+        start = row * self.cols
+        return memoryview(self.cells)[start : start + self.cols]
+
+    def col(self, col: int) -> memoryview:
+        # a strided view, no copy either
+        return memoryview(self.cells)[col :: self.cols]
+
+    def offsets(self) -> tuple[int, int, int, int]:
+        """Index deltas of the cells above, below, left and right."""
+        return -self.cols, self.cols, -1, 1
+
+    def neighbors(self, index: int) -> Iterator[int]:
+        """Indices of the orthogonal neighbours inside the grid."""
+        cols = self.cols
+        if index >= cols:
+            yield index - cols
+        if index + cols < len(self.cells):
+            yield index + cols
+        col = index % cols
+        if col > 0:
+            yield index - 1
+        if col < cols - 1:
+            yield index + 1
+
+    def append_rows(self, count: int, value: int = 0) -> None:
+        self.cells.extend(bytearray([value]) * (count * self.cols))
+        self.rows += count
+
+    def copy(self) -> Grid:
+        return Grid(self.rows, self.cols, self.cells.copy())
@@ -0,0 +1,102 @@
+"""
+Sets of integers stored as disjoint closed intervals `[starts[i], ends[i]]`, in two parallel
+sorted arrays. Intervals that overlap or touch are merged, so `ends[i] + 1 < starts[i + 1]`.
+"""
+
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_right
+from collections.abc import Iterable, Iterator
+from itertools import chain
+from typing import override
+
+
+class IntervalSet:
+    __slots__ = ("starts", "ends")
+
+    starts: array[int]
+    ends: array[int]
+
+    def __init__(self, intervals: Iterable[tuple[int, int]] = ()) -> None:
+        self.starts = array("q")
+        self.ends = array("q")
+        self.add_all(intervals)
+
+    def add_all(self, intervals: Iterable[tuple[int, int]]) -> None:
+        """Adds many intervals at once: sorted together with the current ones, then merged."""
+        starts: array[int] = array("q")
+        ends: array[int] = array("q")
+        for start, end in sorted(chain(self, intervals)):
+            if end < start:
+                continue
+            if ends and start <= ends[-1] + 1:
+                if end > ends[-1]:
+                    ends[-1] = end
+            else:
+                starts.append(start)
+                ends.append(end)
+        self.starts, self.ends = starts, ends
+
+    def add(self, start: int, end: int) -> None:
+        if end < start:
+            return
+        starts, ends = self.starts, self.ends
+        # first interval that could merge with it, and the one past the last
+        lo = bisect_right(ends, start - 2)
+        hi = bisect_right(starts, end + 1)
+        if lo < hi:
+            start = min(start, starts[lo])
+            end = max(end, ends[hi - 1])
+        starts[lo:hi] = array("q", [start])
+        ends[lo:hi] = array("q", [end])
+
+    def __iter__(self) -> Iterator[tuple[int, int]]:
+        return zip(self.starts, self.ends)
+
+    def __len__(self) -> int:
+        """Number of intervals, not of integers: see `coverage`."""
+        return len(self.starts)
+
+    def __contains__(self, value: int) -> bool:
+        i = bisect_right(self.starts, value) - 1
+        return i >= 0 and value <= self.ends[i]
+
+    @override
+    def __eq__(self, other: object) -> bool:
+        return (
+            isinstance(other, IntervalSet)
+            and self.starts == other.starts
+            and self.ends == other.ends
+        )
+
+    @override
+    def __repr__(self) -> str:
+        return f"IntervalSet({list(self)})"
+
+    def coverage(self) -> int:
+        """Number of integers in the set."""
+        return sum(self.ends) - sum(self.starts) + len(self.starts)
+
+    def gaps(self, lo: int, hi: int) -> Iterator[tuple[int, int]]:
+        """The intervals of [lo, hi] not in the set."""
+        for start, end in self.clip(lo, hi):
+            if start > lo:
+                yield lo, start - 1
+            lo = end + 1
+        if lo <= hi:
+            yield lo, hi
+
+    def clip(self, lo: int | None = None, hi: int | None = None) -> IntervalSet:
+        """The part of the set inside [lo, hi], unbounded on the sides that are None."""
+        clipped = IntervalSet()
+        first = 0 if lo is None else bisect_right(self.ends, lo - 1)
+        last = len(self) if hi is None else bisect_right(self.starts, hi)
+        if first < last:
+            clipped.starts = self.starts[first:last]
+            clipped.ends = self.ends[first:last]
+            if lo is not None:
+                clipped.starts[0] = max(clipped.starts[0], lo)
+            if hi is not None:
+                clipped.ends[-1] = min(clipped.ends[-1], hi)
+        return clipped
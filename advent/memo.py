@@ -0,0 +1,155 @@
+"""
+In-memory memo store with a budget of entries and of bytes, evicting the least recently used
+entries (LRU) or the ones not used since the clock hand last went past them (CLOCK).
+"""
+
+from __future__ import annotations
+
+import sys
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from typing import TYPE_CHECKING, Literal, cast
+
+if TYPE_CHECKING:
+    from .common import RunStats
+
+type Eviction = Literal["lru", "clock"]
+
+# a slot of the CLOCK ring left by an evicted key
+_FREE = object()
+
+# bytes of a dict slot and of the bookkeeping of an entry, on top of its key and value
+_ENTRY_OVERHEAD = 64
+
+
+class MemoStore[K: Hashable, V]:
+    """
+    A mapping holding at most `max_entries` entries and about `max_bytes` bytes (the shallow sizes
+    of the keys and values), None for no limit. LRU reorders the entries on every hit; CLOCK only
+    sets a bit, which is cheaper when the hits are many, and approximates LRU.
+    """
+
+    def __init__(
+        self,
+        max_entries: int | None = None,
+        max_bytes: int | None = None,
+        eviction: Eviction = "lru",
+    ) -> None:
+        if max_entries is not None and max_entries < 1:
+            raise ValueError(f"max_entries must be positive, not {max_entries}")
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.eviction = eviction
+        self._lru = eviction == "lru"
+        # only LRU needs the order of the entries
+        self.values: dict[K, V] = OrderedDict() if self._lru else {}
+        # only tracked with a byte budget
+        self.nbytes = 0
+        self.hits = self.misses = self.evictions = 0
+        # CLOCK: the keys in a ring, with the bit set when used since the hand last went past
+        self._ring: list[object] = []
+        self._free: list[int] = []
+        self._slot: dict[K, int] = {}
+        self._referenced = bytearray()
+        self._hand = 0
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def __contains__(self, key: K) -> bool:
+        return key in self.values
+
+    def get(self, key: K, default: V | None = None) -> V | None:
+        """The value of key, counting a hit or a miss."""
+        try:
+            value = self.values[key]
+        except KeyError:
+            self.misses += 1
+            return default
+        self.hits += 1
+        self._used(key)
+        return value
+
+    def __setitem__(self, key: K, value: V) -> None:
+        values, max_bytes = self.values, self.max_bytes
+        if key in values:
+            if max_bytes is not None:
+                self.nbytes += sys.getsizeof(value) - sys.getsizeof(values[key])
+            values[key] = value
+            self._used(key)
+            # a larger value may go over the budget too, evicting any other key
+            keep = -1 if self._lru else self._slot[key]
+            while max_bytes is not None and len(values) > 1 and self.nbytes > max_bytes:
+                self._evict(keep)
+            return
+
+        size = 0 if max_bytes is None else _size(key, value)
+        while values and (
+            (self.max_entries is not None and len(values) >= self.max_entries)
+            or (max_bytes is not None and self.nbytes + size > max_bytes)
+        ):
+            self._evict()
+        values[key] = value
+        self.nbytes += size
+        if not self._lru:
+            self._insert(key)
+
+    def get_or_compute(self, key: K, compute: Callable[[K], V]) -> V:
+        if (value := self.get(key)) is None:
+            value = self[key] = compute(key)
+        return value
+
+    def report(self, stats: RunStats, name: str) -> None:
+        stats.incr(f"{name} hits", self.hits)
+        stats.incr(f"{name} misses", self.misses)
+        stats.incr(f"{name} evictions", self.evictions)
+
+    def _used(self, key: K) -> None:
+        if self._lru:
+            cast(OrderedDict[K, V], self.values).move_to_end(key)
+        else:
+            self._referenced[self._slot[key]] = 1
+
+    def _evict(self, keep: int = -1) -> None:
+        # LRU: the key just used is the last one, never evicted while others are left
+        if self._lru:
+            key, value = cast(OrderedDict[K, V], self.values).popitem(last=False)
+        else:
+            key = self._victim(keep)
+            value = self.values.pop(key)
+        if self.max_bytes is not None:
+            self.nbytes -= _size(key, value)
+        self.evictions += 1
+
+    def _victim(self, keep: int) -> K:
+        # the first key not referenced from the hand on, clearing the bits on the way; the key in
+        # slot `keep` is skipped
+        ring, referenced = self._ring, self._referenced
+        while True:
+            hand = self._hand
+            self._hand = (hand + 1) % len(ring)
+            key = ring[hand]
+            if key is _FREE or hand == keep:
+                continue
+            if referenced[hand]:
+                referenced[hand] = 0
+                continue
+            ring[hand] = _FREE
+            self._free.append(hand)
+            del self._slot[key]
+            return cast(K, key)
+
+    def _insert(self, key: K) -> None:
+        if self._free:
+            slot = self._free.pop()
+            self._ring[slot] = key
+            self._referenced[slot] = 0
+        else:
+            slot = len(self._ring)
+            self._ring.append(key)
+            self._referenced.append(0)
+        self._slot[key] = slot
+
+
+def _size(key: object, value: object) -> int:
+    return sys.getsizeof(key) + sys.getsizeof(value) + _ENTRY_OVERHEAD
@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+import hashlib
+import pickle
+import sqlite3
+import time
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, NamedTuple
+
+from .cache import source_hash
+from .common import ResultProtocol, Variant
+
+DEFAULT_PATH = Path(__file__).parent.parent / ".cache" / "results.sqlite3"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    day INTEGER NOT NULL,
+    variant INTEGER NOT NULL,
+    input_hash TEXT NOT NULL,
+    code_hash TEXT NOT NULL,
+    result BLOB NOT NULL,
+    elapsed REAL NOT NULL,
+    created_at REAL NOT NULL,
+    last_used REAL NOT NULL,
+    hits INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (day, variant, input_hash, code_hash)
+);
+CREATE TABLE IF NOT EXISTS counters (
+    name TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+"""
+
+
+class ResultKey(NamedTuple):
+    day: int
+    variant: Variant
+    input_hash: str
+    code_hash: str
+
+    @classmethod
+    def of(cls, day: int, variant: Variant, day_cls: type, text: str) -> ResultKey:
+        return cls(
+            day,
+            variant,
+            hashlib.sha256(text.encode()).hexdigest(),
+            source_hash(day_cls).hex(),
+        )
+
+
+def file_hash(path: Path) -> str:
+    # same as the text hash of ResultKey.of for utf-8 files with \n line endings
+    with path.open("rb") as f:
+        return hashlib.file_digest(f, "sha256").hexdigest()
+
+
+@dataclass(frozen=True)
+class Entry:
+    key: ResultKey
+    result: ResultProtocol
+    elapsed: float
+    created_at: float
+    last_used: float
+    hits: int
+
+
+class ResultStore:
+    """SQLite store of solved answers, invalidated by changes to the input or to the day code."""
+
+    path: Path
+    hits: int
+    misses: int
+
+    def __init__(self, path: Path = DEFAULT_PATH) -> None:
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(path, timeout=30, isolation_level=None)
+        self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def __enter__(self) -> ResultStore:
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    def lookup(self, key: ResultKey) -> Entry | None:
+        row = self._conn.execute(
+            "SELECT result, elapsed, created_at, last_used, hits FROM results "
+            "WHERE day = ? AND variant = ? AND input_hash = ? AND code_hash = ?",
+            key,
+        ).fetchone()
+
+        if row is None:
+            self.misses += 1
+            self._bump("misses")
+            return None
+
+        self.hits += 1
+        self._bump("hits")
+        now = time.time()
+        self._conn.execute(
+            "UPDATE results SET hits = hits + 1, last_used = ? "
+            "WHERE day = ? AND variant = ? AND input_hash = ? AND code_hash = ?",
+            (now, *key),
+        )
+        result, elapsed, created_at, _, hits = row
+        return Entry(key, pickle.loads(result), elapsed, created_at, now, hits + 1)
+
+    def save(self, key: ResultKey, result: ResultProtocol, elapsed: float) -> None:
+        now = time.time()
+        self._conn.execute(
+            "INSERT OR REPLACE INTO results "
+            "(day, variant, input_hash, code_hash, result, elapsed, created_at, last_used) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (*key, pickle.dumps(result), elapsed, now, now),
+        )
+
+    def entries(self, day: int | None = None) -> Iterator[Entry]:
+        query = (
+            "SELECT day, variant, input_hash, code_hash, result, elapsed, created_at, last_used, "
+            "hits FROM results"
+        )
+        params: tuple[int, ...] = ()
+        if day is not None:
+            query += " WHERE day = ?"
+            params = (day,)
+
+        for row in self._conn.execute(query + " ORDER BY day, variant, created_at", params):
+            *key, result, elapsed, created_at, last_used, hits = row
+            yield Entry(ResultKey(*key), pickle.loads(result), elapsed, created_at, last_used, hits)
+
+    def counters(self) -> dict[str, int]:
+        return dict(self._conn.execute("SELECT name, value FROM counters"))
+
+    def prune(
+        self,
+        *,
+        current_code: dict[int, str] | None = None,
+        unused_for: float | None = None,
+        everything: bool = False,
+    ) -> int:
+        """
+        Deletes the entries matching any of the criteria, returning how many were removed.
+
+        `current_code` maps each day to the hash of its current source, entries computed by
+        other versions of the code are stale; `unused_for` is in seconds.
+        """
+        if everything:
+            self._conn.execute("DELETE FROM counters")
+            return self._conn.execute("DELETE FROM results").rowcount
+
+        removed = 0
+        if current_code is not None:
+            stale = [
+                (e.key.day, e.key.code_hash)
+                for e in self.entries()
+                if current_code.get(e.key.day) != e.key.code_hash
+            ]
+            removed += self._delete_code(stale)
+        if unused_for is not None:
+            removed += self._conn.execute(
+                "DELETE FROM results WHERE last_used < ?", (time.time() - unused_for,)
+            ).rowcount
+        return removed
+
+    def _delete_code(self, pairs: Iterable[tuple[int, str]]) -> int:
+        removed = 0
+        for pair in set(pairs):
+            removed += self._conn.execute(
+                "DELETE FROM results WHERE day = ? AND code_hash = ?", pair
+            ).rowcount
+        return removed
+
+    def _bump(self, name: str) -> None:
+        self._conn.execute(
+            "INSERT INTO counters (name, value) VALUES (?, 1) "
+            "ON CONFLICT (name) DO UPDATE SET value = value + 1",
+            (name,),
+        )
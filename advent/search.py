@@ -0,0 +1,140 @@
+"""
+Depth-first branch and bound over the state spaces of the search days, built from the pieces each
+day provides: the successors of a state, its value, an optimistic bound and a memo of the states
+already reached.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Hashable, Iterable
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Protocol, override
+
+from .memo import MemoStore
+
+if TYPE_CHECKING:
+    from .common import Progress, RunStats
+
+
+class MemoPolicy[K](Protocol):
+    def redundant(self, key: K, score: int) -> bool:
+        """Whether a state encoded as key, reached with score, can be skipped; records it if not."""
+        ...
+
+    def report(self, stats: RunStats) -> None:
+        return None
+
+
+class NoMemo[K](MemoPolicy[K]):
+    @override
+    def redundant(self, key: K, score: int) -> bool:
+        return False
+
+
+class Memo[K: Hashable](MemoPolicy[K]):
+    """
+    Skips the states reached before with at least the same score, keeping all of them or, with a
+    store, as many as its budget allows: a forgotten state is only explored again.
+    """
+
+    def __init__(self, store: MemoStore[K, int] | None = None) -> None:
+        self.scores: dict[K, int] | MemoStore[K, int] = {} if store is None else store
+
+    @override
+    def redundant(self, key: K, score: int) -> bool:
+        prev = self.scores.get(key)
+        if prev is not None and prev >= score:
+            return True
+        self.scores[key] = score
+        return False
+
+    @override
+    def report(self, stats: RunStats) -> None:
+        if isinstance(self.scores, MemoStore):
+            self.scores.report(stats, "memo store")
+
+
+@dataclass
+class Search[S, K]:
+    """
+    Maximizes `value` over the states reachable from the start. `bound(s)` must be at least the
+    value of every state reachable from `s`: the states that cannot beat the best value found so
+    far are pruned. The successors are explored last first, so yield the most promising last.
+    The states are encoded with `key` for the memo, which gets `value` as their score.
+    """
+
+    successors: Callable[[S], Iterable[S]]
+    value: Callable[[S], int]
+    bound: Callable[[S], int] | None = None
+    key: Callable[[S], K] | None = None
+    memo: MemoPolicy[K] = field(default_factory=NoMemo)
+    # called with every expanded state, for days collecting more than the best value
+    on_expand: Callable[[S], None] | None = None
+    progress: Progress | None = None
+    # advance the progress once per successor of the start explored, instead of leaving it alone
+    branches: bool = False
+
+    best: int = field(init=False, default=0)
+    expanded: int = field(init=False, default=0)
+    pruned: int = field(init=False, default=0)
+    memo_hits: int = field(init=False, default=0)
+
+    def run(self, start: S, best: int = 0) -> int:
+        """The best value, at least best (a known lower bound prunes more from the start)."""
+        successors, value, bound, key, memo = (
+            self.successors,
+            self.value,
+            self.bound,
+            self.key,
+            self.memo,
+        )
+        on_expand, progress = self.on_expand, self.progress
+        self.best = best = max(best, value(start))
+        # counted locally, the search loop is hot
+        expanded = pruned = memo_hits = 0
+        in_branch = False
+        stack = [(start, 0)]
+
+        try:
+            while stack:
+                state, depth = stack.pop()
+                if depth == 1 and self.branches and progress is not None:
+                    if in_branch:
+                        progress.advance()
+                    in_branch = True
+
+                if bound is not None and depth and bound(state) <= best:
+                    # the best improved since it was pushed
+                    pruned += 1
+                    continue
+
+                expanded += 1
+                if progress is not None:
+                    progress.checkpoint()
+                if on_expand is not None:
+                    on_expand(state)
+
+                for succ in successors(state):
+                    v = value(succ)
+                    if v > best:
+                        self.best = best = v
+                    if bound is not None and bound(succ) <= best:
+                        pruned += 1
+                    elif key is not None and memo.redundant(key(succ), v):
+                        memo_hits += 1
+                    else:
+                        stack.append((succ, depth + 1))
+
+            if in_branch and progress is not None:
+                progress.advance()
+            return best
+        finally:
+            self.expanded += expanded
+            self.pruned += pruned
+            self.memo_hits += memo_hits
+
+    def report(self, stats: RunStats) -> None:
+        stats.incr("nodes expanded", self.expanded)
+        stats.incr("nodes pruned", self.pruned)
+        stats.incr("memo hits", self.memo_hits)
+        self.memo.report(stats)
@@ -0,0 +1,150 @@
+import csv
+import glob
+import json
+import os
+import time
+import traceback
+from collections.abc import Iterable, Iterator, Sequence
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Literal, TextIO
+
+from advent import get_handler_for_day
+from advent.common import BaseAdventDay, Variant
+from runner import _compute, _run
+
+type Format = Literal["csv", "jsonl"]
+
+# rough single-core seconds for the slowest jobs, everything else is negligible;
+# only the relative order matters, it is used to start the longest jobs first
+EXPECTED_COST: dict[tuple[int, Variant], float] = {
+    (16, 2): 0.9,
+    (14, 2): 0.35,
+    (19, 1): 0.1,
+    (17, 1): 0.04,
+    (17, 2): 0.04,
+}
+
+
+@dataclass(frozen=True)
+class Job:
+    day: int
+    var: Variant
+    file: Path | None = None
+    cache: bool = True
+
+
+@dataclass(frozen=True)
+class JobResult:
+    job: Job
+    elapsed: float
+    result: str | None = None
+    error: str | None = None
+
+
+def schedule(jobs: Iterable[Job]) -> list[Job]:
+    """Longest expected jobs first, so the makespan is bound by the slowest one."""
+    return sorted(jobs, key=lambda j: EXPECTED_COST.get((j.day, j.var), 0.0), reverse=True)
+
+
+def solve(job: Job) -> JobResult:
+    start = time.perf_counter()
+    try:
+        res = _run(job.day, job.var, job.file, cache=job.cache)
+    except Exception:
+        return JobResult(job, time.perf_counter() - start, error=traceback.format_exc(limit=-1))
+    return JobResult(job, time.perf_counter() - start, result=str(res))
+
+
+def solve_all(jobs: Iterable[Job], workers: int | None = None) -> Iterator[JobResult]:
+    """Solve the jobs over a process pool, yielding the results as they complete."""
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as executor:
+        futures = [executor.submit(solve, job) for job in schedule(jobs)]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+@dataclass(frozen=True)
+class FileResult:
+    file: Path
+    elapsed: float
+    results: dict[Variant, str] | None = None
+    error: str | None = None
+
+
+def expand_inputs(sources: Iterable[str]) -> list[Path]:
+    """The files of each source, which is either a directory, a file or a glob pattern."""
+    files: list[Path] = []
+    for source in sources:
+        path = Path(source)
+        if path.is_dir():
+            files.extend(sorted(p for p in path.iterdir() if p.is_file()))
+        elif path.is_file():
+            files.append(path)
+        else:
+            files.extend(sorted(Path(p) for p in glob.glob(source, recursive=True)))
+    return list(dict.fromkeys(files))
+
+
+# the solver class of the day, imported once by each worker of solve_files
+_worker_cls: type[BaseAdventDay[Any]] | None = None
+
+
+def _init_worker(day: int) -> None:
+    global _worker_cls
+    _worker_cls = get_handler_for_day(day)
+
+
+def solve_file(file: Path, variants: Sequence[Variant]) -> FileResult:
+    assert _worker_cls is not None, "solve_file runs in the workers of solve_files"
+    start = time.perf_counter()
+    try:
+        # the same streaming, bytes or text path as a single run, without the caches
+        solved = _compute(_worker_cls, file, variants, cache=False)
+    except Exception:
+        return FileResult(file, time.perf_counter() - start, error=traceback.format_exc(limit=-1))
+    return FileResult(file, time.perf_counter() - start, {v: str(r) for v, r in solved.items()})
+
+
+def solve_files(
+    day: int,
+    files: Sequence[Path],
+    variants: Sequence[Variant],
+    workers: int | None = None,
+    chunksize: int | None = None,
+) -> Iterator[FileResult]:
+    """
+    Solve DAY for every file over a process pool, yielding the results in the order of the
+    files. The files are handed to the workers in chunks, by default about four per worker.
+    The results bypass the result store, these inputs are usually solved only once.
+    """
+    workers = workers or os.cpu_count() or 1
+    if chunksize is None:
+        chunksize = max(1, len(files) // (workers * 4))
+
+    with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(day,)) as executor:
+        yield from executor.map(solve_file, files, [variants] * len(files), chunksize=chunksize)
+
+
+class ResultWriter:
+    """Streams FileResults as CSV or JSON lines, one line per file."""
+
+    def __init__(self, output: TextIO, format: Format, variants: Sequence[Variant]) -> None:
+        self.output = output
+        self.format = format
+        fields = ["file", *(f"answer_{v}" for v in variants), "elapsed", "error"]
+        self._csv = csv.DictWriter(output, fields) if format == "csv" else None
+        if self._csv is not None:
+            self._csv.writeheader()
+
+    def write(self, r: FileResult) -> None:
+        row: dict[str, Any] = {"file": str(r.file)}
+        row.update((f"answer_{v}", res) for v, res in (r.results or {}).items())
+        row["elapsed"] = round(r.elapsed, 6)
+        row["error"] = r.error
+        if self._csv is not None:
+            self._csv.writerow(row)
+        else:
+            self.output.write(json.dumps(row) + "\n")
+        self.output.flush()
@@ -0,0 +1,662 @@
+from __future__ import annotations
+
+import io
+import json
+import math
+import multiprocessing
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from collections.abc import Callable, Iterable
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, override
+
+import click
+
+from advent import available_days, get_handler_for_day
+from advent.generators import GENERATORS
+
+ROOT = Path(__file__).parent
+INPUTS = ROOT / "inputs"
+DEFAULT_OUTPUT = ROOT / "bench_output"
+SCALING_OUTPUT = ROOT / "bench_scaling"
+
+LAZY_IMPORT = "import advent; advent.get_handler_for_day({day})"
+EAGER_IMPORT = "import advent; [advent.get_handler_for_day(d) for d in advent.available_days()]"
+
+PHASES = ("parse", "run_1", "run_2")
+
+
+@dataclass(frozen=True)
+class Stats:
+    min: float
+    median: float
+    p95: float
+    mean: float
+    stddev: float
+    samples: list[float] = field(repr=False)
+
+    @classmethod
+    def of(cls, samples: list[float]) -> Stats:
+        if len(samples) > 1:
+            p95 = statistics.quantiles(samples, n=20, method="inclusive")[18]
+            stddev = statistics.stdev(samples)
+        else:
+            p95 = samples[0]
+            stddev = 0.0
+        median = statistics.median(samples)
+        return cls(min(samples), median, p95, statistics.fmean(samples), stddev, samples)
+
+
+@dataclass(frozen=True)
+class Record:
+    day: int
+    phase: str
+    unit: str
+    stats: dict[str, Any]
+
+
+@dataclass(frozen=True)
+class Report:
+    meta: dict[str, Any]
+    results: list[Record]
+
+    @classmethod
+    def new(cls, results: list[Record], **meta: Any) -> Report:
+        return cls(
+            {
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "timestamp": time.time(),
+                **meta,
+            },
+            results,
+        )
+
+    @classmethod
+    def load(cls, path: Path) -> Report:
+        data = json.loads(path.read_text())
+        return cls(data["meta"], [Record(**r) for r in data["results"]])
+
+    def save(self, output: Path) -> None:
+        output.with_suffix(".json").write_text(json.dumps(asdict(self), indent=2) + "\n")
+        output.with_suffix(".txt").write_text(self.to_text() + "\n")
+
+    def to_text(self) -> str:
+        keys = (
+            [k for k, v in self.results[0].stats.items() if isinstance(v, int | float)]
+            if self.results
+            else []
+        )
+        lines = [f"{'day':>3} {'phase':<6} {'unit':<4} " + " ".join(f"{k:>12}" for k in keys)]
+        for r in self.results:
+            values = " ".join(_format_value(r.stats[k]) for k in keys)
+            lines.append(f"{r.day:>3} {r.phase:<6} {r.unit:<4} {values}")
+
+        for r in self.results:
+            if sites := r.stats.get("top"):
+                lines.append(f"\nday {r.day} {r.phase}, top allocation sites:")
+                lines.extend(
+                    f"  {site['size']:>12} {r.unit} {site['count']:>9} blocks  {site['site']}"
+                    for site in sites
+                )
+        return "\n".join(lines)
+
+
+def _format_value(value: float) -> str:
+    return f"{value:>12}" if isinstance(value, int) else f"{value:>12.6g}"
+
+
+@dataclass(frozen=True)
+class Regression:
+    day: int
+    phase: str
+    baseline: float
+    current: float
+
+    @property
+    def ratio(self) -> float:
+        return self.current / self.baseline if self.baseline else float("inf")
+
+    @override
+    def __str__(self) -> str:
+        return (
+            f"day {self.day} {self.phase}: median {self.baseline:.6f} s -> {self.current:.6f} s "
+            f"({self.ratio:.2f}x)"
+        )
+
+
+def measure(
+    fn: Callable[[Any], object], setup: Callable[[], Any], warmup: int, repeat: int
+) -> Stats:
+    for _ in range(warmup):
+        fn(setup())
+
+    samples: list[float] = []
+    for _ in range(repeat):
+        arg = setup()
+        start = time.perf_counter()
+        fn(arg)
+        samples.append(time.perf_counter() - start)
+    return Stats.of(samples)
+
+
+def bench_day(day: int, warmup: int, repeat: int, phases: Iterable[str] = PHASES) -> list[Record]:
+    text = (INPUTS / f"day{day}.txt").read_text()
+    return bench_text(day, text, warmup, repeat, phases)
+
+
+def bench_text(
+    day: int, text: str, warmup: int, repeat: int, phases: Iterable[str] = PHASES
+) -> list[Record]:
+    cls = get_handler_for_day(day)
+    solver = cls(io.StringIO(text))
+    parsed = cls(io.StringIO(text)).parse_input()
+
+    def parse(_: None) -> object:
+        return cls(io.StringIO(text)).parse_input()
+
+    runs: dict[str, tuple[Callable[[Any], object], Callable[[], Any]]] = {
+        "parse": (parse, lambda: None),
+        "run_1": (solver._run_1, lambda: solver.snapshot(parsed)),  # pyright: ignore[reportPrivateUsage]
+        "run_2": (solver._run_2, lambda: solver.snapshot(parsed)),  # pyright: ignore[reportPrivateUsage]
+    }
+
+    records: list[Record] = []
+    for phase in phases:
+        fn, setup = runs[phase]
+        stats = measure(fn, setup, warmup, repeat)
+        records.append(Record(day, phase, "s", asdict(stats)))
+    return records
+
+
+def bench_parsers(day: int, path: Path, warmup: int, repeat: int) -> list[Record]:
+    """Times parse_input on the decoded file against parse_buffer on its bytes."""
+    cls = get_handler_for_day(day)
+
+    def parse_text(_: None) -> object:
+        with path.open() as f:
+            return cls(f).parse_input()
+
+    def parse_bytes(_: None) -> object:
+        data = path.read_bytes()
+        return cls.from_buffer(data).parse_buffer(data)
+
+    return [
+        Record(day, phase, "s", asdict(measure(fn, lambda: None, warmup, repeat)))
+        for phase, fn in (("text", parse_text), ("bytes", parse_bytes))
+    ]
+
+
+def fit_exponent(sizes: list[int], times: list[float]) -> float:
+    """Slope of log(time) over log(size), i.e. k in time ~ size**k."""
+    slope, _ = statistics.linear_regression(
+        [math.log(s) for s in sizes], [math.log(max(t, 1e-9)) for t in times]
+    )
+    return slope
+
+
+def scale_day(
+    day: int,
+    phases: Iterable[str] = PHASES,
+    steps: int = 5,
+    factor: float = 2.0,
+    repeat: int = 3,
+    budget: float = 5.0,
+    seed: int = 0,
+) -> list[Record]:
+    """
+    Times the phases on generated inputs growing geometrically from the base size of the day,
+    stopping early once a size took more than `budget` seconds. The exponent is fitted on the
+    best time of each size, against the generator size and against the input length.
+    """
+    gen = GENERATORS[day]
+    phases = tuple(phases)
+    sizes: list[int] = []
+    lengths: list[int] = []
+    times: dict[str, list[float]] = {phase: [] for phase in phases}
+
+    size = gen.base_size
+    for _ in range(steps):
+        text = gen(size, seed)
+        records = bench_text(day, text, 0, repeat, phases)
+        sizes.append(size)
+        lengths.append(len(text))
+        for r in records:
+            times[r.phase].append(r.stats["min"])
+        if sum(r.stats["min"] for r in records) > budget:
+            break
+        size = max(size + 1, round(size * factor))
+
+    fits = len(sizes) > 1
+    return [
+        Record(
+            day,
+            phase,
+            "s",
+            {
+                "exponent": fit_exponent(sizes, t) if fits else math.nan,
+                "bytes_exponent": fit_exponent(lengths, t) if fits else math.nan,
+                "largest": t[-1],
+                "unit": gen.unit,
+                "sizes": sizes,
+                "bytes": lengths,
+                "times": t,
+            },
+        )
+        for phase, t in times.items()
+    ]
+
+
+class _PeakSampler(threading.Thread):
+    """Keeps the tracemalloc snapshot taken when the traced heap was the largest seen so far."""
+
+    def __init__(self, interval: float) -> None:
+        super().__init__(daemon=True)
+        self.interval = interval
+        self.largest = 0
+        self.snapshot: tracemalloc.Snapshot | None = None
+        self._stop_event = threading.Event()
+
+    @override
+    def run(self) -> None:
+        while not self._stop_event.wait(self.interval):
+            current, _ = tracemalloc.get_traced_memory()
+            # snapshots are costly, only retake one when the heap grew noticeably
+            if current > self.largest * 1.1:
+                self.largest = current
+                self.snapshot = tracemalloc.take_snapshot()
+
+    def stop(self) -> tracemalloc.Snapshot:
+        self._stop_event.set()
+        self.join()
+        current, _ = tracemalloc.get_traced_memory()
+        if self.snapshot is None or current >= self.largest:
+            self.snapshot = tracemalloc.take_snapshot()
+        return self.snapshot
+
+
+# allocations made by the measuring code itself
+_TRACE_FILTERS = [
+    tracemalloc.Filter(False, f) for f in (tracemalloc.__file__, threading.__file__, __file__)
+]
+
+
+def _peak_rss() -> int:
+    import resource
+
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes everywhere but on macOS
+    return rss if sys.platform == "darwin" else rss * 1024
+
+
+def memory_day(
+    day: int, phases: Iterable[str] = PHASES, top: int = 10, interval: float = 0.05
+) -> list[Record]:
+    """
+    Traces the allocations of each phase, reporting the peak and retained traced memory, the
+    process peak RSS so far and the allocation sites of the largest heap sampled in the phase.
+    """
+    cls = get_handler_for_day(day)
+    text = (INPUTS / f"day{day}.txt").read_text()
+    solver = cls(io.StringIO(text))
+    parsed = cls(io.StringIO(text)).parse_input()
+
+    records: list[Record] = []
+    tracemalloc.start()
+    try:
+        for phase in phases:
+            if phase == "parse":
+                arg = io.StringIO(text)
+                fn: Callable[[Any], object] = lambda f: cls(f).parse_input()  # noqa: E731
+            else:
+                arg = solver.snapshot(parsed)
+                fn = getattr(solver, f"_{phase}")
+
+            tracemalloc.clear_traces()
+            sampler = _PeakSampler(interval)
+            sampler.start()
+            result = fn(arg)
+            snapshot = sampler.stop()
+            current, peak = tracemalloc.get_traced_memory()
+            del arg, result
+
+            sites = snapshot.filter_traces(_TRACE_FILTERS).statistics("lineno")[:top]
+            stats = {
+                "peak": peak,
+                "current": current,
+                "rss_peak": _peak_rss(),
+                "top": [
+                    {"site": str(site.traceback), "size": site.size, "count": site.count}
+                    for site in sites
+                ],
+            }
+            records.append(Record(day, phase, "B", stats))
+    finally:
+        tracemalloc.stop()
+
+    return records
+
+
+def memory_days(days: Iterable[int], phases: Iterable[str], top: int) -> Iterable[list[Record]]:
+    # a fresh interpreter per day, so that the peak RSS belongs to that day only
+    ctx = multiprocessing.get_context("spawn")
+    phases = tuple(phases)
+    for day in days:
+        with ProcessPoolExecutor(max_workers=1, mp_context=ctx) as executor:
+            yield executor.submit(memory_day, day, phases, top).result()
+
+
+def compare(
+    report: Report, baseline: Report, threshold: float, noise_floor: float
+) -> list[Regression]:
+    """Phases whose median got slower than the baseline by more than threshold (a fraction)."""
+    base = {(r.day, r.phase): r.stats["median"] for r in baseline.results if r.unit == "s"}
+    regressions: list[Regression] = []
+    for r in report.results:
+        if r.unit != "s" or (old := base.get((r.day, r.phase))) is None:
+            continue
+        new = r.stats["median"]
+        if new > old * (1 + threshold) and new - old > noise_floor:
+            regressions.append(Regression(r.day, r.phase, old, new))
+    return regressions
+
+
+def import_times(code: str) -> dict[str, float]:
+    """Cumulative import time in seconds of every module imported by `code`, from -X importtime."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times: dict[str, float] = {}
+    for line in proc.stderr.splitlines():
+        prefix, _, fields = line.partition(":")
+        if prefix != "import time" or "cumulative" in fields:
+            continue
+        _, cumulative, name = fields.split("|")
+        times[name.strip()] = int(cumulative) / 1e6
+    return times
+
+
+def _time_subprocess(code: str, repeat: int) -> list[float]:
+    times: list[float] = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", code], cwd=ROOT, check=True)
+        times.append(time.perf_counter() - start)
+    return times
+
+
+@click.group(help="Benchmarks for the advent solutions.")
+def bench() -> None:
+    pass
+
+
+@bench.command(
+    "run",
+    help=(
+        "Time parse_input, _run_1 and _run_2 of every implemented day (or only the given DAYS), "
+        "writing a JSON and a text report."
+    ),
+)
+@click.argument("days", type=click.IntRange(1, 25), nargs=-1)
+@click.option("--skip", type=click.IntRange(1, 25), multiple=True, help="Days not to run")
+@click.option(
+    "-p", "--phase", "phases", type=click.Choice(PHASES), multiple=True, help="Phases to time"
+)
+@click.option("-w", "--warmup", type=click.IntRange(0), default=1, show_default=True)
+@click.option("-r", "--repeat", type=click.IntRange(1), default=5, show_default=True)
+@click.option(
+    "-o",
+    "--output",
+    type=click.Path(dir_okay=False, path_type=Path),
+    default=DEFAULT_OUTPUT,
+    help="Report path, the .json and .txt suffixes are added",
+)
+@click.option(
+    "-b",
+    "--baseline",
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+    help="JSON report of a previous run to compare against",
+)
+@click.option(
+    "-t",
+    "--threshold",
+    type=click.FloatRange(0),
+    default=0.1,
+    show_default=True,
+    help="Allowed slowdown of the median over the baseline, as a fraction",
+)
+@click.option(
+    "--memory",
+    is_flag=True,
+    help="Trace the memory of each phase with tracemalloc instead of timing it",
+)
+@click.option(
+    "--top",
+    type=click.IntRange(0),
+    default=10,
+    show_default=True,
+    help="Allocation sites to report for each phase in --memory mode",
+)
+@click.option(
+    "--noise-floor",
+    type=click.FloatRange(0),
+    default=0.001,
+    show_default=True,
+    help="Slowdowns below this many seconds are never regressions",
+)
+def run(
+    days: tuple[int, ...],
+    skip: tuple[int, ...],
+    phases: tuple[str, ...],
+    warmup: int,
+    repeat: int,
+    output: Path,
+    baseline: Path | None,
+    threshold: float,
+    memory: bool,
+    top: int,
+    noise_floor: float,
+) -> None:
+    if memory and baseline is not None:
+        raise click.UsageError("--baseline only applies to timings, not to --memory")
+
+    selected = [d for d in days or available_days() if d not in skip]
+    records: list[Record] = []
+
+    if memory:
+        for day_records in memory_days(selected, phases or PHASES, top):
+            for r in day_records:
+                print(
+                    f"day {r.day:>2} {r.phase:<6} peak {r.stats['peak'] / 2**20:10.3f} MiB",
+                    flush=True,
+                )
+            records.extend(day_records)
+        report = Report.new(records, mode="memory")
+    else:
+        for day in selected:
+            day_records = bench_day(day, warmup, repeat, phases or PHASES)
+            for r in day_records:
+                print(f"day {day:>2} {r.phase:<6} median {r.stats['median']:.6f} s", flush=True)
+            records.extend(day_records)
+        report = Report.new(records, mode="time", warmup=warmup, repeat=repeat)
+
+    report.save(output)
+    print(report.to_text())
+
+    if baseline is not None:
+        if regressions := compare(report, Report.load(baseline), threshold, noise_floor):
+            print(f"{len(regressions)} regressions over {threshold:.0%}:")
+            for reg in regressions:
+                print(f"  {reg}")
+            raise SystemExit(1)
+        print("No regressions against the baseline")
+
+
+@bench.command(
+    "scaling",
+    help=(
+        "Run every day with a generator (or only the given DAYS) on synthetic inputs of "
+        "geometrically growing size and fit the empirical complexity exponent k of each phase "
+        "(time ~ size**k), flagging the phases above --max-exponent."
+    ),
+)
+@click.argument("days", type=click.IntRange(1, 25), nargs=-1)
+@click.option("--skip", type=click.IntRange(1, 25), multiple=True, help="Days not to run")
+@click.option(
+    "-p", "--phase", "phases", type=click.Choice(PHASES), multiple=True, help="Phases to time"
+)
+@click.option("-s", "--steps", type=click.IntRange(2), default=5, show_default=True)
+@click.option("--factor", type=click.FloatRange(1, min_open=True), default=2.0, show_default=True)
+@click.option("-r", "--repeat", type=click.IntRange(1), default=3, show_default=True)
+@click.option(
+    "--budget",
+    type=click.FloatRange(0),
+    default=5.0,
+    show_default=True,
+    help="Stop growing a day once a size took longer than this many seconds",
+)
+@click.option("--seed", type=int, default=0, show_default=True)
+@click.option(
+    "--max-exponent",
+    type=click.FloatRange(0),
+    default=1.5,
+    show_default=True,
+    help="Exponents above this are reported as super-linear",
+)
+@click.option(
+    "-o",
+    "--output",
+    type=click.Path(dir_okay=False, path_type=Path),
+    default=SCALING_OUTPUT,
+    help="Report path, the .json and .txt suffixes are added",
+)
+def scaling(
+    days: tuple[int, ...],
+    skip: tuple[int, ...],
+    phases: tuple[str, ...],
+    steps: int,
+    factor: float,
+    repeat: int,
+    budget: float,
+    seed: int,
+    max_exponent: float,
+    output: Path,
+) -> None:
+    selected = [d for d in days or available_days() if d in GENERATORS and d not in skip]
+    records: list[Record] = []
+    for day in selected:
+        day_records = scale_day(day, phases or PHASES, steps, factor, repeat, budget, seed)
+        for r in day_records:
+            print(
+                f"day {day:>2} {r.phase:<6} k = {r.stats['exponent']:5.2f} "
+                f"over {len(r.stats['sizes'])} sizes of {r.stats['unit']}",
+                flush=True,
+            )
+        records.extend(day_records)
+
+    report = Report.new(
+        records, mode="scaling", steps=steps, factor=factor, repeat=repeat, seed=seed
+    )
+    report.save(output)
+    print(report.to_text())
+
+    if steep := [r for r in records if r.stats["exponent"] > max_exponent]:
+        print(f"{len(steep)} phases scale worse than size**{max_exponent}:")
+        for r in steep:
+            print(f"  day {r.day} {r.phase}: k = {r.stats['exponent']:.2f} ({r.stats['unit']})")
+
+
+@bench.command(
+    "parsers",
+    help=(
+        "Compare parsing the decoded text with parsing the raw bytes, for the days (or only "
+        "the given DAYS) reading their numbers straight from the bytes, on generated inputs "
+        "--scale times their base size."
+    ),
+)
+@click.argument("days", type=click.IntRange(1, 25), nargs=-1)
+@click.option("--scale", type=click.IntRange(1), default=100, show_default=True)
+@click.option("-w", "--warmup", type=click.IntRange(0), default=1, show_default=True)
+@click.option("-r", "--repeat", type=click.IntRange(1), default=5, show_default=True)
+@click.option("--seed", type=int, default=0, show_default=True)
+def parsers(days: tuple[int, ...], scale: int, warmup: int, repeat: int, seed: int) -> None:
+    selected = [
+        d
+        for d in days or available_days()
+        if d in GENERATORS and get_handler_for_day(d).reads_bytes()
+    ]
+    records: list[Record] = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for day in selected:
+            gen = GENERATORS[day]
+            path = Path(tmp) / f"day{day}.txt"
+            path.write_text(gen(gen.base_size * scale, seed))
+            text, data = bench_parsers(day, path, warmup, repeat)
+            speedup = text.stats["median"] / data.stats["median"]
+            print(
+                f"day {day:>2} {path.stat().st_size:>10} bytes: text {text.stats['median']:.6f} s, "
+                f"bytes {data.stats['median']:.6f} s, {speedup:.2f}x",
+                flush=True,
+            )
+            records.extend((text, data))
+
+    print(Report.new(records, mode="parsers", scale=scale).to_text())
+
+
+@bench.command("generate", help="Print a synthetic input of SIZE for DAY.")
+@click.argument("day", type=click.IntRange(1, 25))
+@click.argument("size", type=click.IntRange(1))
+@click.option("--seed", type=int, default=0, show_default=True)
+def generate(day: int, size: int, seed: int) -> None:
+    if day not in GENERATORS:
+        raise click.BadParameter(f"no generator for day {day}", param_hint="DAY")
+    click.echo(GENERATORS[day](size, seed), nl=False)
+
+
+@bench.command(
+    "imports",
+    help="Compare the start-up cost of loading a single DAY against loading every day.",
+)
+@click.argument("day", type=click.IntRange(1, 25), default=1)
+@click.option("-r", "--repeat", type=click.IntRange(1), default=20, show_default=True)
+def imports(day: int, repeat: int) -> None:
+    lazy = _time_subprocess(LAZY_IMPORT.format(day=day), repeat)
+    eager = _time_subprocess(EAGER_IMPORT, repeat)
+
+    for name, times in (("single day", lazy), ("all days", eager)):
+        print(
+            f"{name:>10}: min {min(times) * 1000:7.2f} ms, "
+            f"median {statistics.median(times) * 1000:7.2f} ms"
+        )
+    print(f"   speedup: {statistics.median(eager) / statistics.median(lazy):.2f}x")
+
+
+@bench.command(
+    "startup",
+    help="Show the slowest modules imported at the start-up of runner.py, from -X importtime.",
+)
+@click.option("-n", "--limit", type=click.IntRange(1), default=15, show_default=True)
+@click.option("-r", "--repeat", type=click.IntRange(1), default=5, show_default=True)
+def startup(limit: int, repeat: int) -> None:
+    runs = [import_times("import runner") for _ in range(repeat)]
+    best = min(runs, key=lambda times: times["runner"])
+    print(f"import runner: {best['runner'] * 1000:.2f} ms (best of {repeat})")
+    slowest = sorted(best.items(), key=lambda item: item[1], reverse=True)
+    for name, seconds in slowest[1 : limit + 1]:
+        print(f"  {seconds * 1000:8.2f} ms  {name}")
+
+
+if __name__ == "__main__":
+    bench()
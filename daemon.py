@@ -0,0 +1,247 @@
+"""
+Warm solver daemon: a process pool with every day already imported, behind an asyncio server
+listening on a Unix socket.
+
+Protocol, one request after the other on a connection: the client sends a JSON header line
+`{"day": 16, "variant": 2, "size": 1234}` followed by `size` bytes of input, the server answers
+with a single JSON line holding either `results` (variant -> answer) or `error`, plus the timing
+metadata of the request.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import io
+import json
+import os
+import signal
+import socket
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+import click
+
+from advent import available_days, get_handler_for_day
+from advent.common import VARIANTS, RunStats, Variant
+from runner import AllVariants, _VariantType
+
+ROOT = Path(__file__).parent
+DEFAULT_SOCKET = ROOT / ".cache" / "solver.sock"
+
+
+def _warm() -> None:
+    for day in available_days():
+        get_handler_for_day(day)
+
+
+def _ping(_: int) -> int:
+    return os.getpid()
+
+
+def solve_request(day: int, variant: Variant | AllVariants, data: bytes) -> dict[str, Any]:
+    """Runs in the pool workers."""
+    if day not in available_days():
+        return {"error": "Module not yet implemented!"}
+    # bools are ints too, and True == 1
+    if variant != "all" and (type(variant) is not int or variant not in VARIANTS):
+        return {"error": f"Invalid variant: {variant!r}"}
+
+    cls = get_handler_for_day(day)
+    stats = RunStats()
+    variants = VARIANTS if variant == "all" else (variant,)
+    try:
+        if cls.reads_bytes():
+            solved = cls.from_buffer(data, stats=stats).run_many(variants)
+        else:
+            solved = cls(io.StringIO(data.decode()), stats=stats).run_many(variants)
+    except Exception:
+        return {"error": traceback.format_exc(limit=-1), "worker": os.getpid()}
+
+    return {
+        "results": {str(v): str(res) for v, res in solved.items()},
+        "timings": stats.timings,
+        "worker": os.getpid(),
+    }
+
+
+@dataclass
+class _Job:
+    day: int
+    variant: Variant | AllVariants
+    data: bytes
+    enqueued: float
+    future: asyncio.Future[dict[str, Any]]
+
+
+class SolverServer:
+    """
+    Each connection is served by its own task, which puts the requests in a bounded queue;
+    one dispatcher per worker moves them to the pool. When the queue is full the connection
+    tasks wait, and stop reading from their sockets, until a worker frees up.
+    """
+
+    def __init__(self, pool: ProcessPoolExecutor, workers: int, queue_size: int) -> None:
+        self.pool = pool
+        self.workers = workers
+        self.queue: asyncio.Queue[_Job] = asyncio.Queue(queue_size)
+
+    async def serve(self, path: Path, stop: asyncio.Event) -> None:
+        dispatchers = [asyncio.create_task(self._dispatch()) for _ in range(self.workers)]
+        path.parent.mkdir(parents=True, exist_ok=True)
+        server = await asyncio.start_unix_server(self._handle, path)
+        try:
+            async with server:
+                await stop.wait()
+        finally:
+            for task in dispatchers:
+                task.cancel()
+            path.unlink(missing_ok=True)
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        loop = asyncio.get_running_loop()
+        try:
+            while header := await reader.readline():
+                received = time.perf_counter()
+                try:
+                    request = json.loads(header)
+                    day, variant, size = request["day"], request["variant"], request["size"]
+                    if type(size) is not int or size < 0:
+                        raise ValueError(size)
+                except (ValueError, KeyError, TypeError):
+                    await self._reply(writer, {"error": "Invalid request header"})
+                    break
+
+                data = await reader.readexactly(size)
+                job = _Job(day, variant, data, time.perf_counter(), loop.create_future())
+                await self.queue.put(job)
+                response = await job.future
+                response["elapsed"] = time.perf_counter() - received
+                await self._reply(writer, response)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def _reply(writer: asyncio.StreamWriter, response: dict[str, Any]) -> None:
+        writer.write(json.dumps(response).encode() + b"\n")
+        await writer.drain()
+
+    async def _dispatch(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            job = await self.queue.get()
+            queued = time.perf_counter() - job.enqueued
+            try:
+                response = await loop.run_in_executor(
+                    self.pool, solve_request, job.day, job.variant, job.data
+                )
+            except Exception as e:
+                response = {"error": repr(e)}
+            response["queued"] = queued
+            if not job.future.done():
+                job.future.set_result(response)
+            self.queue.task_done()
+
+
+def start_pool(workers: int) -> ProcessPoolExecutor:
+    """A pool whose workers are already forked and have imported every day."""
+    pool = ProcessPoolExecutor(workers, initializer=_warm)
+    list(pool.map(_ping, range(workers)))
+    return pool
+
+
+def request(
+    day: int, variant: Variant | AllVariants, data: bytes, path: Path = DEFAULT_SOCKET
+) -> dict[str, Any]:
+    header = json.dumps({"day": day, "variant": variant, "size": len(data)}).encode()
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(str(path))
+        sock.sendall(header + b"\n" + data)
+        with sock.makefile("rb") as f:
+            line = f.readline()
+
+    if not line:
+        raise ConnectionError("The solver closed the connection")
+    return json.loads(line)
+
+
+_socket_option = click.option(
+    "-s",
+    "--socket",
+    "socket_path",
+    type=click.Path(dir_okay=False, path_type=Path),
+    default=DEFAULT_SOCKET,
+    show_default=True,
+    help="Unix socket of the solver daemon",
+)
+
+
+@click.command(help="Run the warm solver daemon, answering `ask` requests until interrupted.")
+@_socket_option
+@click.option(
+    "-j",
+    "--jobs",
+    "workers",
+    type=click.IntRange(1),
+    help="Number of worker processes, defaults to the number of cores",
+)
+@click.option(
+    "--queue-size",
+    type=click.IntRange(1),
+    default=64,
+    show_default=True,
+    help="Requests waiting for a worker before the connections stop being read",
+)
+def serve(socket_path: Path, workers: int | None, queue_size: int) -> None:
+    workers = workers or os.cpu_count() or 1
+    pool = start_pool(workers)
+
+    async def main() -> None:
+        stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sig, stop.set)
+
+        click.echo(f"Solving on {socket_path} with {workers} workers", err=True)
+        await SolverServer(pool, workers, queue_size).serve(socket_path, stop)
+
+    try:
+        asyncio.run(main())
+    finally:
+        pool.shutdown(cancel_futures=True)
+
+
+@click.command(help="Solve DAY, variant VAR (default 1), through the solver daemon.")
+@click.argument("day", type=click.IntRange(1, 25))
+@click.argument("var", type=_VariantType(), default=1)
+@click.option(
+    "-f",
+    "--file",
+    help="Override file path",
+    type=click.Path(exists=True, dir_okay=False, readable=True, path_type=Path),
+)
+@_socket_option
+def ask(day: int, var: Variant | AllVariants, file: Path | None, socket_path: Path) -> None:
+    data = (file or ROOT / "inputs" / f"day{day}.txt").read_bytes()
+    try:
+        response = request(day, var, data, socket_path)
+    except OSError as e:
+        raise click.ClickException(f"Cannot reach the solver on {socket_path}: {e}") from e
+
+    if (error := response.get("error")) is not None:
+        raise click.ClickException(error.strip())
+
+    for v, res in response["results"].items():
+        print(f"Result for day {day}, variant {v}, is:")
+        print(res)
+
+    timings = " ".join(f"{name} {t:.6f} s," for name, t in response["timings"].items())
+    print(
+        f"Worker {response['worker']}: {timings} queued {response['queued']:.6f} s, "
+        f"total {response['elapsed']:.6f} s"
+    )
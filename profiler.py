@@ -1,33 +1,198 @@
-# type: ignore
-from line_profiler import LineProfiler
+from __future__ import annotations
+
+import cProfile
+import importlib
+import pstats
+import sys
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Literal
+
+import click
 
 from advent import get_handler_for_day
-from runner import _run
+from advent.common import StreamingAdventDay, Variant
+from runner import _run, _VariantType
+
+if TYPE_CHECKING:
+    from line_profiler import LineProfiler
+
+type Mode = Literal["cprofile", "line", "phases"]
+
+SORT_KEYS = ("cumulative", "tottime", "calls", "ncalls", "name", "filename")
+
+
+def resolve(name: str) -> Callable[..., Any]:
+    """Imports a dotted name such as `advent.day17.Board.can_move_down`."""
+    parts = name.split(".")
+    for i in range(len(parts) - 1, 0, -1):
+        try:
+            obj: Any = importlib.import_module(".".join(parts[:i]))
+        except ModuleNotFoundError:
+            continue
+
+        for attr in parts[i:]:
+            obj = getattr(obj, attr)
+        return obj
+
+    raise ValueError(f"Cannot import {name}")
+
+
+def profile_run(day: int, var: Variant, file: Path | None = None) -> cProfile.Profile:
+    profile = cProfile.Profile()
+    profile.runcall(_run, day, var, file, cache=False)
+    return profile
+
+
+def profile_phases(day: int, var: Variant, file: Path | None = None) -> dict[str, cProfile.Profile]:
+    """
+    The profile of the input pass the runner takes for the day, apart from the rest of the solve:
+    `stream` for the streaming days (parsing and solving at once), `parse` of parse_buffer for the
+    days reading bytes, else of parse_input.
+    """
+    cls = get_handler_for_day(day)
+    if issubclass(cls, StreamingAdventDay):
+        phase, method = "stream", "stream"
+    elif cls.reads_bytes():
+        phase, method = "parse", "parse_buffer"
+    else:
+        phase, method = "parse", "parse_input"
+
+    profiles = {phase: cProfile.Profile(), "solve": cProfile.Profile()}
+    with _wrap(cls, method, profiles[phase], profiles["solve"]):
+        profiles["solve"].runcall(_run, day, var, file, cache=False)
+
+    return profiles
+
+
+def profile_lines(
+    day: int, var: Variant, names: list[str], file: Path | None = None
+) -> LineProfiler:
+    from line_profiler import LineProfiler
+
+    if names:
+        fns = [resolve(name) for name in names]
+    else:
+        handler = get_handler_for_day(day)
+        fns = [handler._run_1 if var == 1 else handler._run_2]  # pyright: ignore[reportPrivateUsage]
+
+    profile = LineProfiler()
+    for fn in fns:
+        profile.add_function(getattr(fn, "__wrapped__", fn))
+
+    profile.runcall(_run, day, var, file, cache=False)
+    return profile
 
-profile = LineProfiler()
 
-day = 16
-variant = 1
+@contextmanager
+def _wrap(
+    cls: type, method: str, phase: cProfile.Profile, solve: cProfile.Profile
+) -> Iterator[None]:
+    # cProfile allows a single active profiler, swap them around the method
+    own = cls.__dict__.get(method)
+    original = getattr(cls, method)
 
-fns = []
-handler = get_handler_for_day(day)
+    def profiled(self: Any, *args: Any) -> Any:
+        solve.disable()
+        try:
+            return phase.runcall(original, self, *args)
+        finally:
+            solve.enable()
 
-if variant == 1:
-    fns.append(handler._run_1)
-elif variant == 2:
-    fns.append(handler._run_2)
+    setattr(cls, method, profiled)
+    try:
+        yield
+    finally:
+        if own is None:
+            # inherited, e.g. StreamingAdventDay.stream
+            delattr(cls, method)
+        else:
+            setattr(cls, method, own)
 
-# add functions to be profiled here
 
-for fn in fns:
-    if hasattr(fn, "__wrapped__"):
-        fn = fn.__wrapped__
-    profile.add_function(fn)
+def _print_stats(profile: cProfile.Profile, title: str, sort: str, limit: int) -> None:
+    print(f"==== {title} ====")
+    pstats.Stats(profile, stream=sys.stdout).strip_dirs().sort_stats(sort).print_stats(limit)
 
 
-def main():
-    _run(day, variant)
+@click.command(
+    help=(
+        "Profile the solution of DAY, variant VAR (default 1). `cprofile` reports the hotspots "
+        "of the whole run, `phases` reports the parse (or the stream, for the streaming days) "
+        "and the solve separately, `line` line-profiles the given --function names (default the "
+        "variant entry point)."
+    )
+)
+@click.argument("day", type=click.IntRange(1, 25))
+@click.argument("var", type=_VariantType(all_allowed=False), default=1)
+@click.option(
+    "-m",
+    "--mode",
+    type=click.Choice(["cprofile", "line", "phases"]),
+    default="cprofile",
+    show_default=True,
+)
+@click.option(
+    "-f",
+    "--file",
+    help="Override file path",
+    type=click.Path(exists=True, dir_okay=False, readable=True, path_type=Path),
+)
+@click.option("-s", "--sort", type=click.Choice(SORT_KEYS), default="cumulative", show_default=True)
+@click.option(
+    "-n", "--limit", type=click.IntRange(1), default=25, show_default=True, help="Rows to show"
+)
+@click.option(
+    "-F",
+    "--function",
+    "functions",
+    multiple=True,
+    help="Dotted name of a function to line-profile, e.g. advent.day17.Board.can_move_down",
+)
+@click.option(
+    "-o",
+    "--output",
+    type=click.Path(dir_okay=False, path_type=Path),
+    help="Also dump the raw profile data there (cprofile mode only)",
+)
+def profile(
+    day: int,
+    var: Variant,
+    mode: Mode,
+    file: Path | None,
+    sort: str,
+    limit: int,
+    functions: tuple[str, ...],
+    output: Path | None,
+) -> None:
+    match mode:
+        case "cprofile":
+            prof = profile_run(day, var, file)
+            if output is not None:
+                prof.dump_stats(output)
+            _print_stats(prof, f"day {day}, variant {var}", sort, limit)
+        case "phases":
+            for phase, prof in profile_phases(day, var, file).items():
+                title = (
+                    f"day {day}, variant {var} solve" if phase == "solve" else f"day {day}, {phase}"
+                )
+                if prof.getstats():
+                    _print_stats(prof, title, sort, limit)
+                else:
+                    # pstats cannot load an empty profile
+                    print(f"==== {title} ====\nno {phase} phase")
+        case "line":
+            try:
+                lines = profile_lines(day, var, list(functions), file)
+            except ModuleNotFoundError as e:
+                if e.name != "line_profiler":
+                    raise
+                raise click.ClickException("line mode needs line_profiler installed") from e
+            except (ValueError, AttributeError) as e:
+                raise click.BadParameter(str(e), param_hint="--function") from e
+            lines.print_stats()
 
 
-profile.runcall(main)
-profile.print_stats()
+if __name__ == "__main__":
+    profile()
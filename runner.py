@@ -1,47 +1,526 @@
+import importlib
+import io
+import signal
+import sys
+import time
+from collections.abc import Iterator, Sequence
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Literal
+from types import FrameType
+from typing import Any, Literal, TextIO, override
 
 import click
-import pdbp
 
-from advent import get_handler_for_day
-from advent.common import ResultProtocol, Variant
+from advent import available_days, get_handler_for_day
+from advent.common import (
+    VARIANTS,
+    BaseAdventDay,
+    Cancelled,
+    Progress,
+    ResultProtocol,
+    RunStats,
+    StreamingAdventDay,
+    Variant,
+)
+
+# the parse cache, the result store and pdbp are imported where they are used, they make up
+# most of the start-up time of a run that doesn't need them (tests/startup_test.py)
 
-pdbp.enable()
+type AllVariants = Literal["all"]
 
 
-def _run(day: int, var: Variant, file: Path | None = None) -> ResultProtocol:
+def _resolve(day: int, file: Path | None) -> tuple[type[BaseAdventDay[Any]], Path]:
     try:
         cls = get_handler_for_day(day)
     except KeyError as e:
         raise ValueError("Module not yet implemented!") from e
-    else:
-        if file is None:
-            input_folder = Path(__file__).parent / "inputs"
-            file_path = input_folder / f"day{day}.txt"
-        else:
-            file_path = file
 
+    if file is None:
+        input_folder = Path(__file__).parent / "inputs"
+        file = input_folder / f"day{day}.txt"
+    return cls, file
+
+
+def _run(
+    day: int,
+    var: Variant,
+    file: Path | None = None,
+    *,
+    cache: bool = True,
+    stats: RunStats | None = None,
+    progress: Progress | None = None,
+) -> ResultProtocol:
+    return _solve(day, (var,), file, cache, stats, progress)[var]
+
+
+def _run_all(
+    day: int,
+    file: Path | None = None,
+    *,
+    cache: bool = True,
+    stats: RunStats | None = None,
+    progress: Progress | None = None,
+) -> dict[Variant, ResultProtocol]:
+    return _solve(day, VARIANTS, file, cache, stats, progress)
+
+
+def _compute(
+    cls: type[BaseAdventDay[Any]],
+    file_path: Path,
+    variants: Sequence[Variant],
+    cache: bool,
+    stats: RunStats | None = None,
+    progress: Progress | None = None,
+) -> dict[Variant, ResultProtocol]:
+    """Solves the file through the fastest path the day supports, without the result store."""
+    stats = stats or RunStats()
+    progress = progress or Progress()
+
+    if issubclass(cls, StreamingAdventDay):
+        # a single pass over the file, never holding it in memory
         with file_path.open() as f:
-            return cls(f).run(var)
+            return cls(f, stats=stats, progress=progress).stream(variants)
+
+    if cls.reads_bytes():
+        # numbers read straight from the bytes of the file, faster than loading a cached parse
+        data = file_path.read_bytes()
+        return cls.from_buffer(data, stats=stats, progress=progress).run_many(variants)
+
+    text = file_path.read_text()
+    if not cache:
+        return cls(io.StringIO(text), stats=stats, progress=progress).run_many(variants)
+
+    from advent.cache import ParseCache
+
+    return cls(io.StringIO(text), cache=ParseCache(), stats=stats, progress=progress).run_many(
+        variants
+    )
+
+
+def _solve(
+    day: int,
+    variants: Sequence[Variant],
+    file: Path | None,
+    cache: bool,
+    stats: RunStats | None = None,
+    progress: Progress | None = None,
+) -> dict[Variant, ResultProtocol]:
+    cls, file_path = _resolve(day, file)
+    stats = stats or RunStats()
+    progress = progress or Progress()
+
+    def compute(variants: Sequence[Variant]) -> dict[Variant, ResultProtocol]:
+        return _compute(cls, file_path, variants, cache, stats, progress)
+
+    # stored answers have no stats to show
+    if not cache or stats.enabled:
+        return compute(variants)
+
+    from advent.cache import source_hash
+    from advent.results import ResultKey, ResultStore, file_hash
+
+    with ResultStore() as store:
+        input_hash, code_hash = file_hash(file_path), source_hash(cls).hex()
+        keys = {v: ResultKey(day, v, input_hash, code_hash) for v in variants}
+        results: dict[Variant, ResultProtocol] = {}
+        for v, key in keys.items():
+            if (entry := store.lookup(key)) is not None:
+                results[v] = entry.result
+
+        if missing := [v for v in variants if v not in results]:
+            computed = compute(missing)
+            for v, res in computed.items():
+                store.save(keys[v], res, stats.elapsed(v))
+            results.update(computed)
+
+    return {v: results[v] for v in variants}
+
+
+class _VariantType(click.ParamType):
+    name = "variant"
+
+    def __init__(self, all_allowed: bool = True) -> None:
+        self.all_allowed = all_allowed
+
+    @override
+    def convert(
+        self, value: Any, param: click.Parameter | None, ctx: click.Context | None
+    ) -> Variant | AllVariants:
+        match value:
+            case 1 | 2:
+                return value
+            case "1" | "2":
+                return int(value)  # type: ignore
+            case "all" if self.all_allowed:
+                return value
+            case _:
+                choices = "1, 2, all" if self.all_allowed else "1, 2"
+                self.fail(f"{value!r} is not one of {choices}.", param, ctx)
+
 
+class _DefaultGroup(click.Group):
+    """Group that hands the arguments to `run` when they don't start with a subcommand."""
 
-@click.command(
-    help="Advent of code runner. Specify a DAY from 1 to 25 and a variant (1/2), default 1."
+    # commands living in other modules, imported only when invoked
+    LAZY_COMMANDS = {"profile": "profiler:profile", "serve": "daemon:serve", "ask": "daemon:ask"}
+
+    @override
+    def parse_args(self, ctx: click.Context, args: list[str]) -> list[str]:
+        group_args = {
+            *self.list_commands(ctx),
+            *ctx.help_option_names,
+            *(opt for p in self.get_params(ctx) for opt in p.opts),
+        }
+        if not args or args[0].partition("=")[0] not in group_args:
+            args = ["run", *args]
+        return super().parse_args(ctx, args)
+
+    @override
+    def resolve_command(
+        self, ctx: click.Context, args: list[str]
+    ) -> tuple[str | None, click.Command | None, list[str]]:
+        # group options followed by DAY [VAR]
+        if self.get_command(ctx, args[0]) is None:
+            return "run", self.commands["run"], args
+        return super().resolve_command(ctx, args)
+
+    @override
+    def list_commands(self, ctx: click.Context) -> list[str]:
+        return sorted([*self.commands, *self.LAZY_COMMANDS])
+
+    @override
+    def get_command(self, ctx: click.Context, cmd_name: str) -> click.Command | None:
+        if (target := self.LAZY_COMMANDS.get(cmd_name)) is not None:
+            module, _, name = target.partition(":")
+            return getattr(importlib.import_module(module), name)
+        return super().get_command(ctx, cmd_name)
+
+
+@click.group(
+    cls=_DefaultGroup,
+    help="Advent of code runner. Run `runner.py DAY [VAR]` or one of the commands below.",
+)
+@click.option(
+    "--sample",
+    "sample_output",
+    type=click.Path(dir_okay=False, writable=True, path_type=Path),
+    help=(
+        "Sample the call stacks of the command and write them to this file in collapsed format, "
+        "for flamegraph tools. Only this process is sampled, not the workers of `all`."
+    ),
+)
+@click.option(
+    "--sample-rate",
+    type=click.FloatRange(1, 10_000),
+    default=100,
+    show_default=True,
+    help="Samples per second taken by --sample",
+)
+@click.option("--debug", is_flag=True, help="Break into the pdbp debugger on breakpoint() calls")
+@click.pass_context
+def cli(ctx: click.Context, sample_output: Path | None, sample_rate: float, debug: bool) -> None:
+    if debug:
+        import pdbp
+
+        pdbp.enable()
+        sys.breakpointhook = pdbp.set_trace
+
+    if sample_output is None:
+        return
+
+    from sampler import SamplingProfiler
+
+    profiler = SamplingProfiler(sample_rate)
+    profiler.start()
+
+    def write_samples() -> None:
+        profiler.stop()
+        profiler.write(sample_output)
+        click.echo(f"{profiler.samples} samples written to {sample_output}", err=True)
+
+    ctx.call_on_close(write_samples)
+
+
+@cli.command(
+    help=(
+        "Advent of code runner. Specify a DAY from 1 to 25 and a variant (1/2), default 1. "
+        "Variant `all` parses the input once and solves every variant."
+    ),
+    short_help="Solve a single DAY, used when no command is given.",
 )
 @click.argument("day", type=click.IntRange(1, 25))
-@click.argument("var", type=click.IntRange(1, 2), default=1)
+@click.argument("var", type=_VariantType(), default=1)
 @click.option(
     "-f",
     "--file",
     help="Override file path",
     type=click.Path(exists=True, dir_okay=False, readable=True, path_type=Path),
 )
-def run(day: int, var: Literal[1, 2], file: Path | None) -> ResultProtocol:
-    res = _run(day, var, file)
-    print(f"Result for day {day}, variant {var}, is:")
-    print(res)
+@click.option(
+    "--no-cache",
+    is_flag=True,
+    help="Solve the day again, ignoring the parse cache and the stored results",
+)
+@click.option(
+    "--stats", "show_stats", is_flag=True, help="Print the durations and counters of the solve"
+)
+@click.option(
+    "--timeout",
+    type=click.FloatRange(0, min_open=True),
+    metavar="SECONDS",
+    help=(
+        "Stop the search after this long and print the best answer found so far. Only the days "
+        "polling for cancellation (16, 19) honour it; with it, or --progress, Ctrl-C stops the "
+        "search the same way"
+    ),
+)
+@click.option("--progress", "show_progress", is_flag=True, help="Report the progress of the search")
+def run(
+    day: int,
+    var: Variant | AllVariants,
+    file: Path | None,
+    no_cache: bool,
+    show_stats: bool,
+    timeout: float | None,
+    show_progress: bool,
+) -> None:
+    stats = RunStats(enabled=True) if show_stats else None
+    progress = None
+    if timeout is not None or show_progress:
+        progress = Progress(timeout, _print_progress if show_progress else None)
+
+    try:
+        with _cancel_on_interrupt(progress, show_progress):
+            if var == "all":
+                results = _run_all(day, file, cache=not no_cache, stats=stats, progress=progress)
+            else:
+                results = {
+                    var: _run(day, var, file, cache=not no_cache, stats=stats, progress=progress)
+                }
+    except Cancelled:
+        assert progress is not None
+        _print_cancelled(day, progress)
+        raise SystemExit(1) from None
+
+    for v, res in results.items():
+        print(f"Result for day {day}, variant {v}, is:")
+        print(res)
+
+    if stats is not None:
+        _print_stats(stats)
+
+
+@contextmanager
+def _cancel_on_interrupt(progress: Progress | None, show_progress: bool) -> Iterator[None]:
+    # the first Ctrl-C cancels the search, the second one interrupts as usual
+    if progress is None:
+        yield
+        return
+
+    def interrupt(signum: int, frame: FrameType | None) -> None:
+        if progress.cancelled:
+            raise KeyboardInterrupt
+        progress.cancel()
+
+    previous = signal.signal(signal.SIGINT, interrupt)
+    try:
+        yield
+    finally:
+        signal.signal(signal.SIGINT, previous)
+        if show_progress:
+            # end the progress line
+            click.echo(err=True)
+
+
+def _print_progress(progress: Progress) -> None:
+    if (explored := progress.explored) is not None:
+        done = f"{progress.done}/{progress.total} branches ({explored:.1%}), "
+    else:
+        done = ""
+    click.echo(f"\r{done}{progress.steps} steps", err=True, nl=False)
+
+
+def _print_cancelled(day: int, progress: Progress) -> None:
+    explored = f"{progress.steps} steps"
+    if progress.explored is not None:
+        explored += f", {progress.done} of {progress.total} branches ({progress.explored:.1%})"
+    print(f"Day {day} stopped after exploring {explored}. Best answer so far:")
+    print(progress.best)
+
+
+def _print_stats(stats: RunStats) -> None:
+    print("Stats:")
+    width = max(map(len, [*stats.timings, *stats.counters]), default=0)
+    for name, seconds in stats.timings.items():
+        print(f"  {name:<{width}}  {seconds:.6f} s")
+    for name, count in sorted(stats.counters.items()):
+        print(f"  {name:<{width}}  {count}")
+
+
+@cli.command(
+    "all",
+    help="Solve both variants of every implemented day (or only the given DAYS) in parallel.",
+)
+@click.argument("days", type=click.IntRange(1, 25), nargs=-1)
+@click.option(
+    "-j",
+    "--jobs",
+    "workers",
+    type=click.IntRange(1),
+    help="Number of worker processes, defaults to the number of cores",
+)
+@click.option(
+    "--no-cache",
+    is_flag=True,
+    help="Solve the days again, ignoring the parse cache and the stored results",
+)
+def all_(days: tuple[int, ...], workers: int | None, no_cache: bool) -> None:
+    from batch import Job, solve_all
+
+    jobs = [Job(day, var, cache=not no_cache) for day in days or available_days() for var in (1, 2)]
+
+    start = time.perf_counter()
+    total = 0.0
+    failed = 0
+
+    print(f"{'day':>3} {'var':>3} {'time (s)':>9}  answer")
+    for r in solve_all(jobs, workers):
+        total += r.elapsed
+        if r.error is not None:
+            failed += 1
+            answer = f"ERROR: {r.error.strip().splitlines()[-1]}"
+        else:
+            answer = str(r.result).replace("\n", "\n" + " " * 19)
+        print(f"{r.job.day:>3} {r.job.var:>3} {r.elapsed:>9.3f}  {answer}", flush=True)
+
+    makespan = time.perf_counter() - start
+    print(f"{len(jobs)} jobs, {failed} failed: makespan {makespan:.3f} s, total {total:.3f} s")
+    if failed:
+        raise SystemExit(1)
+
+
+@cli.command(
+    "batch",
+    help=(
+        "Solve DAY for every input in SOURCES (directories, files or glob patterns) over a "
+        "process pool, streaming one CSV or JSON line per input in the order of the files."
+    ),
+)
+@click.argument("day", type=click.IntRange(1, 25))
+@click.argument("sources", nargs=-1, required=True)
+@click.option(
+    "-v", "--var", type=_VariantType(), default="all", show_default=True, help="Variant to solve"
+)
+@click.option(
+    "-j",
+    "--jobs",
+    "workers",
+    type=click.IntRange(1),
+    help="Number of worker processes, defaults to the number of cores",
+)
+@click.option(
+    "--chunksize",
+    type=click.IntRange(1),
+    help="Inputs handed to a worker at once, defaults to about four chunks per worker",
+)
+@click.option(
+    "--format",
+    "fmt",
+    type=click.Choice(["csv", "jsonl"]),
+    default="jsonl",
+    show_default=True,
+)
+@click.option(
+    "-o",
+    "--output",
+    type=click.File("w"),
+    default="-",
+    help="Where to write the results, defaults to stdout",
+)
+def batch_(
+    day: int,
+    sources: tuple[str, ...],
+    var: Variant | AllVariants,
+    workers: int | None,
+    chunksize: int | None,
+    fmt: Literal["csv", "jsonl"],
+    output: TextIO,
+) -> None:
+    from batch import ResultWriter, expand_inputs, solve_files
+
+    try:
+        get_handler_for_day(day)
+    except KeyError as e:
+        raise click.BadParameter("Module not yet implemented!", param_hint="DAY") from e
+    if not (files := expand_inputs(sources)):
+        raise click.BadParameter("no input files found", param_hint="SOURCES")
+
+    variants = VARIANTS if var == "all" else (var,)
+    writer = ResultWriter(output, fmt, variants)
+    failed = 0
+    start = time.perf_counter()
+    for r in solve_files(day, files, variants, workers, chunksize):
+        failed += r.error is not None
+        writer.write(r)
+
+    elapsed = time.perf_counter() - start
+    click.echo(
+        f"{len(files)} inputs, {failed} failed, in {elapsed:.3f} s: "
+        f"{len(files) / elapsed:.1f} inputs/s",
+        err=True,
+    )
+    if failed:
+        raise SystemExit(1)
+
+
+@cli.group(help="Inspect and prune the store of solved answers.")
+def results() -> None:
+    pass
+
+
+@results.command("show", help="List the stored answers, optionally only the ones for DAY.")
+@click.argument("day", type=click.IntRange(1, 25), required=False)
+def results_show(day: int | None) -> None:
+    from advent.results import ResultStore
+
+    with ResultStore() as store:
+        print(f"{'day':>3} {'var':>3} {'time (s)':>9} {'hits':>5}  {'code':<8}  answer")
+        for e in store.entries(day):
+            answer = str(e.result).partition("\n")[0]
+            print(
+                f"{e.key.day:>3} {e.key.variant:>3} {e.elapsed:>9.3f} {e.hits:>5}  "
+                f"{e.key.code_hash[:8]}  {answer}"
+            )
+        counters = store.counters()
+
+    hits = counters.get("hits", 0)
+    misses = counters.get("misses", 0)
+    lookups = hits + misses
+    rate = hits / lookups if lookups else 0.0
+    print(f"{hits} hits, {misses} misses ({rate:.1%} hit rate)")
+
+
+@results.command("prune", help="Delete stored answers. Without options, drops the stale ones.")
+@click.option(
+    "--unused-for",
+    type=click.FloatRange(0),
+    metavar="DAYS",
+    help="Also drop the answers not used in the last DAYS days",
+)
+@click.option("--all", "everything", is_flag=True, help="Drop every answer and reset the counters")
+def results_prune(unused_for: float | None, everything: bool) -> None:
+    from advent.cache import source_hash
+    from advent.results import ResultStore
+
+    current = {d: source_hash(get_handler_for_day(d)).hex() for d in available_days()}
+    with ResultStore() as store:
+        removed = store.prune(
+            current_code=current,
+            unused_for=unused_for * 86400 if unused_for is not None else None,
+            everything=everything,
+        )
+    print(f"Removed {removed} answers")
 
 
 if __name__ == "__main__":
-    run()
+    cli()
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import sys
+import threading
+from collections import Counter
+from pathlib import Path
+from types import CodeType, FrameType
+from typing import Any
+
+
+class SamplingProfiler:
+    """
+    Statistical profiler: a background thread grabs the stack of the profiled thread `rate`
+    times per second through `sys._current_frames()`, leaving the profiled code untouched.
+
+    The result is written in the collapsed-stack format (`outer;inner count` per line)
+    understood by flamegraph.pl, speedscope and inferno.
+    """
+
+    interval: float
+    thread_id: int
+    stacks: Counter[str]
+    samples: int
+
+    def __init__(self, rate: float = 100.0, thread_id: int | None = None) -> None:
+        self.interval = 1 / rate
+        self.thread_id = thread_id if thread_id is not None else threading.get_ident()
+        self.stacks = Counter()
+        self.samples = 0
+        self._labels: dict[CodeType, str] = {}
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._sample_loop, daemon=True)
+
+    def __enter__(self) -> SamplingProfiler:
+        self.start()
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.stop()
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def collapsed(self) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+    def write(self, path: Path) -> None:
+        path.write_text(self.collapsed())
+
+    def _sample_loop(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)  # pyright: ignore[reportPrivateUsage]
+            if frame is None:
+                break
+            self.stacks[self._collapse(frame)] += 1
+            self.samples += 1
+
+    def _collapse(self, frame: FrameType | None) -> str:
+        labels: list[str] = []
+        while frame is not None:
+            code = frame.f_code
+            if (label := self._labels.get(code)) is None:
+                name = Path(code.co_filename).name
+                label = self._labels[code] = f"{code.co_qualname} ({name}:{code.co_firstlineno})"
+            labels.append(label)
+            frame = frame.f_back
+        return ";".join(reversed(labels))
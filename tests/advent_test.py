@@ -136,3 +136,19 @@ class TestDay17(Base):
 class TestDay18(Base):
     DAY = 18
     DATA = (3494, 2062)
+
+
+@pytest.mark.parametrize("test_cls", [TestDay5, TestDay11, TestDay14], ids=lambda c: f"day{c.DAY}")
+def test_run_all(test_cls: type[Base]) -> None:
+    day = test_cls.DAY
+    cls = get_handler_for_day(day)
+    file_path = FOLDER / f"day{day}.txt"
+    with file_path.open() as f:
+        res = cls(f).run_all()
+    assert res == dict(enumerate(test_cls.DATA, start=1))
+
+
+class TestDay19(Base):
+    DAY = 19
+    DATA = (1599, None)
+    SKIP_VARIANT = (2,)
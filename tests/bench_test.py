@@ -0,0 +1,105 @@
+import json
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+import bench as B
+
+
+def test_stats() -> None:
+    stats = B.Stats.of([3.0, 1.0, 2.0, 4.0, 10.0])
+    assert stats.min == 1.0
+    assert stats.median == 3.0
+    assert stats.mean == 4.0
+    assert 4.0 < stats.p95 <= 10.0
+    assert stats.stddev == pytest.approx(3.5355, rel=1e-3)
+
+    single = B.Stats.of([0.5])
+    assert (single.p95, single.stddev) == (0.5, 0.0)
+
+
+def _report(**medians: float) -> B.Report:
+    return B.Report.new([B.Record(1, phase, "s", {"median": m}) for phase, m in medians.items()])
+
+
+def test_compare() -> None:
+    baseline = _report(parse=1.0, run_1=0.0001, run_2=1.0)
+    current = _report(parse=1.05, run_1=0.0005, run_2=1.5)
+
+    regressions = B.compare(current, baseline, threshold=0.1, noise_floor=0.001)
+    assert [(r.phase, r.ratio) for r in regressions] == [("run_2", 1.5)]
+    assert len(B.compare(current, baseline, threshold=0.0, noise_floor=0.0)) == 3
+
+
+def test_run(tmp_path: Path) -> None:
+    runner = CliRunner()
+    output = tmp_path / "report"
+    res = runner.invoke(B.bench, ["run", "1", "6", "-w", "0", "-r", "2", "-o", str(output)])
+    assert res.exit_code == 0, res.stdout
+
+    data = json.loads(output.with_suffix(".json").read_text())
+    assert [(r["day"], r["phase"]) for r in data["results"]] == [
+        (d, p) for d in (1, 6) for p in B.PHASES
+    ]
+    assert len(data["results"][0]["stats"]["samples"]) == 2
+    assert output.with_suffix(".txt").read_text().startswith("day phase")
+
+    baseline = B.Report.load(output.with_suffix(".json"))
+    for r in baseline.results:
+        r.stats["median"] /= 100
+    fast = tmp_path / "fast.json"
+    fast.write_text(json.dumps(B.asdict(baseline)))
+
+    args = ["run", "6", "-p", "run_2", "-r", "2", "-o", str(output), "-b", str(fast)]
+    res = runner.invoke(B.bench, [*args, "--noise-floor", "0"])
+    assert res.exit_code == 1
+    assert "1 regressions" in res.stdout
+
+
+def test_memory_day() -> None:
+    parse, run_1 = B.memory_day(13, ("parse", "run_1"), top=3)
+
+    assert parse.unit == "B"
+    assert parse.stats["peak"] >= parse.stats["current"] > 100_000
+    assert parse.stats["rss_peak"] > parse.stats["peak"]
+    assert len(parse.stats["top"]) == 3
+    assert any("day13.py" in site["site"] for site in parse.stats["top"])
+    assert run_1.phase == "run_1"
+    assert run_1.stats["peak"] < parse.stats["peak"]
+
+
+def test_memory_run(tmp_path: Path) -> None:
+    output = tmp_path / "report"
+    res = CliRunner().invoke(B.bench, ["run", "1", "--memory", "--top", "2", "-o", str(output)])
+    assert res.exit_code == 0, res.stdout
+
+    report = B.Report.load(output.with_suffix(".json"))
+    assert report.meta["mode"] == "memory"
+    assert [r.phase for r in report.results] == list(B.PHASES)
+    assert "top allocation sites" in output.with_suffix(".txt").read_text()
+
+
+def test_fit_exponent() -> None:
+    sizes = [10, 20, 40, 80]
+    assert B.fit_exponent(sizes, [s**3 * 1e-6 for s in sizes]) == pytest.approx(3.0)
+    assert B.fit_exponent(sizes, [s * 1e-6 for s in sizes]) == pytest.approx(1.0)
+
+
+def test_scaling(tmp_path: Path) -> None:
+    output = tmp_path / "scaling"
+    args = ["scaling", "8", "-p", "run_1", "-s", "3", "--factor", "1.5", "-r", "1"]
+    res = CliRunner().invoke(B.bench, [*args, "--max-exponent", "1", "-o", str(output)])
+    assert res.exit_code == 0, res.stdout
+
+    (record,) = B.Report.load(output.with_suffix(".json")).results
+    assert record.stats["sizes"] == [30, 45, 68]
+    assert record.stats["exponent"] > 1.5
+    assert "day 8 run_1" in res.stdout
+
+
+def test_parsers() -> None:
+    res = CliRunner().invoke(B.bench, ["parsers", "4", "6", "--scale", "2", "-r", "1", "-w", "0"])
+    assert res.exit_code == 0, res.output
+    # day 6 has no bytes parser
+    assert [r.split()[:2] for r in res.output.splitlines()[-2:]] == [["4", "text"], ["4", "bytes"]]
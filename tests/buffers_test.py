@@ -0,0 +1,139 @@
+import io
+from pathlib import Path
+
+import pytest
+
+from advent import get_handler_for_day
+from advent.buffers import Template, group, ints, line_ints, lines, records, rows
+from advent.day14 import Board
+from advent.day16 import Graph
+from advent.generators import generate
+
+FOLDER = Path(__file__).parent.parent / "inputs"
+BYTES_DAYS = [1, 4, 9, 11, 14, 15, 16, 18, 19]
+
+
+def _comparable(parsed: object) -> object:
+    # boards and valve graphs have no equality of their own
+    if isinstance(parsed, Board):
+        return [sorted(path) for path in parsed.paths]
+    if isinstance(parsed, Graph):
+        return parsed.nodes, parsed.edges
+    return parsed
+
+
+@pytest.mark.parametrize("day", BYTES_DAYS)
+def test_parse_buffer_matches_parse_input(day: int, tmp_path: Path) -> None:
+    cls = get_handler_for_day(day)
+    assert cls.reads_bytes()
+
+    for path in (FOLDER / f"day{day}.txt", tmp_path / "generated.txt"):
+        if not path.exists():
+            path.write_text(generate(day, 50, seed=day))
+        with path.open() as f:
+            expected = _comparable(cls(f).parse_input())
+        data = path.read_bytes()
+        assert _comparable(cls.from_buffer(data).parse_buffer(data)) == expected
+
+
+def test_from_buffer_runs() -> None:
+    cls = get_handler_for_day(18)
+    data = (FOLDER / "day18.txt").read_bytes()
+    assert cls.from_buffer(data).run_all() == {1: 3494, 2: 2062}
+
+
+def test_default_parse_buffer() -> None:
+    cls = get_handler_for_day(6)
+    assert not cls.reads_bytes()
+
+    text = (FOLDER / "day6.txt").read_text()
+    assert cls.from_buffer(text.encode()).run_all() == cls(io.StringIO(text)).run_all()
+
+
+def test_lines() -> None:
+    assert [bytes(line) for line in lines(b"a 1\r\n\nb 2")] == [b"a 1", b"", b"b 2"]
+    assert [bytes(line) for line in lines(b"a\n")] == [b"a"]
+    assert list(lines(b"")) == []
+
+
+def test_ints() -> None:
+    assert ints(b"x=-3, y=12\n") == [-3, 12]
+    assert ints(b"2-4,6-8", signed=False) == [2, 4, 6, 8]
+
+
+def test_records() -> None:
+    assert records(b"1,2 -> 3,4\n5,6\n", 2, signed=False) == [(1, 2), (3, 4), (5, 6)]
+    with pytest.raises(ValueError):
+        records(b"1 2 3", 2)
+    assert group([1, 2, 3, 4], 2) == [(1, 2), (3, 4)]
+
+
+def test_line_ints() -> None:
+    # the same lines as `lines`
+    assert list(line_ints(b"a 1\r\n\nb -2, 3")) == [[1], [], [-2, 3]]
+    assert list(line_ints(b"1-2\n", signed=False)) == [[1, 2]]
+    assert list(line_ints(b"")) == []
+
+
+def test_rows() -> None:
+    assert rows(b"1-2,3-4\r\n5-6,7-8\n", 4, signed=False) == [(1, 2, 3, 4), (5, 6, 7, 8)]
+    assert rows(b"x=-1, y=2", 2) == [(-1, 2)]
+    # records would regroup these in two valid rows
+    with pytest.raises(ValueError):
+        rows(b"1-2,3\n4-5,6-7-8\n", 4, signed=False)
+    with pytest.raises(ValueError):
+        rows(b"1,2,3\n\n4,5,6\n", 3)
+
+
+@pytest.mark.parametrize(
+    ("day", "text"),
+    [
+        (4, "1-2,3\n4-5,6-7-8\n"),
+        # only the separators of the template
+        (4, "a1b2c3d4\n"),
+        (4, "1-2,3-4 junk\n"),
+        (4, "1--2,3-4\n"),
+        (15, "x=1, y=2: x=3\nx=4, y=5: x=6, y=7, z=8\n"),
+        (18, "1,2\n3,4,5,6\n"),
+    ],
+)
+def test_parse_buffer_rejects_bad_lines(day: int, text: str) -> None:
+    cls = get_handler_for_day(day)
+    with pytest.raises(ValueError):
+        cls.from_buffer(text.encode()).parse_buffer(text.encode())
+    with pytest.raises(ValueError):
+        cls(io.StringIO(text)).run_all()
+
+
+def test_day11_rejects_bad_monkey() -> None:
+    cls = get_handler_for_day(11)
+    data = (FOLDER / "day11.txt").read_bytes()
+    assert len(cls.from_buffer(data).parse_buffer(data)) == data.count(b"Monkey ")
+    # the second monkey would be skipped by a scan
+    bad = data.replace(b"divisible", b"divisble", 2).replace(b"divisble", b"divisible", 1)
+    with pytest.raises(ValueError):
+        cls.from_buffer(bad).parse_buffer(bad)
+
+
+def test_template() -> None:
+    template = Template(r"{word} at {int}: {ints}; next {words}, then {str}")
+    assert template.match(memoryview(b"AA at -3: 1, 2; next BB, CC, then *")) == (
+        "AA",
+        -3,
+        [1, 2],
+        ["BB", "CC"],
+        "*",
+    )
+    with pytest.raises(ValueError):
+        template.match(b"AA at 3: 1; next BB, then * and more")
+
+    # spanning lines, skipping what does not match
+    pair = Template(r"^x={int}\ny={int}$")
+    assert list(pair.scan(b"x=1\ny=2\n\nnoise\nx=3\ny=4\n")) == [(1, 2), (3, 4)]
+    assert list(pair.match_all(b"x=1\ny=2\n\nx=3\ny=4\n")) == [(1, 2), (3, 4)]
+    for data in (b"x=1\ny=2\nnoise\nx=3\ny=4\n", b"x=1\ny=2\nx=3\n", b"noise\nx=1\ny=2"):
+        with pytest.raises(ValueError):
+            list(pair.match_all(data))
+
+    with pytest.raises(ValueError):
+        Template("{float}")
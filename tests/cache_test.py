@@ -0,0 +1,98 @@
+import os
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from advent import get_handler_for_day
+from advent.cache import ParseCache, _imported, source_hash
+
+FOLDER = Path(__file__).parent.parent / "inputs"
+
+
+def test_key() -> None:
+    cache = ParseCache()
+    day1 = get_handler_for_day(1)
+    day2 = get_handler_for_day(2)
+    assert cache.key(day1, "1\n2\n") == cache.key(day1, "1\n2\n")
+    assert cache.key(day1, "1\n2\n") != cache.key(day1, "1\n3\n")
+    assert cache.key(day1, "1\n2\n") != cache.key(day2, "1\n2\n")
+
+
+def test_source_hash_follows_imports(monkeypatch: pytest.MonkeyPatch) -> None:
+    assert _imported(["advent.day16"]) >= {
+        "advent.common",
+        "advent.graph",
+        "advent.search",
+        "advent.memo",
+        "advent.buffers",
+    }
+
+    # editing a module the day only uses, not one it is defined in, changes the hash too
+    day12 = get_handler_for_day(12)
+    before = source_hash.__wrapped__(day12)
+    read_bytes = Path.read_bytes
+    monkeypatch.setattr(
+        Path, "read_bytes", lambda p: read_bytes(p) + (b"#" if p.name == "graph.py" else b"")
+    )
+    assert source_hash.__wrapped__(day12) != before
+    assert source_hash.__wrapped__(get_handler_for_day(1)) == source_hash(get_handler_for_day(1))
+
+
+def test_key_follows_shared_modules(monkeypatch: pytest.MonkeyPatch) -> None:
+    # day 8 pickles a Grid: a new layout of it must not load the old pickles
+    day8 = get_handler_for_day(8)
+    before = ParseCache().key(day8, "12\n34\n")
+    source_hash.cache_clear()
+    read_bytes = Path.read_bytes
+    monkeypatch.setattr(
+        Path, "read_bytes", lambda p: read_bytes(p) + (b"#" if p.name == "grid.py" else b"")
+    )
+    try:
+        assert ParseCache().key(day8, "12\n34\n") != before
+    finally:
+        source_hash.cache_clear()
+
+
+def test_get_or_parse(tmp_path: Path) -> None:
+    cache = ParseCache(tmp_path)
+    calls: list[int] = []
+
+    def parse() -> list[int]:
+        calls.append(1)
+        return [1, 2, 3]
+
+    assert cache.get_or_parse("k", parse) == [1, 2, 3]
+    assert cache.get_or_parse("k", parse) == [1, 2, 3]
+    assert len(calls) == 1
+
+    (tmp_path / "k.pickle").write_bytes(b"garbage")
+    assert cache.get_or_parse("k", parse) == [1, 2, 3]
+    assert len(calls) == 2
+
+
+def test_lru_eviction(tmp_path: Path) -> None:
+    cache = ParseCache(tmp_path, max_bytes=2500)
+    payload = b"x" * 1000
+
+    cache.get_or_parse("a", lambda: payload)
+    cache.get_or_parse("b", lambda: payload)
+    os.utime(tmp_path / "a.pickle", (0, 0))
+    os.utime(tmp_path / "b.pickle", (1, 1))
+    cache.get_or_parse("a", lambda: pytest.fail("a should be cached"))
+    cache.get_or_parse("c", lambda: payload)
+
+    assert sorted(p.stem for p in tmp_path.glob("*.pickle")) == ["a", "c"]
+
+
+@pytest.mark.parametrize("day", [5, 7, 12, 13, 14])
+def test_cached_day(day: int, tmp_path: Path) -> None:
+    cache = ParseCache(tmp_path)
+    cls = get_handler_for_day(day)
+    results: list[Any] = []
+    for _ in range(2):
+        with (FOLDER / f"day{day}.txt").open() as f:
+            results.append(cls(f, cache=cache).run_all())
+
+    assert len(list(tmp_path.glob("*.pickle"))) == 1
+    assert results[0] == results[1]
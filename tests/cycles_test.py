@@ -0,0 +1,84 @@
+import pytest
+
+from advent.cycles import Cycle, fast_forward
+from advent.day17 import Direction, Jet, Tower
+
+
+def _step(x: int) -> int:
+    # 0, 1, 2 then 3 -> 4 -> 5 -> 6 -> 3 ...
+    return x + 1 if x < 6 else 3
+
+
+def _score(x: int) -> int:
+    return x
+
+
+def test_extrapolates_with_remainder() -> None:
+    def run(steps: int, memory: int | None = None) -> tuple[int, int]:
+        # the observation is the running sum of the states, so it grows by 18 every cycle
+        state = [0, 0]
+
+        def step(s: list[int]) -> list[int]:
+            s[0] = _step(s[0])
+            s[1] += s[0]
+            return s
+
+        res = fast_forward(state, step, steps, lambda s: s[0], lambda s: (s[1], s[0]), memory)
+        return res.value
+
+    def naive(steps: int) -> tuple[int, int]:
+        x = total = 0
+        for _ in range(steps):
+            x = _step(x)
+            total += x
+        return total, x
+
+    for steps in (0, 3, 7, 8, 9, 10, 1001, 1002):
+        assert run(steps) == naive(steps), steps
+    # the state itself is not extrapolated but read from the cycle, it only uses the remainder
+    assert run(10**12)[1] == naive(10**12 % 4 + 4)[1]
+
+
+def test_cycle_and_memory() -> None:
+    res = fast_forward(0, _step, 100, _score, _score)
+    assert res.cycle == Cycle(3, 4)
+    assert res.simulated == 7
+    assert res.value == _score(3 + (100 - 3) % 4)
+
+    # fingerprints forgotten before the cycle closes
+    short = fast_forward(0, _step, 100, _score, _score, memory=3)
+    assert short.cycle is None and short.simulated == 100
+    assert short.value == res.value
+
+    assert fast_forward(0, _step, 100, _score, _score, memory=4).cycle == Cycle(3, 4)
+    # a cycle of length 1 needs a fingerprint in memory
+    assert fast_forward(0, lambda _: 0, 100, _score, _score, memory=1).cycle == Cycle(0, 1)
+    for memory in (0, -1):
+        with pytest.raises(ValueError):
+            fast_forward(0, _step, 100, _score, _score, memory=memory)
+
+
+def _tower(height: int, filled: list[tuple[int, int]]) -> Tower:
+    tower = Tower([Jet(0, Direction.Left)])
+    tower.board.ensure_rows(height)
+    for x, y in filled:
+        tower.board[x, y] = True
+    tower.height = height
+    return tower
+
+
+def test_tower_fingerprint() -> None:
+    full = [(x, y) for x in range(7) for y in range(60)]
+    # the towers differ in a chimney deeper than the surface rows
+    deep = _tower(60, [(x, y) for x, y in full if x or y < 10])
+    deeper = _tower(60, [(x, y) for x, y in full if x or y < 5])
+    assert deep.fingerprint() == deeper.fingerprint()
+
+    # which is compared once a rock fell that deep
+    deep.deepest = deeper.deepest = 56
+    assert deep.fingerprint() != deeper.fingerprint()
+
+    # the first rock stops on the floor, one row below the empty top
+    tower = _tower(0, [])
+    tower.drop()
+    assert (tower.deepest, tower.height) == (1, 1)
@@ -0,0 +1,89 @@
+import asyncio
+import json
+import socket
+import threading
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+import daemon as D
+import runner as R
+
+INPUTS = Path(D.__file__).parent / "inputs"
+
+
+@pytest.fixture(scope="module")
+def solver(tmp_path_factory: pytest.TempPathFactory) -> Iterator[Path]:
+    path = tmp_path_factory.mktemp("daemon") / "solver.sock"
+    pool = D.start_pool(2)
+    ready = threading.Event()
+    stop: list[tuple[asyncio.AbstractEventLoop, asyncio.Event]] = []
+
+    async def main() -> None:
+        event = asyncio.Event()
+        server = D.SolverServer(pool, 2, queue_size=2)
+        stop.append((asyncio.get_running_loop(), event))
+        task = asyncio.create_task(server.serve(path, event))
+        while not path.exists():
+            await asyncio.sleep(0.01)
+        ready.set()
+        await task
+
+    thread = threading.Thread(target=asyncio.run, args=(main(),))
+    thread.start()
+    ready.wait(10)
+    yield path
+
+    loop, event = stop[0]
+    loop.call_soon_threadsafe(event.set)
+    thread.join()
+    pool.shutdown()
+    assert not path.exists()
+
+
+def test_request(solver: Path) -> None:
+    response = D.request(1, "all", (INPUTS / "day1.txt").read_bytes(), solver)
+    assert response["results"] == {"1": "68775", "2": "202585"}
+    assert set(response["timings"]) == {"parse", "solve 1", "solve 2"}
+    assert response["elapsed"] >= response["queued"] >= 0
+
+
+def test_errors(solver: Path) -> None:
+    assert D.request(25, 1, b"", solver)["error"] == "Module not yet implemented!"
+    assert "ValueError" in D.request(1, 1, b"foo\n", solver)["error"]
+    for variant in (3, 0, True, "1"):
+        assert D.request(1, variant, b"1\n", solver)["error"] == f"Invalid variant: {variant!r}"  # type: ignore
+
+
+@pytest.mark.parametrize("size", [-1, "3", 1.5, None])
+def test_invalid_size(solver: Path, size: object) -> None:
+    with socket.socket(socket.AF_UNIX) as sock:
+        sock.connect(str(solver))
+        header = {"day": 1, "variant": 1, "size": size}
+        sock.sendall(json.dumps(header).encode() + b"\n")
+        with sock.makefile("rb") as f:
+            assert json.loads(f.readline()) == {"error": "Invalid request header"}
+
+
+def test_concurrent_requests(solver: Path) -> None:
+    # more requests than workers and queue slots together
+    data = {day: (INPUTS / f"day{day}.txt").read_bytes() for day in (1, 2, 4, 6)}
+    with ThreadPoolExecutor(8) as executor:
+        responses = list(executor.map(lambda d: D.request(d, 1, data[d], solver), [*data] * 2))
+
+    expected = {1: "68775", 2: "14264", 4: "487", 6: "1198"}
+    assert [r["results"]["1"] for r in responses] == [expected[d] for d in [*data] * 2]
+
+
+def test_ask(solver: Path) -> None:
+    res = CliRunner().invoke(R.cli, ["ask", "6", "2", "-s", str(solver)])
+    assert res.exit_code == 0, res.output
+    assert res.output.splitlines()[:2] == ["Result for day 6, variant 2, is:", "3120"]
+    assert "queued" in res.output
+
+    res = CliRunner().invoke(R.cli, ["ask", "6", "-s", str(solver.with_name("nope.sock"))])
+    assert res.exit_code == 1
+    assert "Cannot reach the solver" in res.output
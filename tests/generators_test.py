@@ -0,0 +1,22 @@
+import io
+
+import pytest
+
+from advent import get_handler_for_day
+from advent.generators import GENERATORS, generate
+
+
+@pytest.mark.parametrize("day", sorted(GENERATORS))
+def test_generated_inputs_parse(day: int) -> None:
+    gen = GENERATORS[day]
+    text = gen(gen.base_size)
+    assert text == gen(gen.base_size) != gen(gen.base_size, seed=1)
+    assert gen.unit
+
+    get_handler_for_day(day)(io.StringIO(text)).parse_input()
+
+
+@pytest.mark.parametrize("day", [1, 5, 8, 12, 15, 17])
+def test_generated_inputs_solve(day: int) -> None:
+    results = get_handler_for_day(day)(io.StringIO(generate(day, 10))).run_all()
+    assert all(str(r) for r in results.values())
@@ -0,0 +1,33 @@
+import pytest
+
+from advent.graph import INF, Graph, all_pairs, bfs, dijkstra, zero_one_bfs
+
+# 0 -> 1 -> 2 -> 3, 0 -> 2 directly, 4 unreachable
+EDGES = [(0, 1, 1), (1, 2, 0), (2, 3, 1), (0, 2, 1)]
+
+
+def test_from_edges() -> None:
+    graph = Graph.from_edges(5, reversed(EDGES))
+    assert len(graph) == 5
+    assert sorted(graph.neighbors(0)) == [1, 2]
+    assert list(graph.edges(1)) == [(2, 0)]
+    assert list(graph.neighbors(4)) == []
+
+
+def test_bfs() -> None:
+    graph = Graph.from_adjacency([[1, 2], [2], [3], [], []])
+    assert bfs(graph, 0) == [0, 1, 1, 2, INF]
+    assert bfs(graph, [1, 3]) == [INF, 0, 1, 0, INF]
+    assert all_pairs(graph)[1] == [INF, 0, 1, 2, INF]
+
+
+def test_weighted() -> None:
+    graph = Graph.from_edges(5, EDGES)
+    assert zero_one_bfs(graph, 0) == [0, 1, 1, 2, INF]
+    assert dijkstra(graph, 0) == [0, 1, 1, 2, INF]
+    assert all_pairs(graph)[1] == [INF, 0, 0, 1, INF]
+
+    heavy = Graph.from_edges(3, [(0, 1, 5), (0, 2, 1), (2, 1, 2)])
+    assert dijkstra(heavy, 0) == [0, 3, 1]
+    with pytest.raises(ValueError):
+        zero_one_bfs(heavy, 0)
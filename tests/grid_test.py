@@ -0,0 +1,42 @@
+import pytest
+
+from advent.grid import Grid
+
+
+def test_from_rows() -> None:
+    grid = Grid.from_rows([b"abc", b"def"])
+    assert (grid.rows, grid.cols) == (2, 3)
+    assert grid[1, 2] == ord("f")
+    assert grid.pos(grid.index(1, 2)) == (1, 2)
+
+    with pytest.raises(ValueError):
+        Grid.from_rows([b"abc", b"de"])
+
+
+def test_views() -> None:
+    grid = Grid.from_rows([[1, 2, 3], [4, 5, 6]])
+    assert list(grid.row(1)) == [4, 5, 6]
+    assert list(grid.col(1)) == [2, 5]
+    assert list(grid.col(2)[::-1]) == [6, 3]
+
+    # views share the storage
+    grid.row(0)[0] = 9
+    assert grid[0, 0] == 9
+
+
+def test_neighbors() -> None:
+    grid = Grid.filled(3, 4)
+    assert sorted(grid.neighbors(grid.index(1, 1))) == [1, 4, 6, 9]
+    assert sorted(grid.neighbors(grid.index(0, 0))) == [1, 4]
+    assert sorted(grid.neighbors(grid.index(2, 3))) == [7, 10]
+    assert {5 + d for d in grid.offsets()} == set(grid.neighbors(5))
+
+
+def test_append_rows() -> None:
+    grid = Grid.filled(1, 2, 1)
+    grid.append_rows(2)
+    assert (grid.rows, bytes(grid.cells)) == (3, b"\x01\x01" + bytes(4))
+
+    copy = grid.copy()
+    copy[0, 0] = 5
+    assert grid[0, 0] == 1
@@ -0,0 +1,46 @@
+import random
+
+from advent.intervals import IntervalSet
+
+
+def test_merge() -> None:
+    s = IntervalSet([(10, 12), (1, 3), (4, 5), (2, 2), (20, 19), (8, 8)])
+    # touching intervals are merged too, empty ones dropped
+    assert list(s) == [(1, 5), (8, 8), (10, 12)]
+    assert len(s) == 3
+    assert s.coverage() == 9
+    assert 5 in s and 8 in s and 6 not in s and 0 not in s and 13 not in s
+
+    s.add(6, 9)
+    assert list(s) == [(1, 12)]
+    s.add(-5, -3)
+    s.add(14, 14)
+    assert list(s) == [(-5, -3), (1, 12), (14, 14)]
+
+
+def test_gaps_and_clip() -> None:
+    s = IntervalSet([(1, 5), (8, 8), (10, 12)])
+    assert list(s.gaps(0, 15)) == [(0, 0), (6, 7), (9, 9), (13, 15)]
+    assert list(s.gaps(2, 11)) == [(6, 7), (9, 9)]
+    assert list(s.gaps(1, 5)) == []
+
+    assert list(s.clip(3, 10)) == [(3, 5), (8, 8), (10, 10)]
+    assert list(s.clip(hi=8)) == [(1, 5), (8, 8)]
+    assert list(s.clip(6, 7)) == []
+    assert s.clip() == s
+
+
+def test_against_set() -> None:
+    rng = random.Random(15)
+    intervals = [(a, a + rng.randint(-2, 8)) for a in (rng.randint(0, 200) for _ in range(40))]
+    expected = {x for a, b in intervals for x in range(a, b + 1)}
+
+    bulk = IntervalSet(intervals)
+    one_by_one = IntervalSet()
+    for a, b in intervals:
+        one_by_one.add(a, b)
+
+    assert bulk == one_by_one
+    assert bulk.coverage() == len(expected)
+    assert all((x in bulk) == (x in expected) for x in range(-5, 220))
+    assert {x for a, b in bulk.gaps(0, 210) for x in range(a, b + 1)} == set(range(211)) - expected
@@ -0,0 +1,82 @@
+import sys
+
+import pytest
+
+from advent.common import RunStats
+from advent.memo import MemoStore
+
+
+def test_lru() -> None:
+    store = MemoStore[str, int](max_entries=2)
+    store["a"] = 1
+    store["b"] = 2
+    assert store.get("a") == 1
+    # b is the least recently used
+    store["c"] = 3
+    assert "b" not in store and "a" in store and "c" in store
+    assert store.get("b") is None
+
+    stats = RunStats(enabled=True)
+    store.report(stats, "memo")
+    assert stats.counters == {"memo hits": 1, "memo misses": 1, "memo evictions": 1}
+
+
+def test_clock() -> None:
+    store = MemoStore[str, int](max_entries=3, eviction="clock")
+    for i, key in enumerate("abc"):
+        store[key] = i
+    assert store.get("a") == 0
+    # a gets a second chance, b is the first one not referenced
+    store["d"] = 3
+    assert sorted(store.values) == ["a", "c", "d"]
+    # the hand cleared the bit of a on the way
+    store["e"] = 4
+    store["f"] = 5
+    assert sorted(store.values) == ["d", "e", "f"]
+    assert store.evictions == 3 and len(store) == 3
+
+    store["d"] = 30
+    assert store.get("d") == 30 and len(store) == 3
+
+
+@pytest.mark.parametrize("eviction", ["lru", "clock"])
+def test_byte_budget(eviction: str) -> None:
+    entry = sys.getsizeof(0) * 2 + 64
+    store = MemoStore[int, int](max_bytes=entry * 10, eviction=eviction)  # pyright: ignore
+    for i in range(100):
+        store[i + 1000] = i + 1000
+        assert store.nbytes <= entry * 10
+    assert len(store) >= 5 and store.evictions == 100 - len(store)
+    # a single entry over the budget is still kept
+    store[-1] = 10**5000
+    assert len(store) == 1
+
+
+@pytest.mark.parametrize("eviction", ["lru", "clock"])
+def test_byte_budget_update(eviction: str) -> None:
+    entry = sys.getsizeof(1000) * 2 + 64
+    store = MemoStore[int, int](max_bytes=entry * 10, eviction=eviction)  # pyright: ignore
+    for i in range(10):
+        store[i + 1000] = i + 1000
+    # a larger value for a key already there evicts the others, never that key
+    store[1005] = 10**500
+    assert store.nbytes <= entry * 10
+    assert 1005 in store and store.evictions == 10 - len(store) > 0
+    store[1005] = 10**5000
+    assert list(store.values) == [1005] and store.values[1005] == 10**5000
+
+
+def test_get_or_compute() -> None:
+    calls: list[int] = []
+
+    def square(x: int) -> int:
+        calls.append(x)
+        return x * x
+
+    store = MemoStore[int, int](max_entries=10)
+    assert [store.get_or_compute(x, square) for x in (2, 3, 2, 2)] == [4, 9, 4, 4]
+    assert calls == [2, 3]
+    assert (store.hits, store.misses) == (2, 2)
+
+    with pytest.raises(ValueError):
+        MemoStore[int, int](max_entries=0)
@@ -0,0 +1,59 @@
+import tracemalloc
+from collections import deque
+from collections.abc import Callable
+from dataclasses import field, fields, is_dataclass, make_dataclass
+from operator import add
+
+import pytest
+
+from advent.day5 import Move
+from advent.day10 import AddX
+from advent.day11 import Monkey
+from advent.day13 import Packet
+from advent.day15 import Sensor
+from advent.day17 import Direction, Jet
+from advent.day18 import Cube
+
+N = 2_000
+
+
+def _traced(cls: type, args: Callable[[int], tuple[object, ...]]) -> int:
+    """Bytes allocated for each instance of cls, with the instances alive."""
+    values = [args(i) for i in range(N)]
+    tracemalloc.start()
+    try:
+        objects = [cls(*v) for v in values]
+        current, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert len(objects) == N
+    return current // N
+
+
+def _plain(cls: type) -> type:
+    """A dataclass with the same constructor as cls, keeping its fields in an instance __dict__."""
+    if not is_dataclass(cls):
+        return make_dataclass(f"Plain{cls.__name__}", cls._fields)  # pyright: ignore
+    return make_dataclass(
+        f"Plain{cls.__name__}",
+        [(f.name, f.type, field(init=f.init)) for f in fields(cls)],
+        namespace={"__post_init__": cls.__post_init__} if hasattr(cls, "__post_init__") else {},
+    )
+
+
+@pytest.mark.parametrize(
+    ("cls", "args"),
+    [
+        (Move, lambda i: (i, "1", "2")),
+        (AddX, lambda i: (i,)),
+        (Monkey, lambda i: (i, deque(), 3, 1, 2, "old", i, add, abs)),
+        (Packet, lambda i: ([i],)),
+        (Sensor, lambda i: ((i, 0), (0, i))),
+        (Jet, lambda i: (i, Direction.Left)),
+        (Cube, lambda i: (i, i, i)),
+    ],
+    ids=lambda p: p.__name__ if isinstance(p, type) else "",
+)
+def test_smaller_than_dict(cls: type, args: Callable[[int], tuple[object, ...]]) -> None:
+    assert not hasattr(cls(*args(0)), "__dict__")
+    assert _traced(cls, args) < _traced(_plain(cls), args)
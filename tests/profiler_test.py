@@ -0,0 +1,72 @@
+import pstats
+
+import pytest
+from click.testing import CliRunner
+
+import profiler as P
+import runner as R
+from advent import get_handler_for_day
+
+
+def _functions(profile: P.cProfile.Profile) -> set[str]:
+    return {fn for (_, _, fn) in pstats.Stats(profile).stats}  # type: ignore
+
+
+def test_resolve() -> None:
+    from advent.day17 import Board
+
+    assert P.resolve("advent.day17.Board.can_move_down") is Board.can_move_down
+    assert P.resolve("runner._run") is R._run  # pyright: ignore[reportPrivateUsage]
+    with pytest.raises(ValueError):
+        P.resolve("nothing")
+    with pytest.raises(AttributeError):
+        P.resolve("advent.day17.Nope")
+
+
+def test_phases() -> None:
+    profiles = P.profile_phases(13, 1)
+    parse, solve = profiles["parse"], profiles["solve"]
+
+    assert "parse_input" in _functions(parse)
+    assert "from_line" in _functions(parse)
+    assert "parse_input" not in _functions(solve)
+    assert "_run_1" in _functions(solve)
+    assert get_handler_for_day(13).parse_input.__name__ == "parse_input"
+    assert get_handler_for_day(13).parse_input.__qualname__ == "Day13.parse_input"
+
+
+def test_stream_phase() -> None:
+    profiles = P.profile_phases(1, 1)
+    assert list(profiles) == ["stream", "solve"]
+    assert "feed" in _functions(profiles["stream"])
+    assert "feed" not in _functions(profiles["solve"])
+    # the wrapper of the inherited method is removed, not left on the subclass
+    assert "stream" not in vars(get_handler_for_day(1))
+
+    res = CliRunner().invoke(R.cli, ["profile", "1", "1", "-m", "phases", "-n", "3"])
+    assert res.exit_code == 0, res.stdout
+    assert "==== day 1, stream ====" in res.stdout
+
+
+def test_bytes_phase() -> None:
+    # the runner parses the bytes of the file with parse_buffer, the parse_input text path is unused
+    profiles = P.profile_phases(15, 1)
+    assert "parse_buffer" in _functions(profiles["parse"])
+    assert "rows" in _functions(profiles["parse"])
+    assert "parse_buffer" not in _functions(profiles["solve"])
+    assert "_run_1" in _functions(profiles["solve"])
+
+
+def test_empty_phase(monkeypatch: pytest.MonkeyPatch) -> None:
+    profiles = {"parse": P.cProfile.Profile(), "solve": P.profile_run(6, 1)}
+    monkeypatch.setattr(P, "profile_phases", lambda *_: profiles)
+    res = CliRunner().invoke(R.cli, ["profile", "6", "1", "-m", "phases", "-n", "3"])
+    assert res.exit_code == 0, res.stdout
+    assert "==== day 6, parse ====\nno parse phase" in res.stdout
+
+
+def test_profile_command() -> None:
+    res = CliRunner().invoke(R.cli, ["profile", "4", "2", "-n", "5", "-s", "tottime"])
+    assert res.exit_code == 0, res.stdout
+    assert "==== day 4, variant 2 ====" in res.stdout
+    assert "Ordered by: internal time" in res.stdout
@@ -0,0 +1,59 @@
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+import runner as R
+from advent import get_handler_for_day
+from advent.common import Cancelled, Progress
+
+FOLDER = Path(__file__).parent.parent / "inputs"
+
+
+def _spin(progress: Progress, steps: int) -> None:
+    for _ in range(steps):
+        progress.checkpoint()
+
+
+def test_cancel() -> None:
+    progress = Progress()
+    progress.start(4, best=lambda: 42)
+    progress.advance()
+    _spin(progress, 10 * Progress.CHECK_EVERY)
+    assert progress.steps == 10 * Progress.CHECK_EVERY
+    assert (progress.explored, progress.best) == (0.25, 42)
+
+    progress.cancel()
+    with pytest.raises(Cancelled):
+        _spin(progress, Progress.CHECK_EVERY)
+    assert progress.steps == 11 * Progress.CHECK_EVERY
+
+
+def test_timeout_and_listener() -> None:
+    reports: list[int] = []
+    progress = Progress(timeout=0.0, listener=lambda p: reports.append(p.steps), interval=0.0)
+    assert progress.best is None and progress.explored is None
+
+    with pytest.raises(Cancelled):
+        progress.checkpoint(Progress.CHECK_EVERY)
+    assert reports == [Progress.CHECK_EVERY]
+
+
+def test_day_partial_answer() -> None:
+    cls = get_handler_for_day(16)
+    with (FOLDER / "day16.txt").open() as f:
+        day = cls(f, progress=Progress(timeout=0.05))
+        with pytest.raises(Cancelled):
+            day.run(2)
+
+    assert isinstance(day.progress.best, int)
+    assert 0 < day.progress.best <= 2169
+
+
+def test_runner_timeout() -> None:
+    res = CliRunner().invoke(R.cli, ["19", "--no-cache", "--timeout", "0.001"])
+    assert res.exit_code == 1
+    lines = res.output.splitlines()
+    assert lines[0].startswith("Day 19 stopped after exploring")
+    assert "of 30 branches" in lines[0]
+    assert lines[1].startswith("{1: ")
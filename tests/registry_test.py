@@ -0,0 +1,32 @@
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+import advent
+
+ROOT = Path(__file__).parent.parent
+
+
+def test_available_days() -> None:
+    days = advent.available_days()
+    assert days == tuple(sorted(days))
+    assert {1, 16, 17} <= set(days)
+    assert 25 not in days
+
+
+def test_missing_day() -> None:
+    with pytest.raises(KeyError):
+        advent.get_handler_for_day(25)
+
+
+def test_import_is_lazy() -> None:
+    code = (
+        "import sys, advent; advent.get_handler_for_day(3); "
+        "print(sorted(m for m in sys.modules if m.startswith('advent.day')))"
+    )
+    res = subprocess.run(
+        [sys.executable, "-c", code], cwd=ROOT, check=True, capture_output=True, text=True
+    )
+    assert res.stdout.strip() == "['advent.day3']"
@@ -0,0 +1,56 @@
+import time
+from pathlib import Path
+
+import pytest
+
+from advent import get_handler_for_day
+from advent.results import ResultKey, ResultStore
+
+
+@pytest.fixture()
+def store(tmp_path: Path):
+    with ResultStore(tmp_path / "results.sqlite3") as store:
+        yield store
+
+
+def test_key() -> None:
+    day1 = get_handler_for_day(1)
+    key = ResultKey.of(1, 1, day1, "1\n2\n")
+    assert key == ResultKey.of(1, 1, day1, "1\n2\n")
+    assert key != ResultKey.of(1, 2, day1, "1\n2\n")
+    assert key.input_hash != ResultKey.of(1, 1, day1, "1\n3\n").input_hash
+    assert key.code_hash != ResultKey.of(1, 1, get_handler_for_day(2), "1\n2\n").code_hash
+
+
+def test_lookup(store: ResultStore) -> None:
+    key = ResultKey(1, 1, "input", "code")
+    assert store.lookup(key) is None
+
+    store.save(key, "answer\nmultiline", 1.5)
+    entry = store.lookup(key)
+    assert entry is not None
+    assert entry.result == "answer\nmultiline"
+    assert entry.elapsed == 1.5
+    assert entry.hits == 1
+    assert store.lookup(ResultKey(1, 1, "input", "other code")) is None
+
+    assert (store.hits, store.misses) == (1, 2)
+    assert store.counters() == {"hits": 1, "misses": 2}
+    assert [e.key for e in store.entries(1)] == [key]
+    assert list(store.entries(2)) == []
+
+
+def test_prune(store: ResultStore) -> None:
+    store.save(ResultKey(1, 1, "input", "old"), 1, 0.1)
+    store.save(ResultKey(1, 2, "input", "new"), 2, 0.1)
+    store.save(ResultKey(2, 1, "input", "new"), 3, 0.1)
+
+    assert store.prune(current_code={1: "new", 2: "new"}) == 1
+    assert store.prune(unused_for=60) == 0
+
+    time.sleep(0.01)
+    assert store.prune(unused_for=0.005) == 2
+    assert list(store.entries()) == []
+
+    store.save(ResultKey(1, 1, "input", "new"), 1, 0.1)
+    assert store.prune(everything=True) == 1
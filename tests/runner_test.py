@@ -7,14 +7,15 @@ import pytest
 from click.testing import CliRunner
 
 import runner as R
+from advent import get_handler_for_day
 
 
 @pytest.fixture()
 def mocked_run_check(monkeypatch: pytest.MonkeyPatch) -> Callable[..., None]:
     monkeypatch.setattr(R, "_run", mock := MagicMock())
 
-    def check(*args: Any) -> None:
-        mock.assert_called_once_with(*args)
+    def check(*args: Any, cache: bool = True, stats: Any = None, progress: Any = None) -> None:
+        mock.assert_called_once_with(*args, cache=cache, stats=stats, progress=progress)
 
     return check
 
@@ -32,12 +33,18 @@ def test_valid(mocked_run_check: Callable[..., None], full: bool, tmp_path: Path
     mocked_run_check(15, 2, tmp_file)
 
 
+def test_no_cache(mocked_run_check: Callable[..., None]) -> None:
+    _run_check(["7", "--no-cache"])
+    mocked_run_check(7, 1, None, cache=False)
+
+
 @pytest.mark.parametrize(
     "cases, msg",
     [
         ((0, 1, None), "Invalid value for 'DAY'"),
         ((30, 1, None), "Invalid value for 'DAY'"),
         ((3, 3, None), "Invalid value for '[VAR]'"),
+        ((3, "foo", None), "Invalid value for '[VAR]'"),
         ((3, 0, None), "Invalid value for '[VAR]'"),
         ((1, 1, "-f", "foo"), "File 'foo' does not exist"),
         ((1, 1, "-f", "."), "File '.' is a directory"),
@@ -55,3 +62,105 @@ def _run_check(args: list[str]) -> None:
     runner = CliRunner()
     res = runner.invoke(R.run, args)
     assert res.exit_code == 0, res.stdout
+
+
+def test_stats() -> None:
+    res = CliRunner().invoke(R.run, ["17", "1", "--stats", "--no-cache"])
+    assert res.exit_code == 0, res.stdout
+    lines = res.stdout.splitlines()
+    assert lines[:3] == ["Result for day 17, variant 1, is:", "3188", "Stats:"]
+    assert [line.split()[0] for line in lines[3:]] == ["parse", "solve", "rocks"]
+
+
+def test_memo_stats() -> None:
+    res = CliRunner().invoke(R.run, ["15", "2", "--stats", "--no-cache"])
+    assert res.exit_code == 0, res.stdout
+    counters = {
+        line.rsplit(maxsplit=1)[0].strip(): int(line.split()[-1])
+        for line in res.stdout.splitlines()
+        if line.startswith("  border bounds")
+    }
+    # every sensor is computed once, however many there are
+    assert counters["border bounds evictions"] == 0
+    assert counters["border bounds misses"] < counters["border bounds hits"]
+
+
+def test_default_command(mocked_run_check: Callable[..., None]) -> None:
+    res = CliRunner().invoke(R.cli, ["3", "2"])
+    assert res.exit_code == 0, res.stdout
+    mocked_run_check(3, 2, None)
+
+
+def test_all() -> None:
+    res = CliRunner().invoke(R.cli, ["all", "1", "6", "-j", "1", "--no-cache"])
+    assert res.exit_code == 0, res.stdout
+    rows = {tuple(line.split()[:2]): line.split()[-1] for line in res.stdout.splitlines()[1:-1]}
+    assert rows == {
+        ("1", "1"): "68775",
+        ("1", "2"): "202585",
+        ("6", "1"): "1198",
+        ("6", "2"): "3120",
+    }
+    assert "4 jobs, 0 failed" in res.stdout
+
+
+def test_schedule_longest_first() -> None:
+    from batch import Job, schedule
+
+    jobs = [Job(1, 1), Job(19, 1), Job(16, 2), Job(14, 2)]
+    assert schedule(jobs) == [Job(16, 2), Job(14, 2), Job(19, 1), Job(1, 1)]
+
+
+def test_all_variants(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(R, "_run_all", mock := MagicMock(return_value={1: "a", 2: "b"}))
+    res = CliRunner().invoke(R.run, ["4", "all"])
+    assert res.exit_code == 0, res.stdout
+    mock.assert_called_once_with(4, None, cache=True, stats=None, progress=None)
+    assert res.stdout.splitlines() == [
+        "Result for day 4, variant 1, is:",
+        "a",
+        "Result for day 4, variant 2, is:",
+        "b",
+    ]
+
+
+@pytest.mark.parametrize("fmt", ["csv", "jsonl"])
+def test_batch(tmp_path: Path, fmt: str) -> None:
+    import csv
+    import json
+
+    day1 = (Path(R.__file__).parent / "inputs" / "day1.txt").read_text()
+    for i in range(3):
+        (tmp_path / f"in{i}.txt").write_text(day1)
+    (tmp_path / "bad.txt").write_text("not a number\n")
+    output = tmp_path / f"out.{fmt}"
+
+    args = ["batch", "1", str(tmp_path / "*.txt"), "-j", "2", "--format", fmt, "-o", str(output)]
+    res = CliRunner().invoke(R.cli, args)
+    assert res.exit_code == 1
+    assert "4 inputs, 1 failed" in res.output
+    assert "inputs/s" in res.output
+
+    with output.open() as f:
+        rows = list(csv.DictReader(f)) if fmt == "csv" else [json.loads(line) for line in f]
+    assert [Path(r["file"]).name for r in rows] == ["bad.txt", "in0.txt", "in1.txt", "in2.txt"]
+    assert rows[0]["error"]
+    assert all((r["answer_1"], r["answer_2"]) == ("68775", "202585") for r in rows[1:])
+
+
+def test_batch_file_same_path_as_run(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    import batch as B
+
+    bad = tmp_path / "bad.txt"
+    bad.write_text("1-2,3\n4-5,6-7-8\n")
+    with pytest.raises(ValueError):
+        R._run(4, 1, bad, cache=False)
+    monkeypatch.setattr(B, "_worker_cls", get_handler_for_day(4))
+    assert B.solve_file(bad, (1, 2)).error
+
+    # bytes and streaming days never parse the text
+    for day in (1, 15):
+        monkeypatch.setattr(B, "_worker_cls", cls := get_handler_for_day(day))
+        monkeypatch.setattr(cls, "parse_input", MagicMock(side_effect=AssertionError))
+        good = Path(R.__file__).parent / "inputs" / f"day{day}.txt"
+        assert B.solve_file(good, (1,)).results == {1: str(R._run(day, 1, good, cache=False))}
@@ -0,0 +1,37 @@
+import time
+from pathlib import Path
+
+from click.testing import CliRunner
+
+import runner as R
+from sampler import SamplingProfiler
+
+
+def _busy(seconds: float) -> None:
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+def test_sampling() -> None:
+    with SamplingProfiler(rate=200) as profiler:
+        _busy(0.2)
+
+    assert profiler.samples > 5
+    assert sum(profiler.stacks.values()) == profiler.samples
+    busy = sum(n for stack, n in profiler.stacks.items() if "_busy (sampler_test.py:" in stack)
+    assert busy >= profiler.samples // 2
+
+    for line in profiler.collapsed().splitlines():
+        stack, _, count = line.rpartition(" ")
+        assert int(count) > 0
+        assert stack.split(";")[-1]
+
+
+def test_runner_option(tmp_path: Path) -> None:
+    output = tmp_path / "day14.folded"
+    res = CliRunner().invoke(
+        R.cli, ["--sample", str(output), "--sample-rate", "200", "14", "1", "--no-cache"]
+    )
+    assert res.exit_code == 0, res.output
+    assert "Day14._run_1" in output.read_text()
@@ -0,0 +1,75 @@
+from collections.abc import Iterator
+
+import pytest
+
+from advent.common import Cancelled, Progress, RunStats
+from advent.memo import MemoStore
+from advent.search import Memo, Search
+
+# a small knapsack: (weight, value) of the items, at most 10 of weight
+ITEMS = [(5, 10), (4, 40), (6, 30), (3, 50)]
+CAPACITY = 10
+
+type State = tuple[int, int, int]  # next item, weight, value
+
+
+def _successors(state: State) -> Iterator[State]:
+    i, weight, value = state
+    if i == len(ITEMS):
+        return
+    yield i + 1, weight, value
+    w, v = ITEMS[i]
+    if weight + w <= CAPACITY:
+        yield i + 1, weight + w, value + v
+
+
+def _bound(state: State) -> int:
+    i, _, value = state
+    return value + sum(v for _, v in ITEMS[i:])
+
+
+def test_exhaustive() -> None:
+    search = Search[State, State](_successors, value=lambda s: s[2])
+    assert search.run((0, 0, 0)) == 90
+    assert search.pruned == search.memo_hits == 0
+    assert search.expanded == 23
+
+
+def test_pruned() -> None:
+    search = Search[State, tuple[int, int]](
+        _successors, value=lambda s: s[2], bound=_bound, key=lambda s: s[:2], memo=Memo()
+    )
+    assert search.run((0, 0, 0)) == 90
+    assert 0 < search.expanded < 23
+    assert search.pruned > 0
+
+    # a known lower bound prunes more
+    assert search.run((0, 0, 0), best=90) == 90
+
+
+def test_bounded_memo() -> None:
+    # forgetting states only explores them again
+    store = MemoStore[tuple[int, int], int](max_entries=2, eviction="clock")
+    search = Search[State, tuple[int, int]](
+        _successors, value=lambda s: s[2], key=lambda s: s[:2], memo=Memo(store)
+    )
+    assert search.run((0, 0, 0)) == 90
+    assert len(store) == 2 and store.evictions > 0
+
+    stats = RunStats(enabled=True)
+    search.report(stats)
+    assert stats.counters["memo store evictions"] == store.evictions
+
+
+def test_branches_and_cancel() -> None:
+    progress = Progress()
+    progress.start(2)
+    search = Search[State, State](
+        _successors, value=lambda s: s[2], progress=progress, branches=True
+    )
+    search.run((0, 0, 0))
+    assert progress.done == 2
+
+    progress.cancel()
+    with pytest.raises(Cancelled):
+        Search[State, State](lambda s: [s], value=lambda s: 0, progress=progress).run((0, 0, 0))
@@ -0,0 +1,37 @@
+import sys
+from unittest.mock import MagicMock
+
+import pytest
+from click.testing import CliRunner
+
+import bench as B
+import runner as R
+
+# import time of runner.py as a multiple of the click it imports, measured in the same process so
+# that it holds on slow machines too; it is under 3 now, pdbp alone used to add about 1.5
+STARTUP_BUDGET = 4
+
+# only imported by the commands and the options that need them
+DEFERRED = {"pdbp", "sqlite3", "pickle", "advent.cache", "advent.results", "batch", "daemon"}
+
+
+def test_deferred_imports() -> None:
+    assert not DEFERRED & B.import_times("import runner").keys()
+
+
+def test_startup_time() -> None:
+    # best of a few runs, the first ones may pay for a cold disk cache
+    samples = [B.import_times("import runner") for _ in range(5)]
+    best = min(times["runner"] / times["click"] for times in samples)
+    assert best < STARTUP_BUDGET
+
+
+def test_debug(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(sys, "breakpointhook", sys.breakpointhook)
+    monkeypatch.setattr(R, "_run", MagicMock(return_value=1))
+
+    res = CliRunner().invoke(R.cli, ["--debug", "1"])
+    assert res.exit_code == 0, res.output
+    import pdbp
+
+    assert sys.breakpointhook is pdbp.set_trace
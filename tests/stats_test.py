@@ -0,0 +1,48 @@
+from pathlib import Path
+
+from advent import get_handler_for_day
+from advent.common import RunStats
+
+FOLDER = Path(__file__).parent.parent / "inputs"
+
+
+def test_disabled() -> None:
+    stats = RunStats()
+    stats.incr("foo")
+    with stats.span("bar"):
+        pass
+    assert not stats.counters
+    assert not stats.timings
+
+
+def test_enabled() -> None:
+    stats = RunStats(enabled=True)
+    stats.incr("foo")
+    stats.incr("foo", 4)
+    with stats.span("bar"):
+        pass
+    with stats.span("bar"):
+        pass
+    assert stats.counters == {"foo": 5}
+    assert list(stats.timings) == ["bar"]
+    assert stats.timings["bar"] >= 0
+
+
+def test_day_stats() -> None:
+    cls = get_handler_for_day(17)
+    with (FOLDER / "day17.txt").open() as f:
+        day = cls(f, stats=RunStats(enabled=True))
+        day.run_all()
+
+    assert list(day.stats.timings) == ["parse", "solve 1", "solve 2"]
+    assert day.stats.counters["rocks simulated"] > 2022
+
+
+def test_day_stats_disabled() -> None:
+    cls = get_handler_for_day(12)
+    with (FOLDER / "day12.txt").open() as f:
+        day = cls(f)
+        day.run(1)
+
+    assert list(day.stats.timings) == ["parse", "solve 1"]
+    assert not day.stats.counters
@@ -0,0 +1,48 @@
+import io
+import tracemalloc
+from pathlib import Path
+
+import pytest
+
+import runner as R
+from advent import get_handler_for_day
+from advent.common import RunStats, StreamingAdventDay
+from advent.generators import generate
+
+FOLDER = Path(__file__).parent.parent / "inputs"
+
+
+@pytest.mark.parametrize("day", [1, 2, 3, 4, 9, 10])
+def test_stream_matches_run(day: int) -> None:
+    cls = get_handler_for_day(day)
+    assert issubclass(cls, StreamingAdventDay)
+
+    text = (FOLDER / f"day{day}.txt").read_text()
+    streamed = cls(io.StringIO(text)).stream([1, 2])
+    assert {v: str(r) for v, r in streamed.items()} == {
+        v: str(r) for v, r in cls(io.StringIO(text)).run_all().items()
+    }
+
+
+def test_constant_memory(tmp_path: Path) -> None:
+    path = tmp_path / "day1.txt"
+    path.write_text(generate(1, 30_000))
+    cls = get_handler_for_day(1)
+
+    def peak(solve: str) -> int:
+        tracemalloc.start()
+        try:
+            with path.open() as f:
+                getattr(cls(f), solve)([1, 2])
+            return tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    assert peak("stream") < 100_000 < 500_000 < peak("run_many")
+
+
+def test_runner_streams() -> None:
+    stats = RunStats(enabled=True)
+    results = R._run_all(1, cache=False, stats=stats)  # pyright: ignore[reportPrivateUsage]
+    assert {v: str(r) for v, r in results.items()} == {1: "68775", 2: "202585"}
+    assert list(stats.timings) == ["stream"]